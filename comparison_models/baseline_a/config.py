@@ -1,4 +1,30 @@
 USE_PACKING = False
+DISTANCE_MATRIX_MODE = "auto"
+DISTANCE_MATRIX_DTYPE = "float64"
+DISTANCE_MATRIX_MAX_MB = 256
+SPLIT_DECODER = "greedy"
+SPLIT_MAX_ROUTE_CUSTOMERS = None
+PARALLEL_EVAL_WORKERS = 0
+PARALLEL_EVAL_CHUNK_SIZE = 0
+ISLANDS = 1
+MIGRATION_INTERVAL = 10
+MIGRATION_SIZE = 2
+MIGRATION_TOPOLOGY = "ring"
+CROSSOVER_OPERATOR = "ox"
+SELECTION_SCHEME = "tournament"
+TOURNAMENT_SIZE = 3
+SELECTION_PRESSURE = 1.5
+STAGNATION_WINDOW = 0
+MIN_RELATIVE_IMPROVEMENT = 0.0
+TIME_BUDGET_SECONDS = None
+PACKER_CALL_BUDGET = None
+CHECKPOINT_INTERVAL = 10
+CHECKPOINT_ROUTE_CACHE = False
+LOCAL_SEARCH = "off"
+LOCAL_SEARCH_NEIGHBORS = 10
+LOCAL_SEARCH_MAX_SEGMENT = 3
+DEDUPLICATE_POPULATION = True
+DUPLICATE_IMMIGRANTS = False
 PENALTY_ALPHA = 0
 USE_ENHANCED_MUTATION = False
 MODEL_NAME = "baseline_a"
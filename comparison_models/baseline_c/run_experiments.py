@@ -7,8 +7,9 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from comparison_models.baseline_c.config import MODEL_NAME
+from comparison_models.baseline_c.config import ISLANDS, MIGRATION_INTERVAL, MIGRATION_SIZE, MIGRATION_TOPOLOGY, MODEL_NAME, STAGNATION_WINDOW, MIN_RELATIVE_IMPROVEMENT, TIME_BUDGET_SECONDS, PACKER_CALL_BUDGET, LOCAL_SEARCH, DEDUPLICATE_POPULATION, DUPLICATE_IMMIGRANTS
 from comparison_models.baseline_c.ga_runner import GARunner
+from comparison_models.common.checkpoint import checkpoint_path, remove_checkpoint
 from comparison_models.common.experiment_utils import (
     build_metrics_row,
     discover_generated_datasets,
@@ -19,6 +20,8 @@ from comparison_models.common.experiment_utils import (
     write_history_csv,
     write_report_json,
 )
+from comparison_models.common.island_model import MIGRATION_TOPOLOGIES, run_island_model
+from comparison_models.common.local_search import LOCAL_SEARCH_MODES
 from comparison_models.common.metrics_logger import save_metrics
 
 
@@ -31,9 +34,24 @@ def run_from_config(config: dict):
 
     out_dir = get_output_dir(MODEL_NAME, dataset_path)
     out_dir.mkdir(parents=True, exist_ok=True)
-
-    runner = GARunner(config)
-    result = runner.run(str(dataset_path))
+    # Single-population runs checkpoint into the output directory and resume
+    # from there; the checkpoint is removed once the seed's results are written.
+    checkpoint_file = checkpoint_path(out_dir, seed)
+    if not config.get("resume", True):
+        remove_checkpoint(checkpoint_file)
+
+    island_config = {
+        "islands": ISLANDS,
+        "migration_interval": MIGRATION_INTERVAL,
+        "migration_size": MIGRATION_SIZE,
+        "migration_topology": MIGRATION_TOPOLOGY,
+        **config,
+    }
+    if int(island_config["islands"]) > 1:
+        result = run_island_model(GARunner.__module__, island_config, str(dataset_path))
+    else:
+        runner = GARunner({"checkpoint_path": str(checkpoint_file), **config})
+        result = runner.run(str(dataset_path))
     result["max_boxes_per_route"] = int(config.get("max_boxes_per_route", 48))
     result = normalize_result_for_reporting(MODEL_NAME, dataset_path, result)
 
@@ -61,6 +79,7 @@ def run_from_config(config: dict):
     }
     write_report_json(out_dir / f"report_seed_{seed}.json", report_data)
     write_report_json(out_dir / "report.json", report_data)
+    remove_checkpoint(checkpoint_file)
     return result
 
 
@@ -75,6 +94,18 @@ def main() -> int:
     parser.add_argument("--mut-prob", type=float, default=0.2)
     parser.add_argument("--max-boxes-per-route", type=int, default=48)
     parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--islands", type=int, default=ISLANDS, help="Sub-populations evolved in parallel processes (1 = single population).")
+    parser.add_argument("--migration-interval", type=int, default=MIGRATION_INTERVAL)
+    parser.add_argument("--migration-size", type=int, default=MIGRATION_SIZE)
+    parser.add_argument("--migration-topology", choices=MIGRATION_TOPOLOGIES, default=MIGRATION_TOPOLOGY)
+    parser.add_argument("--stagnation-window", type=int, default=STAGNATION_WINDOW, help="Stop when the best score has not improved for this many generations (0 = off).")
+    parser.add_argument("--min-relative-improvement", type=float, default=MIN_RELATIVE_IMPROVEMENT, help="With --stagnation-window: also stop when the window improved the best score by less than this fraction.")
+    parser.add_argument("--time-budget", type=float, default=TIME_BUDGET_SECONDS, help="Wall-clock seconds per run after which no new generation is started.")
+    parser.add_argument("--packer-call-budget", type=int, default=PACKER_CALL_BUDGET, help="Packer calls per run after which no new generation is started.")
+    parser.add_argument("--local-search", choices=LOCAL_SEARCH_MODES, default=LOCAL_SEARCH, help="Memetic 2-opt/Or-opt inside the decoded routes of the elites or of every child.")
+    parser.add_argument("--no-dedup", action="store_true", default=not DEDUPLICATE_POPULATION, help="Evaluate every individual, even copies of one already scored in this or the previous generation.")
+    parser.add_argument("--duplicate-immigrants", action="store_true", default=DUPLICATE_IMMIGRANTS, help="Replace children that repeat another individual with random permutations.")
+    parser.add_argument("--no-resume", action="store_true", help="Ignore checkpoints of interrupted runs and start every seed afresh.")
     args = parser.parse_args()
 
     dataset_paths = order_dataset_paths([Path(path) for path in args.dataset]) if args.dataset else discover_generated_datasets()
@@ -94,6 +125,18 @@ def main() -> int:
                 "mut_prob": args.mut_prob,
                 "max_boxes_per_route": args.max_boxes_per_route,
                 "verbose": args.verbose,
+                "islands": args.islands,
+                "migration_interval": args.migration_interval,
+                "migration_size": args.migration_size,
+                "migration_topology": args.migration_topology,
+                "stagnation_window": args.stagnation_window,
+                "min_relative_improvement": args.min_relative_improvement,
+                "time_budget_seconds": args.time_budget,
+                "packer_call_budget": args.packer_call_budget,
+                "local_search": args.local_search,
+                "deduplicate_population": not args.no_dedup,
+                "duplicate_immigrants": args.duplicate_immigrants,
+                "resume": not args.no_resume,
             }
             result = run_from_config(cfg)
             print(
@@ -0,0 +1,125 @@
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from comparison_models.common.experiment_utils import GENERATED_DATASETS_ROOT, discover_generated_datasets  # noqa: E402
+from comparison_models.common.loaders.route_evaluator import (  # noqa: E402
+    _normalize_container_for_packer,
+    load_merged,
+    split_depot_and_customers,
+)
+from comparison_models.common.utils.packer import (  # noqa: E402
+    FreeSpace,
+    SPLIT_STRATEGIES,
+    guillotine_children,
+    place_boxes_in_container,
+    try_place_box_in_fs,
+)
+
+SMOKE_DATASETS_ROOT = GENERATED_DATASETS_ROOT / "_smoke_bulk"
+
+
+def linear_scan_pack(container: dict, boxes: list[dict]) -> tuple[float, int]:
+    """Reference packer without a free-space index: every box scans every space."""
+    free = [FreeSpace(0, 0, 0, container["L"], container["W"], container["H"])]
+    packed_vol = 0.0
+    placed_count = 0
+    for box in boxes:
+        for i, fs in enumerate(free):
+            chosen = try_place_box_in_fs(box, fs)
+            if chosen:
+                l, w, h = chosen
+                packed_vol += l * w * h
+                placed_count += 1
+                free = guillotine_children(fs, l, w, h) + free[:i] + free[i + 1:]
+                break
+    return packed_vol, placed_count
+
+
+def sample_routes(customers: list[dict], box_map: dict, count: int, min_boxes: int, max_boxes: int, rng: random.Random) -> list[list[dict]]:
+    routes = []
+    attempts = 0
+    while len(routes) < count and attempts < count * 50:
+        attempts += 1
+        target = rng.randint(min_boxes, max_boxes)
+        route_boxes: list[dict] = []
+        for customer in rng.sample(customers, len(customers)):
+            route_boxes.extend(box_map[bid] for bid in customer.get("assigned_boxes", []) if bid in box_map)
+            if len(route_boxes) >= target:
+                break
+        if min_boxes <= len(route_boxes) <= max_boxes:
+            routes.append(route_boxes)
+    return routes
+
+
+def box_bucket(box_count: int, width: int) -> str:
+    low = (box_count // width) * width
+    return f"{low}-{low + width - 1}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark packer time per route on generated datasets.")
+    parser.add_argument("--dataset", action="append", help="Dataset path. Defaults to the smoke datasets.")
+    parser.add_argument("--routes", type=int, default=200, help="Sampled routes per dataset.")
+    parser.add_argument("--min-boxes", type=int, default=20)
+    parser.add_argument("--max-boxes", type=int, default=60)
+    parser.add_argument("--bucket-width", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    dataset_paths = [Path(path) for path in args.dataset] if args.dataset else discover_generated_datasets(SMOKE_DATASETS_ROOT)
+    if not dataset_paths:
+        raise FileNotFoundError(f"No datasets found in {SMOKE_DATASETS_ROOT}")
+
+    packers = {"linear_scan": linear_scan_pack}
+    for strategy in SPLIT_STRATEGIES:
+        packers[f"manager_{strategy}"] = (
+            lambda container, boxes, strategy=strategy: place_boxes_in_container(container, boxes, split_strategy=strategy)[1:]
+        )
+    packers["numpy_guillotine"] = lambda container, boxes: place_boxes_in_container(container, boxes, backend="numpy")[1:]
+
+    rng = random.Random(args.seed)
+    header = f"{'dataset':<44} {'packer':<20} {'boxes':>7} {'routes':>6} {'mean_ms':>9} {'median_ms':>9} {'packed':>7}"
+    print(header)
+    print("-" * len(header))
+
+    for dataset_path in dataset_paths:
+        _, container, customers, boxes = load_merged(str(dataset_path))
+        _, real_customers = split_depot_and_customers(customers)
+        box_map = {box.get("box_id"): box for box in boxes}
+        packer_container = _normalize_container_for_packer(container)
+        routes = sample_routes(real_customers, box_map, args.routes, args.min_boxes, args.max_boxes, rng)
+
+        for packer_name, packer in packers.items():
+            timings: dict[str, list[float]] = {}
+            packed_share: dict[str, list[float]] = {}
+            for route_boxes in routes:
+                best = float("inf")
+                for _ in range(max(1, args.repeats)):
+                    start = time.perf_counter()
+                    _, placed_count = packer(packer_container, route_boxes)
+                    best = min(best, time.perf_counter() - start)
+                bucket = box_bucket(len(route_boxes), args.bucket_width)
+                timings.setdefault(bucket, []).append(best * 1000.0)
+                packed_share.setdefault(bucket, []).append(placed_count / len(route_boxes))
+
+            for bucket in sorted(timings, key=lambda label: int(label.split("-")[0])):
+                values = timings[bucket]
+                print(
+                    f"{dataset_path.stem:<44} {packer_name:<20} {bucket:>7} {len(values):>6} "
+                    f"{statistics.fmean(values):>9.3f} {statistics.median(values):>9.3f} "
+                    f"{statistics.fmean(packed_share[bucket]):>7.3f}"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
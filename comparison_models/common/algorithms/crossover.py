@@ -1,20 +1,103 @@
 # dataset_generation/algorithms/ga/crossover.py
 import random
 
-def order_crossover(a, b):
+CROSSOVER_OPERATORS = ("ox", "pmx", "erx")
+
+
+def order_crossover(a, b, rng=random):
     """
     Order-based crossover (kept from legacy code).
     a, b: parent permutations (lists)
+    rng: random source (the random module or a random.Random)
     returns: child permutation
+
+    Linear time: the copied segment goes into a set, so filling the remaining
+    positions in b's order is one pass instead of a list scan per element.
     """
     n = len(a)
-    i, j = sorted(random.sample(range(n), 2))
-    child = [-1] * n
+    i, j = sorted(rng.sample(range(n), 2))
+    segment = a[i:j+1]
+    taken = set(segment)
+    fill = iter([x for x in b if x not in taken])
+    child = [next(fill) for _ in range(i)]
+    child.extend(segment)
+    child.extend(fill)
+    return child
+
+
+def pmx_crossover(a, b, rng=random):
+    """
+    Partially mapped crossover: a[i..j] is kept in place, every other position
+    takes b's value, following the segment mapping a[k] -> b[k] while that value
+    is already in the segment. Linear time apart from the mapping chains.
+    """
+    n = len(a)
+    i, j = sorted(rng.sample(range(n), 2))
+    mapping = {a[k]: b[k] for k in range(i, j + 1)}
+    child = b[:]
     child[i:j+1] = a[i:j+1]
-    fill = [x for x in b if x not in child]
-    idx = 0
     for k in range(n):
-        if child[k] == -1:
-            child[k] = fill[idx]
-            idx += 1
+        if i <= k <= j:
+            continue
+        value = child[k]
+        while value in mapping:
+            value = mapping[value]
+        child[k] = value
     return child
+
+
+def edge_recombination_crossover(a, b, rng=random):
+    """
+    Edge recombination (Whitley et al., 1989): the child is built from the union
+    of both parents' (cyclic) adjacencies, always moving to the neighbour with
+    the fewest remaining neighbours (ties at random) and jumping to a random
+    unvisited customer when none is left. Each customer has at most four
+    neighbours and unvisited customers sit in a swap-remove list, so the child
+    is built in linear time.
+    """
+    n = len(a)
+    if n < 2:
+        return a[:]
+    edges = {x: set() for x in a}
+    for parent in (a, b):
+        for k in range(n):
+            x = parent[k]
+            edges[x].add(parent[k - 1])
+            edges[x].add(parent[(k + 1) % n])
+
+    remaining = a[:]
+    slot = {x: k for k, x in enumerate(remaining)}
+    child = []
+    current = a[0] if rng.random() < 0.5 else b[0]
+    while True:
+        child.append(current)
+        last = remaining.pop()
+        if last != current:
+            remaining[slot[current]] = last
+            slot[last] = slot[current]
+        del slot[current]
+        if not remaining:
+            return child
+
+        neighbours = edges.pop(current)
+        for x in neighbours:
+            edges[x].discard(current)
+        if neighbours:
+            fewest = min(len(edges[x]) for x in neighbours)
+            current = rng.choice(sorted(x for x in neighbours if len(edges[x]) == fewest))
+        else:
+            current = rng.choice(remaining)
+
+
+CROSSOVERS = {
+    "ox": order_crossover,
+    "pmx": pmx_crossover,
+    "erx": edge_recombination_crossover,
+}
+
+
+def get_crossover(name):
+    if name not in CROSSOVERS:
+        raise ValueError(f"Unknown crossover operator '{name}'. Valid values: {', '.join(CROSSOVER_OPERATORS)}")
+    return CROSSOVERS[name]
+
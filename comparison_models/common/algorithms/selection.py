@@ -1,6 +1,11 @@
 # dataset_generation/algorithms/ga/selection.py
 import random
 
+import numpy as np
+
+SELECTION_SCHEMES = ("tournament", "tournament_batch", "linear_rank", "sus")
+
+
 def tournament_select(pop, scores, k=3):
     """
     Tournament selection: choose k random individuals and return the best (min score).
@@ -16,3 +21,95 @@ def tournament_select(pop, scores, k=3):
             best = pop[i]
             best_s = s
     return best
+
+
+def tournament_indices(scores, count, rng, k=3):
+    """
+    count tournament winners drawn in one call: a (count, k) array of entrants,
+    each row won by the lowest score (the earliest entrant on ties, as in
+    tournament_select).
+    """
+    scores = np.asarray(scores, dtype=float)
+    entrants = rng.integers(0, len(scores), size=(count, k))
+    winners = np.argmin(scores[entrants], axis=1)
+    return entrants[np.arange(count), winners]
+
+
+def linear_rank_probabilities(scores, pressure=1.5):
+    """
+    Linear ranking (Baker, 1985): the best individual gets pressure / n, the worst
+    (2 - pressure) / n, linearly in between; pressure is in [1, 2]. Ties are
+    ranked by position, so equal scores get adjacent probabilities.
+    """
+    scores = np.asarray(scores, dtype=float)
+    n = len(scores)
+    if n == 1:
+        return np.ones(1)
+    pressure = min(2.0, max(1.0, float(pressure)))
+    ranks = np.empty(n, dtype=np.int64)
+    ranks[np.argsort(scores, kind="stable")] = np.arange(n)
+    return (pressure - (2.0 * pressure - 2.0) * ranks / (n - 1)) / n
+
+
+def linear_rank_indices(scores, count, rng, pressure=1.5):
+    """count independent draws from the linear ranking distribution."""
+    probabilities = linear_rank_probabilities(scores, pressure)
+    return rng.choice(len(probabilities), size=count, p=probabilities)
+
+
+def sus_indices(scores, count, rng, pressure=1.5):
+    """
+    Stochastic universal sampling (Baker, 1987) over the linear ranking
+    distribution: count equally spaced pointers with one random offset, so each
+    individual is picked within one of its expected count. The picks are
+    shuffled, since they come out sorted by rank.
+    """
+    cumulative = np.cumsum(linear_rank_probabilities(scores, pressure))
+    cumulative[-1] = 1.0
+    pointers = (rng.random() + np.arange(count)) / count
+    picks = np.searchsorted(cumulative, pointers, side="right")
+    return rng.permutation(np.minimum(picks, len(cumulative) - 1))
+
+
+class ParentSelector:
+    """
+    Breeding-stage parent selection. parent_pairs(pop, scores, count) yields the
+    (parent1, parent2) of each of a generation's `count` children.
+
+    "tournament" draws each pair from the global random module when it is
+    requested, exactly like calling tournament_select twice per child, so seeded
+    runs keep their results. The other schemes draw every parent index of the
+    generation in one vectorised call from the selector's own numpy Generator.
+    """
+
+    def __init__(self, scheme="tournament", tournament_size=3, pressure=1.5, seed=None):
+        if scheme not in SELECTION_SCHEMES:
+            raise ValueError(f"Unknown selection scheme '{scheme}'. Valid values: {', '.join(SELECTION_SCHEMES)}")
+        self.scheme = scheme
+        self.tournament_size = int(tournament_size)
+        self.pressure = float(pressure)
+        self.rng = np.random.default_rng(seed)
+
+    def parent_indices(self, scores, count):
+        """(count, 2) array of parent positions in scores."""
+        draws = 2 * count
+        if self.scheme == "linear_rank":
+            indices = linear_rank_indices(scores, draws, self.rng, self.pressure)
+        elif self.scheme == "sus":
+            indices = sus_indices(scores, draws, self.rng, self.pressure)
+        else:
+            indices = tournament_indices(scores, draws, self.rng, self.tournament_size)
+        return indices.reshape(count, 2)
+
+    def parent_pairs(self, pop, scores, count):
+        if self.scheme == "tournament":
+            for _ in range(count):
+                yield (
+                    tournament_select(pop, scores, self.tournament_size),
+                    tournament_select(pop, scores, self.tournament_size),
+                )
+            return
+        if count <= 0:
+            return
+        for first, second in self.parent_indices(scores, count).tolist():
+            yield pop[first], pop[second]
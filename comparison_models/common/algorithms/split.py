@@ -0,0 +1,134 @@
+# comparison_models/common/algorithms/split.py
+# Giant-tour split decoders shared by the GA runners.
+
+from bisect import bisect_right
+
+SPLIT_DECODERS = ("greedy", "optimal")
+
+
+def optimal_split(order, cust_boxcount_map, distances, max_boxes_per_route=48, max_route_customers=None, route_cost=0.0):
+    """
+    Optimal split of a giant tour (Prins, 2004): shortest path over the DAG whose
+    arc i -> j is the route order[i:j], restricted to routes within the box-count
+    capacity and at most max_route_customers customers. Arc cost is the closed
+    depot route distance plus route_cost, so route_cost > 0 trades distance for
+    fewer routes. A customer whose boxes alone exceed the capacity gets its own
+    route, as in decode_by_boxcount. Runs in O(n * k) for routes of at most k
+    customers; ties keep the earliest cut.
+    """
+    n = len(order)
+    if n == 0:
+        return []
+
+    nodes = distances.route_indices(order)
+    between = distances.between
+    boxes = [cust_boxcount_map.get(cid, 0) for cid in order]
+    depot_leg = [between(0, node) for node in nodes]
+    max_len = n if max_route_customers is None else max(1, int(max_route_customers))
+
+    inf = float("inf")
+    best = [inf] * (n + 1)
+    pred = [0] * (n + 1)
+    best[0] = 0.0
+
+    for i in range(n):
+        base = best[i]
+        if base == inf:
+            continue
+        load = 0
+        open_distance = 0.0
+        for j in range(i, min(n, i + max_len)):
+            load += boxes[j]
+            if j > i and load > max_boxes_per_route:
+                break
+            if j == i:
+                open_distance = depot_leg[j]
+            else:
+                open_distance += between(nodes[j - 1], nodes[j])
+            cost = base + open_distance + depot_leg[j] + route_cost
+            if cost < best[j + 1]:
+                best[j + 1] = cost
+                pred[j + 1] = i
+
+    routes = []
+    j = n
+    while j > 0:
+        i = pred[j]
+        routes.append(list(order[i:j]))
+        j = i
+    routes.reverse()
+    return routes
+
+
+def threshold_splits(order, cust_boxcount_map, distances, box_limits=(), adaptive_limits=()):
+    """
+    Greedy threshold splits of one giant tour for several limits at once.
+
+    Returns (box_routes, adaptive_routes):
+      box_routes       one partition per entry of box_limits, as
+                       decode_by_boxcount with that max_boxes_per_route;
+      adaptive_routes  one partition per (max_boxes, distance_limit) pair of
+                       adaptive_limits, as decode_with_adaptive_splits.
+
+    Box counts are summed into prefix sums once, so every box-only route end is
+    a bisection (O(routes * log n) per limit). The adaptive splits share one
+    sweep over the order in which each customer's depot and predecessor edges
+    are looked up once; every limit keeps its own open route distance,
+    extended edge by edge as in route_distance, so its cuts match the
+    one-limit decoder exactly.
+    """
+    n = len(order)
+    boxes = [cust_boxcount_map.get(cid, 0) for cid in order]
+    prefix = [0] * (n + 1)
+    for i, count in enumerate(boxes):
+        prefix[i + 1] = prefix[i] + count
+
+    box_routes = []
+    for limit in box_limits:
+        routes = []
+        start = 0
+        while start < n:
+            end = max(start + 1, bisect_right(prefix, prefix[start] + limit, start + 1) - 1)
+            routes.append(list(order[start:end]))
+            start = end
+        box_routes.append(routes)
+
+    adaptive_routes = []
+    if adaptive_limits:
+        max_boxes = [max_boxes for max_boxes, _ in adaptive_limits]
+        distance_limits = [distance_limit for _, distance_limit in adaptive_limits]
+        split_boxes = [max(1, int(limit * 0.5)) for limit in max_boxes]
+        count = len(adaptive_limits)
+        cuts = [[0] for _ in range(count)]
+        if n:
+            nodes = distances.route_indices(order)
+            between = distances.between
+            depot_leg = between(0, nodes[0])
+            loads = [boxes[0]] * count
+            open_distances = [depot_leg] * count
+            for i in range(1, n):
+                load = boxes[i]
+                depot_leg = between(0, nodes[i])
+                step = between(nodes[i - 1], nodes[i])
+                for k in range(count):
+                    step_distance = None
+                    if loads[k] + load > max_boxes[k]:
+                        should_split = True
+                    elif distance_limits[k] is not None:
+                        step_distance = open_distances[k] + step
+                        should_split = loads[k] >= split_boxes[k] and step_distance + depot_leg > distance_limits[k]
+                    else:
+                        should_split = False
+                    if should_split:
+                        cuts[k].append(i)
+                        loads[k] = load
+                        open_distances[k] = depot_leg
+                    else:
+                        loads[k] += load
+                        open_distances[k] = step_distance
+            for k in range(count):
+                cuts[k].append(n)
+        for route_cuts in cuts:
+            adaptive_routes.append([list(order[a:b]) for a, b in zip(route_cuts, route_cuts[1:])])
+
+    return box_routes, adaptive_routes
@@ -0,0 +1,168 @@
+# comparison_models/common/bounded_cache.py
+# Size-limited caches for the runners' evaluation caches and the loaded
+# datasets. An evicted entry is rebuilt on its next lookup, so the limits trade
+# memory for repeated work.
+
+import sys
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+EVICTION_POLICIES = ("lru", "lfu")
+
+
+def approx_size(value) -> int:
+    """Rough deep size in bytes of a cache key or value (containers are followed, shared objects counted again)."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += approx_size(key) + approx_size(item)
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            size += approx_size(item)
+    return size
+
+
+class BoundedCache(MutableMapping):
+    """
+    Dict-like cache holding at most max_entries entries and about max_mb
+    megabytes (None = no limit). When a limit is exceeded the least recently
+    used ("lru") or least frequently used ("lfu", oldest first among equals)
+    entries are evicted. get() counts hits and misses; [] and `in` do not, so
+    callers that want the counters look entries up with get().
+
+    track_inserts() makes the cache remember the keys inserted since the last
+    drain_inserted(), which is how pool workers ship their new entries back.
+    """
+
+    def __init__(self, name: str, max_entries=None, max_mb=None, policy: str = "lru", size_of=approx_size):
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown cache eviction policy '{policy}'. Valid values: {', '.join(EVICTION_POLICIES)}")
+        self.name = name
+        self.max_entries = None if max_entries is None else max(1, int(max_entries))
+        self.max_bytes = None if max_mb is None else max(1, int(float(max_mb) * 1024 * 1024))
+        self.policy = policy
+        self.size_of = size_of
+        self._data: OrderedDict = OrderedDict()
+        self._sizes: dict = {}
+        self._bytes = 0
+        # lfu: key -> use count, and count -> keys in insertion/use order.
+        self._counts: dict = {}
+        self._buckets: dict[int, OrderedDict] = {}
+        self._min_count = 0
+        self._inserted = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __getitem__(self, key):
+        value = self._data[key]
+        self._touch(key)
+        return value
+
+    def get(self, key, default=None):
+        if key in self._data:
+            self.hits += 1
+            return self[key]
+        self.misses += 1
+        return default
+
+    def __setitem__(self, key, value):
+        if key in self._data:
+            del self[key]
+        self._data[key] = value
+        if self.max_bytes is not None:
+            size = self.size_of(key) + self.size_of(value)
+            self._sizes[key] = size
+            self._bytes += size
+        if self.policy == "lfu":
+            self._counts[key] = 1
+            self._buckets.setdefault(1, OrderedDict())[key] = None
+            self._min_count = 1
+        if self._inserted is not None:
+            self._inserted.append(key)
+        self._evict()
+
+    def __delitem__(self, key):
+        self._forget(key)
+        del self._data[key]
+
+    def clear(self):
+        self._data.clear()
+        self._sizes.clear()
+        self._bytes = 0
+        self._counts.clear()
+        self._buckets.clear()
+        self._min_count = 0
+
+    def _touch(self, key):
+        if self.policy == "lru":
+            self._data.move_to_end(key)
+            return
+        count = self._counts[key]
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        self._counts[key] = count + 1
+        self._buckets.setdefault(count + 1, OrderedDict())[key] = None
+
+    def _forget(self, key):
+        self._bytes -= self._sizes.pop(key, 0)
+        if self.policy == "lfu":
+            count = self._counts.pop(key)
+            bucket = self._buckets[count]
+            del bucket[key]
+            if not bucket:
+                del self._buckets[count]
+
+    def _victim(self):
+        if self.policy == "lru":
+            return next(iter(self._data))
+        if self._min_count not in self._buckets:
+            self._min_count = min(self._buckets)
+        return next(iter(self._buckets[self._min_count]))
+
+    def _evict(self):
+        while self._data and (
+            (self.max_entries is not None and len(self._data) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            key = self._victim()
+            self._forget(key)
+            del self._data[key]
+            self.evictions += 1
+
+    def track_inserts(self):
+        self._inserted = []
+
+    def drain_inserted(self) -> list:
+        """(key, value) of the entries inserted since the last drain that are still cached."""
+        keys, self._inserted = self._inserted or [], []
+        return [(key, self._data[key]) for key in dict.fromkeys(keys) if key in self._data]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        stats = {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "policy": self.policy,
+        }
+        if self.max_bytes is not None:
+            stats["approx_mb"] = self._bytes / (1024 * 1024)
+            stats["max_mb"] = self.max_bytes / (1024 * 1024)
+        return stats
@@ -0,0 +1,96 @@
+# comparison_models/common/checkpoint.py
+# Periodic GA checkpoints. A runner with a checkpoint path pickles its loop
+# state (population, best, history, RNG states, counters) every few
+# generations; a later run with the same config resumes from it and continues
+# exactly as the interrupted run would have.
+
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+
+CHECKPOINT_VERSION = 1
+
+# Config keys that do not influence the evolution and may differ on resume.
+VOLATILE_CONFIG_KEYS = (
+    "verbose",
+    "progress_label",
+    "checkpoint_path",
+    "checkpoint_interval",
+    "checkpoint_route_cache",
+    "resume",
+    "parallel_eval_workers",
+    "parallel_eval_chunk_size",
+)
+
+
+def checkpoint_path(out_dir: str | Path, seed: int) -> Path:
+    return Path(out_dir) / f"checkpoint_seed_{seed}.pkl"
+
+
+def config_fingerprint(model_name: str, config: dict) -> str:
+    relevant = {key: value for key, value in config.items() if key not in VOLATILE_CONFIG_KEYS}
+    payload = json.dumps([model_name, relevant], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def remove_checkpoint(path: str | Path) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class Checkpointer:
+    """
+    Saves and loads one run's checkpoint. A checkpoint is only loaded when its
+    version and config fingerprint match, so a changed config starts afresh.
+    With path None (the default for plain GARunner use) nothing is written.
+    """
+
+    def __init__(self, path, model_name: str, config: dict, interval: int = 10, include_route_cache: bool = False):
+        self.path = None if path is None else Path(path)
+        self.interval = max(0, int(interval or 0))
+        self.include_route_cache = bool(include_route_cache)
+        self.fingerprint = config_fingerprint(model_name, config)
+
+    @classmethod
+    def from_config(cls, model_name: str, config: dict, interval: int, include_route_cache: bool):
+        return cls(
+            config.get("checkpoint_path"),
+            model_name,
+            config,
+            interval=config.get("checkpoint_interval", interval),
+            include_route_cache=config.get("checkpoint_route_cache", include_route_cache),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None and self.interval > 0
+
+    def due(self, generation: int, gens: int) -> bool:
+        """Save after this (0-based) generation? Never after the last one."""
+        return self.enabled and (generation + 1) % self.interval == 0 and generation + 1 < gens
+
+    def save(self, state: dict) -> None:
+        payload = {"version": CHECKPOINT_VERSION, "fingerprint": self.fingerprint, "state": state}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as handle:
+            pickle.dump(payload, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+
+    def load(self) -> dict | None:
+        if self.path is None or not self.path.exists():
+            return None
+        try:
+            with open(self.path, "rb") as handle:
+                payload = pickle.load(handle)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError) as exc:
+            print(f"[checkpoint] ignoring unreadable checkpoint {self.path}: {exc}", flush=True)
+            return None
+        if payload.get("version") != CHECKPOINT_VERSION or payload.get("fingerprint") != self.fingerprint:
+            print(f"[checkpoint] ignoring checkpoint of a different config: {self.path}", flush=True)
+            return None
+        return payload["state"]
@@ -0,0 +1,53 @@
+# comparison_models/common/early_stopping.py
+# Stopping criteria checked by the GA runners after every generation. All of
+# them are off by default, so a run executes exactly `gens` generations.
+
+STOP_REASONS = ("max_generations", "stagnation", "min_improvement", "time_budget", "packer_budget")
+
+
+class EarlyStopping:
+    """
+    check(history, elapsed_seconds, packer_calls) returns the reason to stop
+    after the generation just appended to history, or None to go on:
+
+    - "time_budget": the run has used time_budget_seconds of wall-clock time;
+    - "packer_budget": packer_calls has reached packer_call_budget (runners
+      without packing pass None and are never stopped by it);
+    - "stagnation": the best score has not improved over the last
+      stagnation_window generations;
+    - "min_improvement": it improved over that window, but by less than
+      min_relative_improvement of the score at the start of the window.
+
+    A window of 0 and budgets of None disable the respective criteria.
+    """
+
+    def __init__(self, stagnation_window=0, min_relative_improvement=0.0, time_budget_seconds=None, packer_call_budget=None):
+        self.stagnation_window = max(0, int(stagnation_window or 0))
+        self.min_relative_improvement = max(0.0, float(min_relative_improvement or 0.0))
+        self.time_budget_seconds = None if time_budget_seconds is None else float(time_budget_seconds)
+        self.packer_call_budget = None if packer_call_budget is None else int(packer_call_budget)
+
+    @classmethod
+    def from_config(cls, config: dict, stagnation_window, min_relative_improvement, time_budget_seconds, packer_call_budget):
+        """Criteria from the runner config, falling back to the model's config constants."""
+        return cls(
+            stagnation_window=config.get("stagnation_window", stagnation_window),
+            min_relative_improvement=config.get("min_relative_improvement", min_relative_improvement),
+            time_budget_seconds=config.get("time_budget_seconds", time_budget_seconds),
+            packer_call_budget=config.get("packer_call_budget", packer_call_budget),
+        )
+
+    def check(self, history, elapsed_seconds, packer_calls=None):
+        if self.time_budget_seconds is not None and elapsed_seconds >= self.time_budget_seconds:
+            return "time_budget"
+        if self.packer_call_budget is not None and packer_calls is not None and packer_calls >= self.packer_call_budget:
+            return "packer_budget"
+        window = self.stagnation_window
+        if window and len(history) > window:
+            previous = history[-1 - window]
+            current = history[-1]
+            if current >= previous:
+                return "stagnation"
+            if self.min_relative_improvement and (previous - current) < self.min_relative_improvement * abs(previous):
+                return "min_improvement"
+        return None
@@ -0,0 +1,74 @@
+# comparison_models/common/evaluation_record.py
+# Compact immutable form of the (score, info) evaluation results held in the
+# runners' caches. Info dicts are JSON-like (dicts, lists and scalars), so they
+# are frozen into nested tuples once, on insert, and thawed into fresh dicts and
+# lists only when a caller needs a mutable info; cache hits no longer deepcopy.
+
+from collections import namedtuple
+
+
+class FrozenItems(tuple):
+    """The (key, value) pairs of a frozen dict; a tuple, so it hashes and pickles."""
+
+    __slots__ = ()
+
+
+def freeze(value):
+    """Nested dicts/lists -> FrozenItems/tuples; other values are kept as they are."""
+    if isinstance(value, dict):
+        return FrozenItems((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        if any(isinstance(item, (dict, list)) for item in value):
+            return tuple(freeze(item) for item in value)
+        return tuple(value)
+    return value
+
+
+def thaw(value):
+    """Inverse of freeze: fresh dicts and lists the caller may modify."""
+    if isinstance(value, FrozenItems):
+        return {key: thaw(item) for key, item in value}
+    if isinstance(value, tuple):
+        if any(isinstance(item, tuple) for item in value):
+            return [thaw(item) for item in value]
+        return list(value)
+    return value
+
+
+class EvaluationRecord(namedtuple("EvaluationRecord", ("score", "fields"))):
+    """
+    A cached evaluation: the score and the frozen info. It unpacks like the
+    former (score, info) cache entries, but info is only materialised by info()
+    (or route_details() for just the per-route dicts), so holding records in a
+    population or cache costs no dict copies. copy/deepcopy return the record
+    itself.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_info(cls, score, info):
+        return cls(score, freeze(info))
+
+    def field(self, key, default=None):
+        for name, value in self.fields:
+            if name == key:
+                return value
+        return default
+
+    @property
+    def routes(self):
+        """The partition as a tuple of route tuples."""
+        return tuple(dict(detail)["route"] for detail in self.field("routes", ()))
+
+    def route_details(self):
+        return [thaw(detail) for detail in self.field("routes", ())]
+
+    def info(self):
+        return thaw(self.fields)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
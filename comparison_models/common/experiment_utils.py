@@ -6,6 +6,8 @@ import re
 import statistics
 from pathlib import Path
 
+from comparison_models.common.loaders.compiled_dataset import compile_dataset
+
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 COMPARISON_ROOT = PROJECT_ROOT / "comparison_models"
 OUTPUTS_ROOT = COMPARISON_ROOT / "outputs"
@@ -73,22 +75,7 @@ def get_output_dir(model_name: str, dataset_path: str | Path, outputs_root: Path
 
 
 def _load_dataset_box_count(dataset_path: str | Path) -> int:
-    dataset_file = resolve_dataset_path(dataset_path)
-    with dataset_file.open("r", encoding="utf-8-sig") as handle:
-        data = json.load(handle)
-    customers = data.get("customers", [])
-    if not customers:
-        return len(data.get("boxes", []))
-
-    real_customers = customers[1:] if len(customers) > 1 else []
-    assigned_box_ids = {
-        str(box_id)
-        for customer in real_customers
-        for box_id in customer.get("assigned_boxes", [])
-    }
-    if assigned_box_ids:
-        return len(assigned_box_ids)
-    return len(data.get("boxes", []))
+    return compile_dataset(resolve_dataset_path(dataset_path)).assigned_box_count
 
 
 def _is_routing_only_model(model_name: str) -> bool:
@@ -224,6 +211,9 @@ def build_metrics_row(model_name: str, dataset_path: str | Path, seed: int, resu
     validated_result = normalize_result_for_reporting(model_name, dataset_path, result)
     best_info = validated_result.get("best_info", {})
     num_customers = extract_customer_count(dataset_name)
+    packing_stats = result.get("packing_stats") or {}
+    dedup_stats = result.get("dedup_stats") or {}
+    individuals = dedup_stats.get("individuals")
 
     return {
         "dataset": dataset_name,
@@ -274,6 +264,11 @@ def build_metrics_row(model_name: str, dataset_path: str | Path, seed: int, resu
         "candidate_fill_rates": _serialize_csv_value(best_info.get("candidate_fill_rates")),
         "candidate_distances": _serialize_csv_value(best_info.get("candidate_distances")),
         "max_boxes_per_route": result.get("max_boxes_per_route"),
+        "packer_calls": packing_stats.get("packer_calls"),
+        "packer_calls_skipped": packing_stats.get("packer_calls_skipped"),
+        "unique_evaluation_rate": dedup_stats["evaluations"] / individuals if individuals else None,
+        "generations_completed": result.get("generations_completed"),
+        "stop_reason": result.get("stop_reason"),
     }
 
 
@@ -0,0 +1,631 @@
+# comparison_models/common/ga_engine.py
+# The generational GA shared by all four models. A model's GARunner subclasses
+# GAEngine (or PenaltyScoredGA), points `defaults` at its config module and
+# plugs in what sets it apart: decoding, scoring/repair and mutation. Selection,
+# crossover, elitism, the memetic local search, caching, parallel evaluation,
+# islands, early stopping and checkpoints live here once, so every speedup
+# applies to every model.
+
+import random
+import time
+
+from comparison_models.common.algorithms.crossover import CROSSOVER_OPERATORS, get_crossover
+from comparison_models.common.algorithms.selection import SELECTION_SCHEMES, ParentSelector
+from comparison_models.common.algorithms.split import SPLIT_DECODERS, optimal_split
+from comparison_models.common.bounded_cache import EVICTION_POLICIES, BoundedCache
+from comparison_models.common.checkpoint import Checkpointer
+from comparison_models.common.early_stopping import EarlyStopping
+from comparison_models.common.loaders.compiled_dataset import compile_dataset, compiled_cache_stats
+from comparison_models.common.loaders.route_evaluator import (
+    evaluate_route,
+    new_packing_stats,
+    dataset_cache_stats,
+    record_packing_stats,
+    repack_route_details,
+)
+from comparison_models.common.local_search import LOCAL_SEARCH_MODES, RouteLocalSearch
+from comparison_models.common.parallel_evaluator import ParallelEvaluator
+from comparison_models.common.population_dedup import PopulationDedup
+from comparison_models.common.utils.distance_matrix import get_distance_provider
+
+
+class GAEngine:
+    """
+    Generational GA over customer permutations. Each generation is scored,
+    the elite is kept, and the rest is bred by the configured selection scheme,
+    crossover (with probability cx_prob) and the model's mutation. With
+    local_search "elites" or "children" the elites or the new children are
+    improved route by route (common/local_search.py) and written back into
+    their order. With deduplicate_population each distinct permutation of a
+    generation is evaluated once (common/population_dedup.py), and with
+    duplicate_immigrants repeated children are replaced by random orders.
+
+    Plug-ins a model overrides:
+    - decode_routes(order, box_counts, distances): permutation -> routes
+      (greedy box-count split or optimal split by default);
+    - evaluate_permutation(merged_path, perm): (score, info), where scoring and
+      any repair happen;
+    - mutate(child, dataset): the mutation operator;
+    - evaluate_generation(...): how a population is scored (default: every
+      individual once, sorted by score);
+    - finalize_best(...): a last look at the best solution after the loop;
+    - begin_run / run_counters / restore_run_counters / evaluation_caches /
+      result_stats for per-run state, checkpoints and the reported counters.
+
+    Settings are read from the runner config, falling back to the constants of
+    the model's config module (`defaults`). Models without packing (no
+    USE_PACKING) keep no route cache and report no packing counters.
+    """
+
+    defaults = None
+
+    def __init__(self, config: dict):
+        d = self.defaults
+        self.config = config or {}
+        self.model_name = d.MODEL_NAME
+        self.pop_size = int(self.config.get("pop_size", self.config.get("population_size", 80)))
+        self.gens = int(self.config.get("gens", self.config.get("num_generations", 200)))
+        self.cx_prob = float(self.config.get("cx_prob", self.config.get("crossover_prob", 0.9)))
+        self.mut_prob = float(self.config.get("mut_prob", self.config.get("mutation_prob", 0.2)))
+        self.crossover_operator = str(self.config.get("crossover_operator", d.CROSSOVER_OPERATOR))
+        if self.crossover_operator not in CROSSOVER_OPERATORS:
+            raise ValueError(f"Unknown crossover operator '{self.crossover_operator}'. Valid values: {', '.join(CROSSOVER_OPERATORS)}")
+        self.crossover = get_crossover(self.crossover_operator)
+        self.selection_scheme = str(self.config.get("selection_scheme", d.SELECTION_SCHEME))
+        if self.selection_scheme not in SELECTION_SCHEMES:
+            raise ValueError(f"Unknown selection scheme '{self.selection_scheme}'. Valid values: {', '.join(SELECTION_SCHEMES)}")
+        self.tournament_size = int(self.config.get("tournament_size", d.TOURNAMENT_SIZE))
+        self.selection_pressure = float(self.config.get("selection_pressure", d.SELECTION_PRESSURE))
+        self.early_stopping = EarlyStopping.from_config(
+            self.config,
+            d.STAGNATION_WINDOW,
+            d.MIN_RELATIVE_IMPROVEMENT,
+            d.TIME_BUDGET_SECONDS,
+            d.PACKER_CALL_BUDGET,
+        )
+        self.checkpointer = Checkpointer.from_config(self.model_name, self.config, d.CHECKPOINT_INTERVAL, d.CHECKPOINT_ROUTE_CACHE)
+        self.max_boxes_per_route = int(self.config.get("max_boxes_per_route", self.config.get("maxboxes", 48)))
+        self.seed = int(self.config.get("seed", 42))
+        self.verbose = bool(self.config.get("verbose", False))
+        self.progress_label = str(self.config.get("progress_label", self.model_name))
+        self.distance_options = {
+            "mode": str(self.config.get("distance_matrix_mode", d.DISTANCE_MATRIX_MODE)),
+            "dtype": str(self.config.get("distance_matrix_dtype", d.DISTANCE_MATRIX_DTYPE)),
+            "max_mb": float(self.config.get("distance_matrix_max_mb", d.DISTANCE_MATRIX_MAX_MB)),
+        }
+        self.split_decoder = str(self.config.get("split_decoder", d.SPLIT_DECODER))
+        if self.split_decoder not in SPLIT_DECODERS:
+            raise ValueError(f"Unknown split decoder '{self.split_decoder}'. Valid values: {', '.join(SPLIT_DECODERS)}")
+        split_max_route_customers = self.config.get("split_max_route_customers", d.SPLIT_MAX_ROUTE_CUSTOMERS)
+        self.split_max_route_customers = None if split_max_route_customers is None else int(split_max_route_customers)
+        self.local_search_mode = str(self.config.get("local_search", d.LOCAL_SEARCH))
+        if self.local_search_mode not in LOCAL_SEARCH_MODES:
+            raise ValueError(f"Unknown local search mode '{self.local_search_mode}'. Valid values: {', '.join(LOCAL_SEARCH_MODES)}")
+        self.local_search_neighbors = int(self.config.get("local_search_neighbors", d.LOCAL_SEARCH_NEIGHBORS))
+        self.local_search_max_segment = int(self.config.get("local_search_max_segment", d.LOCAL_SEARCH_MAX_SEGMENT))
+        self.local_search = None
+        self.deduplicate_population = bool(self.config.get("deduplicate_population", d.DEDUPLICATE_POPULATION))
+        self.duplicate_immigrants = bool(self.config.get("duplicate_immigrants", d.DUPLICATE_IMMIGRANTS))
+        self.population_dedup = None
+        self.parallel_eval_workers = int(self.config.get("parallel_eval_workers", d.PARALLEL_EVAL_WORKERS))
+        self.parallel_eval_chunk_size = int(self.config.get("parallel_eval_chunk_size", d.PARALLEL_EVAL_CHUNK_SIZE))
+        self.parallel_evaluator = None
+        self.dataset = None
+        # Set by the island model (common/island_model.py) to exchange elites.
+        self.migration_hook = None
+
+        self.use_packing = bool(d.USE_PACKING)
+        self.cache_eviction_policy = "lru"
+        self.route_eval_cache = None
+        self.packing_stats = None
+        self.record_final_placements = False
+        if self.use_packing:
+            self.cache_eviction_policy = str(self.config.get("cache_eviction_policy", d.CACHE_EVICTION_POLICY))
+            if self.cache_eviction_policy not in EVICTION_POLICIES:
+                raise ValueError(f"Unknown cache eviction policy '{self.cache_eviction_policy}'. Valid values: {', '.join(EVICTION_POLICIES)}")
+            self.route_eval_cache = self.new_cache("route_eval", d.ROUTE_EVAL_CACHE_MAX_ENTRIES, d.ROUTE_EVAL_CACHE_MAX_MB)
+            self.packing_options = {
+                "split_strategy": str(self.config.get("packing_split_strategy", d.PACKING_SPLIT_STRATEGY)),
+                "backend": str(self.config.get("packer_backend", d.PACKER_BACKEND)),
+                "precheck": bool(self.config.get("packing_precheck", d.ENABLE_PACKING_PRECHECK)),
+                "packing_mode": str(self.config.get("packing_mode", d.PACKING_MODE)),
+                "prefix_trie_max_nodes": int(self.config.get("prefix_trie_max_nodes", d.PREFIX_TRIE_MAX_NODES)),
+            }
+            self.record_final_placements = bool(self.config.get("record_final_placements", d.RECORD_FINAL_PLACEMENTS))
+            self.packing_stats = new_packing_stats()
+
+    # -- decoding ---------------------------------------------------------
+
+    @staticmethod
+    def build_customer_boxcount_map(customers):
+        return {
+            c["customer_id"]: len(c.get("assigned_boxes", []))
+            for c in customers
+        }
+
+    @staticmethod
+    def decode_by_boxcount(order, cust_boxcount_map, max_boxes_per_route=48):
+        routes = []
+        cur = []
+        cur_boxes = 0
+
+        for cid in order:
+            b = cust_boxcount_map.get(cid, 0)
+
+            if cur and (cur_boxes + b > max_boxes_per_route):
+                routes.append(cur)
+                cur = [cid]
+                cur_boxes = b
+            else:
+                cur.append(cid)
+                cur_boxes += b
+
+        if cur:
+            routes.append(cur)
+
+        return routes
+
+    def decode_routes(self, order, cust_boxcount_map, distances):
+        if self.split_decoder == "optimal":
+            return optimal_split(
+                order,
+                cust_boxcount_map,
+                distances,
+                max_boxes_per_route=self.max_boxes_per_route,
+                max_route_customers=self.split_max_route_customers,
+            )
+        return self.decode_by_boxcount(
+            order,
+            cust_boxcount_map,
+            max_boxes_per_route=self.max_boxes_per_route
+        )
+
+    # -- scoring and mutation plug-ins --------------------------------------
+
+    def evaluate_permutation(self, merged_path, perm):
+        raise NotImplementedError
+
+    def mutate(self, child, dataset):
+        raise NotImplementedError
+
+    def evaluate_route_cached(self, merged_path, route):
+        """Packing result of one route, through the route cache."""
+        route_key = tuple(route)
+        route_eval = self.route_eval_cache.get(route_key)
+        if route_eval is None:
+            route_eval = evaluate_route(
+                merged_path,
+                route,
+                use_packing=self.use_packing,
+                **self.packing_options,
+            )
+            self.route_eval_cache[route_key] = route_eval
+            record_packing_stats(self.packing_stats, route_eval)
+        return route_eval
+
+    def improve_order(self, order, dataset):
+        """Memetic step: order with each decoded route locally optimised."""
+        distances = self.local_search.distances
+        routes = self.decode_routes(order, dataset.box_counts, distances)
+        return self.local_search.improve_order(routes)
+
+    def deduplicated(self, population, evaluate_indices, variant=None):
+        """
+        Results of evaluate_indices(indices) spread over the population; with
+        deduplicate_population only the distinct, not yet evaluated individuals
+        are passed on.
+        """
+        if self.population_dedup is None or not self.deduplicate_population:
+            return evaluate_indices(list(range(len(population))))
+        return self.population_dedup.evaluate(population, evaluate_indices, variant)
+
+    def evaluate_population(self, merged_path, population):
+        def evaluate_indices(indices):
+            individuals = [population[index] for index in indices]
+            if self.parallel_evaluator is not None:
+                return self.parallel_evaluator.evaluate(individuals)
+            return [self.evaluate_permutation(merged_path, individual) for individual in individuals]
+
+        return self.deduplicated(population, evaluate_indices)
+
+    def evaluate_generation(self, merged_path, population, generation, parents):
+        """
+        (score, individual, info) of the population, sorted by score (stable,
+        so ties keep population order). parents[i] is the parent of a
+        mutation-only child, or None; models with delta evaluation use it.
+        """
+        scored_population = [
+            (score, individual, info)
+            for individual, (score, info) in zip(population, self.evaluate_population(merged_path, population))
+        ]
+        scored_population.sort(key=lambda x: x[0])
+        return scored_population
+
+    def finalize_best(self, merged_path, best_solution, best_score, best_info):
+        """(score, info) reported for the best solution; hook for a final refinement."""
+        return best_score, best_info
+
+    def finalize_best_info(self, merged_path, best_info):
+        """Re-pack the best solution's routes in full detail; attaches per-route placements."""
+        route_details = repack_route_details(merged_path, best_info["routes"], use_packing=self.use_packing, **self.packing_options)
+        finalized = dict(best_info)
+        finalized["routes"] = route_details
+        finalized["boxes_packed"] = sum(detail["boxes_packed"] for detail in route_details)
+        finalized["fill_rate"] = sum(detail["fill_rate"] for detail in route_details) / len(route_details) if route_details else 0.0
+        return finalized
+
+    # -- per-run state ------------------------------------------------------
+
+    def new_cache(self, name, max_entries, max_mb):
+        """BoundedCache limited by the "<name>_cache_max_entries" / "<name>_cache_max_mb" config keys."""
+        return BoundedCache(
+            name,
+            max_entries=self.config.get(f"{name}_cache_max_entries", max_entries),
+            max_mb=self.config.get(f"{name}_cache_max_mb", max_mb),
+            policy=self.cache_eviction_policy,
+        )
+
+    def begin_run(self, dataset):
+        """Fresh caches and counters at the start of run()."""
+        self.dataset = dataset
+        if self.use_packing:
+            self.route_eval_cache = self.new_cache("route_eval", self.defaults.ROUTE_EVAL_CACHE_MAX_ENTRIES, self.defaults.ROUTE_EVAL_CACHE_MAX_MB)
+            self.packing_stats = new_packing_stats()
+        if self.local_search_mode != "off":
+            self.local_search = RouteLocalSearch(
+                get_distance_provider(dataset, **self.distance_options),
+                neighbors=self.local_search_neighbors,
+                max_segment=self.local_search_max_segment,
+            )
+        if self.deduplicate_population or self.duplicate_immigrants:
+            self.population_dedup = PopulationDedup(dataset.customer_ids)
+
+    def evaluation_caches(self) -> dict:
+        """Caches reported under "cache_stats", by name."""
+        if self.route_eval_cache is None:
+            return {}
+        return {"route_eval": self.route_eval_cache}
+
+    def packer_calls(self):
+        return None if self.packing_stats is None else self.packing_stats["packer_calls"]
+
+    def run_counters(self) -> dict:
+        """Counters carried across a checkpoint."""
+        counters = {}
+        if self.packing_stats is not None:
+            counters["packing_stats"] = dict(self.packing_stats)
+        if self.local_search is not None:
+            counters["local_search_stats"] = dict(self.local_search.stats)
+        if self.population_dedup is not None:
+            counters["dedup_stats"] = dict(self.population_dedup.stats)
+        return counters
+
+    def restore_run_counters(self, state):
+        if self.packing_stats is not None:
+            self.packing_stats.update(state["packing_stats"])
+        if self.local_search is not None:
+            self.local_search.stats.update(state["local_search_stats"])
+        if self.population_dedup is not None:
+            self.population_dedup.stats.update(state["dedup_stats"])
+
+    def result_stats(self) -> dict:
+        """Counters appended to the run result."""
+        stats = {}
+        if self.packing_stats is not None:
+            caches = {name: cache.stats() for name, cache in self.evaluation_caches().items()}
+            caches["dataset"] = dataset_cache_stats()
+            caches["compiled_dataset"] = compiled_cache_stats()
+            caches.update(self.dataset.cache_sizes())
+            stats["packing_stats"] = dict(self.packing_stats)
+            stats["cache_stats"] = caches
+        if self.local_search is not None:
+            stats["local_search"] = dict(self.local_search.stats)
+        if self.population_dedup is not None:
+            stats["dedup_stats"] = dict(self.population_dedup.stats)
+        return stats
+
+    # -- parallel evaluation and checkpoints ---------------------------------
+
+    def parallel_evaluator_options(self) -> dict:
+        return {}
+
+    def start_parallel_evaluator(self, dataset):
+        if self.parallel_eval_workers > 0:
+            self.parallel_evaluator = ParallelEvaluator(
+                self,
+                type(self).__module__,
+                dataset.path,
+                self.parallel_eval_workers,
+                chunk_size=self.parallel_eval_chunk_size,
+                **self.parallel_evaluator_options(),
+            )
+
+    def stop_parallel_evaluator(self):
+        if self.parallel_evaluator is not None:
+            self.parallel_evaluator.close()
+            self.parallel_evaluator = None
+
+    def save_checkpoint(self, next_generation, population, best_solution, best_score, best_info, history, selector, elapsed_seconds, mutation_parents):
+        state = {
+            "generation": next_generation,
+            "population": population,
+            "best_solution": best_solution,
+            "best_score": best_score,
+            "best_info": best_info,
+            "history": history,
+            "random_state": random.getstate(),
+            "selector_state": selector.rng.bit_generator.state,
+            "elapsed_seconds": elapsed_seconds,
+            # id(child) keys do not survive pickling; store parents by position.
+            "mutation_parents": [mutation_parents.get(id(individual)) for individual in population],
+        }
+        state.update(self.run_counters())
+        if self.checkpointer.include_route_cache and self.route_eval_cache is not None:
+            state["route_eval_cache"] = self.route_eval_cache
+        self.checkpointer.save(state)
+
+    def restore_checkpoint(self, state, selector):
+        """Restore RNGs and counters from a checkpoint; returns its loop state."""
+        random.setstate(state["random_state"])
+        selector.rng.bit_generator.state = state["selector_state"]
+        self.restore_run_counters(state)
+        if state.get("route_eval_cache") is not None:
+            self.route_eval_cache = state["route_eval_cache"]
+        population = state["population"]
+        mutation_parents = {
+            id(individual): parent
+            for individual, parent in zip(population, state.get("mutation_parents", ()))
+            if parent is not None
+        }
+        return population, state["best_solution"], state["best_score"], state["best_info"], state["history"], mutation_parents
+
+    # -- the loop -------------------------------------------------------------
+
+    def run(self, merged_path):
+        random.seed(self.seed)
+        selector = ParentSelector(
+            self.selection_scheme,
+            tournament_size=self.tournament_size,
+            pressure=self.selection_pressure,
+            seed=self.seed,
+        )
+
+        overall_start = time.perf_counter()
+
+        dataset = compile_dataset(merged_path)
+        merged_path = dataset
+        self.begin_run(dataset)
+        customer_ids = list(dataset.customer_ids)
+        n = len(customer_ids)
+        self.start_parallel_evaluator(dataset)
+
+        population = [random.sample(customer_ids, n) for _ in range(self.pop_size - 2)]
+        population.append(customer_ids[:])
+        population.append(list(reversed(customer_ids)))
+
+        best_solution = None
+        best_score = float("inf")
+        best_info = None
+        history = []
+        stop_reason = "max_generations"
+        generation_start = overall_start
+        # Mutation-only children, keyed by id(child), for delta evaluation.
+        mutation_parents = {}
+
+        start_generation = 0
+        state = self.checkpointer.load()
+        if state is not None:
+            population, best_solution, best_score, best_info, history, mutation_parents = self.restore_checkpoint(state, selector)
+            start_generation = state["generation"]
+            overall_start -= state["elapsed_seconds"]
+            if self.verbose:
+                print(f"[{self.progress_label}] Resuming from checkpoint at generation {start_generation + 1}")
+
+        for generation in range(start_generation, self.gens):
+            parents = [mutation_parents.get(id(individual)) for individual in population]
+            if self.deduplicate_population:
+                self.population_dedup.begin_generation()
+            scored_population = self.evaluate_generation(merged_path, population, generation, parents)
+            if self.deduplicate_population:
+                self.population_dedup.end_generation()
+
+            for score, individual, info in scored_population:
+                if score < best_score:
+                    best_score = score
+                    best_solution = individual[:]
+                    best_info = info
+
+            elite_count = max(4, int(0.05 * self.pop_size))
+            new_population = [scored_population[i][1][:] for i in range(elite_count)]
+            if self.local_search_mode == "elites":
+                new_population = [self.improve_order(individual, dataset) for individual in new_population]
+            mutation_parents = {}
+
+            # Scores and individuals are gathered once; the selector yields each child's parents.
+            scores_only = [x[0] for x in scored_population]
+            population_only = [x[1] for x in scored_population]
+            parent_pairs = selector.parent_pairs(population_only, scores_only, self.pop_size - len(new_population))
+
+            while len(new_population) < self.pop_size:
+                parent1, parent2 = next(parent_pairs)
+
+                crossed = random.random() < self.cx_prob
+                if crossed:
+                    child = self.crossover(parent1, parent2)
+                else:
+                    child = parent1[:]
+
+                child = self.mutate(child, dataset)
+                if self.local_search_mode == "children":
+                    child = self.improve_order(child, dataset)
+
+                if not crossed:
+                    mutation_parents[id(child)] = parent1
+                new_population.append(child)
+
+            if self.duplicate_immigrants:
+                positions = self.population_dedup.duplicate_positions(new_population, elite_count)
+                for position in positions:
+                    mutation_parents.pop(id(new_population[position]), None)
+                    new_population[position] = random.sample(customer_ids, n)
+                self.population_dedup.stats["immigrants"] += len(positions)
+
+            population = new_population
+            if self.migration_hook is not None:
+                population = self.migration_hook(generation, population, scored_population)
+            history.append(best_score)
+
+            if self.verbose and (generation % 10 == 0 or generation == self.gens - 1):
+                elapsed = time.perf_counter() - generation_start
+                print(
+                    f"[{self.progress_label}] Generation {generation + 1}/{self.gens} "
+                    f"Best Score = {best_score:.2f} Elapsed = {elapsed:.2f}s"
+                    + (
+                        f" Unique evals = {self.population_dedup.stats['unique_evaluation_rate'][-1]:.0%}"
+                        if self.deduplicate_population
+                        else ""
+                    )
+                )
+
+            early_stop = self.early_stopping.check(history, time.perf_counter() - overall_start, self.packer_calls())
+            if early_stop is not None:
+                stop_reason = early_stop
+                if self.verbose:
+                    print(f"[{self.progress_label}] Stopping after generation {generation + 1}: {stop_reason}")
+                break
+
+            if self.checkpointer.due(generation, self.gens):
+                self.save_checkpoint(
+                    generation + 1,
+                    population,
+                    best_solution,
+                    best_score,
+                    best_info,
+                    history,
+                    selector,
+                    time.perf_counter() - overall_start,
+                    mutation_parents,
+                )
+
+        self.stop_parallel_evaluator()
+
+        if best_solution is not None:
+            best_score, best_info = self.finalize_best(merged_path, best_solution, best_score, best_info)
+
+        if self.record_final_placements and best_info is not None:
+            best_info = self.finalize_best_info(merged_path, best_info)
+
+        runtime_seconds = time.perf_counter() - overall_start
+
+        result = {
+            "model": self.model_name,
+            "best_order": best_solution,
+            "best_score": best_score,
+            "best_info": best_info,
+            "history": history,
+            "generations_completed": len(history),
+            "stop_reason": stop_reason,
+            "resumed_from_generation": start_generation,
+            "runtime_seconds": runtime_seconds,
+            "duration": runtime_seconds,
+        }
+        result.update(self.result_stats())
+
+        return result
+
+
+class PenaltyScoredGA(GAEngine):
+    """
+    Scoring of the baselines: the decoded routes' total distance, plus
+    PENALTY_ALPHA per route the packer could not load. Without packing every
+    route counts as feasible and only box totals are reported.
+    report_packing_reward adds fill_rate * 100 as "packing_reward".
+    """
+
+    report_packing_reward = False
+
+    def __init__(self, config: dict):
+        super().__init__(config)
+        self.penalty_alpha = self.config.get("penalty_alpha", self.defaults.PENALTY_ALPHA)
+
+    def evaluate_permutation(self, merged_path, perm):
+        dataset = compile_dataset(merged_path)
+
+        cust_box_map = dataset.box_counts
+        distances = get_distance_provider(dataset, **self.distance_options)
+        routes = self.decode_routes(perm, cust_box_map, distances)
+
+        total_distance = 0.0
+        infeasible_count = 0
+        feasible_routes = 0
+        total_boxes = 0
+        total_boxes_packed = 0
+        total_fill_rate = 0.0
+        packing_time = 0.0
+
+        route_details = []
+
+        for route, route_distance in zip(routes, distances.partition_distances(routes)):
+            total_distance += route_distance
+
+            if self.use_packing:
+                pack_start = time.perf_counter()
+                route_eval = self.evaluate_route_cached(merged_path, route)
+                packing_time += time.perf_counter() - pack_start
+
+                feasible = route_eval.get("feasible", False)
+                if feasible:
+                    feasible_routes += 1
+                else:
+                    infeasible_count += 1
+                boxes_total = route_eval.get("boxes_total", 0)
+                boxes_packed = route_eval.get("boxes_packed", 0)
+                fill_rate = route_eval.get("fill_rate", 0.0)
+            else:
+                feasible = None
+                boxes_total = sum(cust_box_map[customer_id] for customer_id in route)
+                boxes_packed = 0
+                fill_rate = 0.0
+
+            total_boxes += boxes_total
+            total_boxes_packed += boxes_packed
+            total_fill_rate += fill_rate
+
+            route_details.append({
+                "route": route,
+                "distance": route_distance,
+                "feasible": feasible,
+                "boxes_total": boxes_total,
+                "boxes_packed": boxes_packed,
+                "fill_rate": fill_rate
+            })
+
+        avg_fill_rate = total_fill_rate / len(routes) if routes else 0.0
+        feasibility_rate = feasible_routes / len(routes) if routes else 0.0
+
+        if infeasible_count == 0:
+            score = total_distance
+        else:
+            score = total_distance + (self.penalty_alpha * infeasible_count)
+
+        info = {
+            "total_distance": total_distance,
+            "infeasible_count": infeasible_count,
+            "infeasible_routes": infeasible_count,
+            "feasible_routes": feasible_routes,
+            "feasibility_rate": feasibility_rate,
+            "boxes_total": total_boxes,
+            "boxes_packed": total_boxes_packed,
+            "fill_rate": avg_fill_rate,
+            "packing_time_seconds": packing_time,
+            "routes": route_details,
+        }
+        if self.report_packing_reward:
+            info["packing_reward"] = avg_fill_rate * 100
+        return score, info
+
+    def finalize_best_info(self, merged_path, best_info):
+        finalized = super().finalize_best_info(merged_path, best_info)
+        if self.report_packing_reward:
+            finalized["packing_reward"] = finalized["fill_rate"] * 100
+        return finalized
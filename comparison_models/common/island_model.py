@@ -0,0 +1,234 @@
+# comparison_models/common/island_model.py
+# Island-model GA: N copies of a model's GARunner evolve in separate processes
+# and exchange elites every K generations. Islands share one packing-result
+# table (see loaders/shared_dataset.py), so a route packed on one island is not
+# packed again on another.
+
+import importlib
+import multiprocessing
+import queue
+import random
+import time
+
+from comparison_models.common.loaders.shared_dataset import SharedEvaluationContext, init_shared_worker
+
+MIGRATION_TOPOLOGIES = ("ring", "random")
+ISLAND_SEED_STRIDE = 100003
+MIGRATION_POLL_SECONDS = 1.0
+
+
+def migration_cycles(islands: int, epochs: int, topology: str, seed: int) -> list[list[int]]:
+    """
+    Island order of every migration epoch: island cycle[k] sends its elites to
+    cycle[k + 1] (wrapping). "ring" keeps 0 -> 1 -> ... -> N-1 -> 0; "random"
+    draws a fresh cycle per epoch from the run seed, so migration is reproducible.
+    """
+    if topology not in MIGRATION_TOPOLOGIES:
+        raise ValueError(f"Unknown migration topology '{topology}'. Valid values: {', '.join(MIGRATION_TOPOLOGIES)}")
+    order = list(range(islands))
+    if topology == "ring":
+        return [order[:] for _ in range(epochs)]
+    rng = random.Random(seed)
+    cycles = []
+    for _ in range(epochs):
+        rng.shuffle(order)
+        cycles.append(order[:])
+    return cycles
+
+
+class IslandMigrator:
+    """
+    GARunner.migration_hook of one island. After every `interval` generations the
+    island sends copies of its best `size` individuals to the next island of the
+    epoch's cycle and replaces the last `size` individuals of its next population
+    with the migrants it receives. The exchange is synchronous, so each island's
+    run is deterministic for a given seed regardless of process timing.
+
+    An island that stops early calls finish(), which sends an empty message
+    for every epoch it skips; its receivers then go on without migrants.
+    """
+
+    def __init__(self, island: int, interval: int, size: int, cycles: list[list[int]], inboxes: list, abort_event):
+        self.island = island
+        self.interval = max(1, int(interval))
+        self.size = max(0, int(size))
+        self.cycles = cycles
+        self.inboxes = inboxes
+        self.abort_event = abort_event
+        self.migrations = 0
+        self.next_epoch = 0
+        self.received: dict = {}
+
+    def __call__(self, generation: int, population: list, scored_population: list) -> list:
+        if self.size <= 0 or (generation + 1) % self.interval:
+            return population
+        epoch = (generation + 1) // self.interval - 1
+        if epoch >= len(self.cycles):
+            return population
+
+        elites = [individual[:] for _, individual, _ in scored_population[:self.size]]
+        self.inboxes[self._target(epoch)].put((epoch, elites))
+        self.next_epoch = epoch + 1
+
+        # Messages of later epochs (sent ahead by a stopped island) are kept.
+        while epoch not in self.received:
+            if self.abort_event.is_set():
+                raise RuntimeError(f"Island {self.island}: another island failed, stopping migration.")
+            try:
+                received_epoch, received = self.inboxes[self.island].get(timeout=MIGRATION_POLL_SECONDS)
+            except queue.Empty:
+                continue
+            if received_epoch < epoch or received_epoch in self.received:
+                raise RuntimeError(f"Island {self.island}: expected migrants of epoch {epoch}, got {received_epoch}.")
+            self.received[received_epoch] = received
+        migrants = self.received.pop(epoch)
+        if migrants is None:
+            return population
+
+        self.migrations += 1
+        keep = max(0, len(population) - len(migrants))
+        return population[:keep] + [migrant[:] for migrant in migrants[:len(population)]]
+
+
+    def _target(self, epoch: int) -> int:
+        cycle = self.cycles[epoch]
+        return cycle[(cycle.index(self.island) + 1) % len(cycle)]
+
+    def finish(self) -> None:
+        if self.size <= 0:
+            return
+        for epoch in range(self.next_epoch, len(self.cycles)):
+            self.inboxes[self._target(epoch)].put((epoch, None))
+
+
+def _run_island(runner_module, config, dataset_path, island, migration, inboxes, abort_event, shared_specs, shared_lock, results):
+    try:
+        init_shared_worker(shared_specs, shared_lock)
+        runner = importlib.import_module(runner_module).GARunner(config)
+        runner.migration_hook = IslandMigrator(
+            island,
+            migration["interval"],
+            migration["size"],
+            migration["cycles"],
+            inboxes,
+            abort_event,
+        )
+        result = runner.run(dataset_path)
+        runner.migration_hook.finish()
+        result["migrations"] = runner.migration_hook.migrations
+        results.put((island, result, None))
+    except BaseException as exc:
+        abort_event.set()
+        results.put((island, None, f"{type(exc).__name__}: {exc}"))
+
+
+def _drain(inbox) -> None:
+    try:
+        while True:
+            inbox.get_nowait()
+    except queue.Empty:
+        pass
+
+
+def run_island_model(runner_module: str, config: dict, dataset_path: str) -> dict:
+    """
+    Run config["islands"] islands of runner_module's GARunner on dataset_path and
+    merge them into one result. Each island keeps the configured pop_size and
+    uses seed + i * ISLAND_SEED_STRIDE (island 0 uses the run seed). The merged
+    result is the best island's, with "history" replaced by the global best per
+    generation and per-island histories under "island_histories".
+    """
+    islands = int(config["islands"])
+    gens = int(config.get("gens", config.get("num_generations", 200)))
+    seed = int(config.get("seed", 42))
+    interval = max(1, int(config.get("migration_interval", 10)))
+    size = int(config.get("migration_size", 2))
+    topology = str(config.get("migration_topology", "ring"))
+    # No exchange after the last generation: its population is never evaluated.
+    cycles = migration_cycles(islands, max(0, gens - 1) // interval, topology, seed)
+    migration = {"interval": interval, "size": size, "cycles": cycles}
+
+    ctx = multiprocessing.get_context("spawn")
+    start = time.perf_counter()
+    inboxes = [ctx.Queue() for _ in range(islands)]
+    results = ctx.Queue()
+    abort_event = ctx.Event()
+    island_results: dict[int, dict] = {}
+    errors: list[str] = []
+    base_label = str(config.get("progress_label", runner_module))
+
+    with SharedEvaluationContext([dataset_path], ctx) as shared:
+        processes = []
+        for island in range(islands):
+            island_config = dict(
+                config,
+                islands=1,
+                checkpoint_path=None,
+                seed=seed + island * ISLAND_SEED_STRIDE,
+                progress_label=f"{base_label} island {island}",
+            )
+            process = ctx.Process(
+                target=_run_island,
+                args=(runner_module, island_config, dataset_path, island, migration, inboxes, abort_event, shared.specs, shared.lock, results),
+            )
+            process.start()
+            processes.append(process)
+
+        while len(island_results) + len(errors) < islands:
+            # A finished island no longer reads its inbox; drain it so senders
+            # never block on a full pipe.
+            for island in island_results:
+                _drain(inboxes[island])
+            try:
+                island, result, error = results.get(timeout=MIGRATION_POLL_SECONDS)
+            except queue.Empty:
+                if any(process.exitcode not in (None, 0) for process in processes):
+                    abort_event.set()
+                    if all(process.exitcode is not None for process in processes):
+                        errors.append("island process exited without a result")
+                        break
+                continue
+            if error is None:
+                island_results[island] = result
+            else:
+                errors.append(f"island {island}: {error}")
+        for inbox in inboxes:
+            _drain(inbox)
+        for process in processes:
+            process.join()
+
+    if errors or len(island_results) < islands:
+        raise RuntimeError("Island model run failed: " + "; ".join(errors))
+
+    ordered = [island_results[island] for island in range(islands)]
+    best_island = min(range(islands), key=lambda island: ordered[island]["best_score"])
+    island_histories = [list(result.get("history", [])) for result in ordered]
+    # Islands that stopped early keep their last best score.
+    generations = max(len(history) for history in island_histories)
+    padded = [history + history[-1:] * (generations - len(history)) for history in island_histories]
+    global_history = [min(values) for values in zip(*padded)]
+
+    merged = dict(ordered[best_island])
+    merged["history"] = global_history
+    merged["island_histories"] = island_histories
+    merged["island_best_scores"] = [result["best_score"] for result in ordered]
+    merged["islands"] = islands
+    merged["best_island"] = best_island
+    merged["generations_completed"] = generations
+    merged["island_stop_reasons"] = [result.get("stop_reason") for result in ordered]
+    merged["migration"] = {
+        "interval": interval,
+        "size": size,
+        "topology": topology,
+        "migrations_per_island": [result.get("migrations", 0) for result in ordered],
+    }
+    merged.pop("migrations", None)
+    packing_stats: dict = {}
+    for result in ordered:
+        for key, value in (result.get("packing_stats") or {}).items():
+            packing_stats[key] = packing_stats.get(key, 0) + value
+    if packing_stats:
+        merged["packing_stats"] = packing_stats
+    merged["runtime_seconds"] = time.perf_counter() - start
+    merged["duration"] = merged["runtime_seconds"]
+    return merged
@@ -0,0 +1,336 @@
+# comparison_models/common/loaders/compiled_dataset.py
+# Integer-indexed, array-backed form of a merged dataset JSON. It is built once
+# per dataset and shared by the GA runners and the route evaluator, so neither
+# rebuilds customer/box dicts per evaluation. The arrays are also written to a
+# binary sidecar next to the JSON so later processes skip JSON parsing.
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from comparison_models.common.bounded_cache import BoundedCache
+from comparison_models.common.utils.packer import ORIENTATION_INDEX
+
+# Keyed by the path as given and by its resolved form, so one dataset may hold
+# two entries. Each dataset carries its prefix tries and distance providers.
+COMPILED_DATASET_CACHE_MAX_ENTRIES = 16
+_COMPILED_CACHE = BoundedCache("compiled_dataset", max_entries=COMPILED_DATASET_CACHE_MAX_ENTRIES)
+# Datasets registered with pin_dataset (e.g. attached to shared memory); never
+# evicted, and looked up before _COMPILED_CACHE.
+_PINNED_DATASETS: dict[str, "CompiledDataset"] = {}
+
+SIDECAR_SUFFIX = ".compiled.npz"
+SIDECAR_VERSION = 1
+USE_DATASET_SIDECAR = True
+
+
+def _normalize_container_for_packer(container: dict) -> dict:
+    """
+    Return a dict with keys 'L','W','H' (numbers) for the packer.
+    Tries several likely key names in order.
+    """
+    # helper to pick numeric value from several keys
+    def pick(keys, default=None):
+        for k in keys:
+            if k in container and container[k] is not None:
+                # if container[k] is a dict/str etc, try to coerce to float if possible
+                v = container[k]
+                try:
+                    return float(v)
+                except Exception:
+                    # leave as-is for now
+                    return v
+        return default
+
+    L = pick(["L","length","l","Length","len","width","Width"])
+    W = pick(["W","width","w","Width","width","depth","Depth","height"])
+    H = pick(["H","height","h","Height","depth","Depth"])
+    # If any value still missing, set a conservative positive default 1.0
+    try:
+        L = float(L) if L is not None else 1.0
+    except Exception:
+        L = 1.0
+    try:
+        W = float(W) if W is not None else 1.0
+    except Exception:
+        W = 1.0
+    try:
+        H = float(H) if H is not None else 1.0
+    except Exception:
+        H = 1.0
+
+    return {"L": L, "W": W, "H": H}
+
+
+def sidecar_path(path: Path) -> Path:
+    """Binary sidecar of a merged JSON, e.g. X_merged_with_boxes_norm.compiled.npz."""
+    path = Path(path)
+    return path.with_name(path.stem + SIDECAR_SUFFIX)
+
+
+def _source_digest(raw: bytes) -> str:
+    return hashlib.sha1(raw).hexdigest()
+
+
+def _arrays_from_json(data: dict, path: str) -> dict:
+    """Compiled arrays of a parsed merged JSON (the sidecar payload)."""
+    customers = data.get("customers", [])
+    boxes = data.get("boxes", [])
+    # Same depot convention as split_depot_and_customers: first customer entry.
+    depot = customers[0] if customers else None
+    real_customers = customers[1:]
+
+    box_ids = [b.get("box_id") for b in boxes]
+    box_row = {box_id: row for row, box_id in enumerate(box_ids)}
+    assigned_ptr = [0]
+    assigned_ids = []
+    box_ptr = [0]
+    box_index = []
+    for c in real_customers:
+        assigned = list(c.get("assigned_boxes", []))
+        assigned_ids.extend(assigned)
+        assigned_ptr.append(len(assigned_ids))
+        box_index.extend(box_row[bid] for bid in assigned if bid in box_row)
+        box_ptr.append(len(box_index))
+
+    container = _normalize_container_for_packer(data.get("container", {}))
+    return {
+        "inst_name": np.array(data.get("inst_name") or data.get("name") or Path(path).stem),
+        "depot_id": np.array([depot.get("customer_id")] if depot else []),
+        "depot_assigned_ids": np.array([str(bid) for bid in depot.get("assigned_boxes", [])] if depot else [], dtype=np.str_),
+        "depot_xy": np.array((depot["x"], depot["y"]) if depot else (0, 0), dtype=np.float64),
+        "container_dims": np.array((container["L"], container["W"], container["H"]), dtype=np.float64),
+        "customer_ids": np.array([c["customer_id"] for c in real_customers]),
+        "xy": np.array([(c["x"], c["y"]) for c in real_customers], dtype=np.float64).reshape(-1, 2),
+        "demand": np.array([c.get("demand", 0) or 0 for c in real_customers], dtype=np.float64),
+        "assigned_ptr": np.array(assigned_ptr, dtype=np.int32),
+        "assigned_ids": np.array([str(bid) for bid in assigned_ids], dtype=np.str_),
+        "box_ids": np.array([str(bid) for bid in box_ids], dtype=np.str_),
+        "box_ptr": np.array(box_ptr, dtype=np.int32),
+        "box_index": np.array(box_index, dtype=np.int32),
+        "box_dims": np.array(
+            [(b["length"], b["width"], b["height"]) for b in boxes], dtype=np.float64
+        ).reshape(-1, 3),
+    }
+
+
+def _read_sidecar(path: Path, source_stat: os.stat_result) -> dict | None:
+    """Sidecar arrays if the sidecar matches the JSON (mtime/size, else content hash)."""
+    sidecar = sidecar_path(path)
+    if not sidecar.exists():
+        return None
+    try:
+        with np.load(sidecar, allow_pickle=False) as npz:
+            arrays = {key: npz[key] for key in npz.files}
+        meta = arrays.pop("_meta")
+        digest = str(arrays.pop("_digest"))
+    except Exception:
+        return None
+    version, size, mtime_ns = (int(value) for value in meta)
+    if version != SIDECAR_VERSION:
+        return None
+    if size == source_stat.st_size and mtime_ns == source_stat.st_mtime_ns:
+        return arrays
+    # Touched or copied file: only the content decides.
+    if size == source_stat.st_size and digest == _source_digest(path.read_bytes()):
+        return arrays
+    return None
+
+
+def _write_sidecar(path: Path, source_stat: os.stat_result, digest: str, arrays: dict) -> None:
+    """Atomic write; a read-only dataset directory simply keeps using the JSON."""
+    sidecar = sidecar_path(path)
+    tmp = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+    meta = np.array((SIDECAR_VERSION, source_stat.st_size, source_stat.st_mtime_ns), dtype=np.int64)
+    try:
+        with tmp.open("wb") as handle:
+            np.savez(handle, _meta=meta, _digest=np.array(digest), **arrays)
+        os.replace(tmp, sidecar)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def load_compiled_arrays(path: Path, use_sidecar: bool = USE_DATASET_SIDECAR) -> dict:
+    """Compiled arrays for a merged JSON, from the sidecar when it is current."""
+    source_stat = path.stat()
+    if use_sidecar:
+        arrays = _read_sidecar(path, source_stat)
+        if arrays is not None:
+            return arrays
+    raw = path.read_bytes()
+    try:
+        data = json.loads(raw.decode("utf-8-sig"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Failed to parse merged JSON {path.resolve()}: {e}") from e
+    arrays = _arrays_from_json(data, str(path))
+    if use_sidecar:
+        _write_sidecar(path, source_stat, _source_digest(raw), arrays)
+    return arrays
+
+
+class CompiledDataset:
+    """
+    Customers (depot excluded) are rows 0..n-1 in file order; boxes are rows
+    0..m-1 in file order.
+
+    Arrays:
+      xy                float64 (n, 2)     customer coordinates
+      demand            float64 (n,)       customer demand
+      box_ptr           int32 (n + 1)      CSR offsets into box_index per customer
+      box_index         int32 (nnz,)       box rows of each customer, in assigned order
+      box_dims          float64 (m, 3)     length, width, height
+      box_orientations  float64 (m, 6, 3)  box_dims in the packer's 6 orientations
+      box_volumes       float64 (m,)
+      container_dims    (L, W, H) floats
+    assigned_ptr / assigned_ids keep each customer's assigned box ids as listed,
+    including ids missing from the box list.
+
+    The Python lookups used on hot paths (points, box_counts, customer boxes)
+    are built once from the arrays; `arrays` keeps the source dict (the sidecar
+    and shared-memory payload).
+    """
+
+    def __init__(self, arrays: dict, path: str):
+        self.path = path
+        self.arrays = arrays
+        self.inst_name = str(arrays["inst_name"])
+        depot_id = arrays["depot_id"]
+        self.depot_id = depot_id.tolist()[0] if len(depot_id) else None
+        self.depot_assigned_ids = arrays["depot_assigned_ids"].tolist()
+        depot_xy = arrays["depot_xy"].tolist()
+        self.depot_xy = (depot_xy[0], depot_xy[1]) if self.depot_id is not None else (0, 0)
+
+        self.container_dims = tuple(arrays["container_dims"].tolist())
+        self.container = dict(zip(("L", "W", "H"), self.container_dims))
+
+        self.xy = arrays["xy"]
+        self.demand = arrays["demand"]
+        self.assigned_ptr = arrays["assigned_ptr"]
+        self.assigned_ids = arrays["assigned_ids"]
+        self.box_ptr = arrays["box_ptr"]
+        self.box_index = arrays["box_index"]
+        self.box_dims = arrays["box_dims"]
+        self.box_orientations = self.box_dims[:, ORIENTATION_INDEX]
+        self.box_volumes = self.box_dims.prod(axis=1)
+
+        self.customer_ids = arrays["customer_ids"].tolist()
+        self.customer_index = {cid: row for row, cid in enumerate(self.customer_ids)}
+        self.points = dict(zip(self.customer_ids, map(tuple, self.xy.tolist())))
+        self.box_counts = dict(zip(self.customer_ids, np.diff(self.assigned_ptr).tolist()))
+
+        self.box_ids = arrays["box_ids"].tolist()
+        self.packer_boxes = [
+            {"box_id": box_id, "length": l, "width": w, "height": h}
+            for box_id, (l, w, h) in zip(self.box_ids, self.box_dims.tolist())
+        ]
+        box_ptr = self.box_ptr.tolist()
+        box_index = self.box_index.tolist()
+        self.customer_boxes = [
+            [self.packer_boxes[j] for j in box_index[box_ptr[row]:box_ptr[row + 1]]]
+            for row in range(len(self.customer_ids))
+        ]
+        self.packing_tries: dict = {}
+        self.distance_providers: dict = {}
+        # SharedPackingTable attached by a process-pool initializer (shared_dataset).
+        self.shared_packing = None
+
+    @property
+    def num_customers(self) -> int:
+        return len(self.customer_ids)
+
+    @property
+    def assigned_box_count(self) -> int:
+        """Distinct box ids assigned to customers, or all boxes if none are assigned."""
+        distinct = len(set(self.assigned_ids.tolist()))
+        return distinct if distinct else len(self.box_ids)
+
+    def boxes_for_customer(self, cid) -> list[dict]:
+        row = self.customer_index.get(cid)
+        return self.customer_boxes[row] if row is not None else []
+
+    def customer_box_rows(self, cid) -> np.ndarray:
+        row = self.customer_index[cid]
+        return self.box_index[self.box_ptr[row]:self.box_ptr[row + 1]]
+
+    def as_merged(self) -> tuple[str, dict, list, list]:
+        """(inst_name, container, customers, boxes) dicts in the load_merged layout."""
+        customers = []
+        if self.depot_id is not None:
+            customers.append({
+                "customer_id": self.depot_id,
+                "x": self.depot_xy[0],
+                "y": self.depot_xy[1],
+                "demand": 0,
+                "assigned_boxes": list(self.depot_assigned_ids),
+            })
+        assigned_ptr = self.assigned_ptr.tolist()
+        assigned_ids = self.assigned_ids.tolist()
+        demand = self.demand.tolist()
+        for row, cid in enumerate(self.customer_ids):
+            x, y = self.points[cid]
+            customers.append({
+                "customer_id": cid,
+                "x": x,
+                "y": y,
+                "demand": demand[row],
+                "assigned_boxes": assigned_ids[assigned_ptr[row]:assigned_ptr[row + 1]],
+            })
+        boxes = [dict(box) for box in self.packer_boxes]
+        return self.inst_name, dict(self.container), customers, boxes
+
+    def cache_sizes(self) -> dict:
+        """Node counts of the prefix tries and sizes of the distance providers built for this dataset."""
+        return {
+            "prefix_tries": {
+                "/".join(key): {"nodes": trie.node_count, "max_nodes": trie.max_nodes}
+                for key, trie in self.packing_tries.items()
+            },
+            "distance_providers": {
+                f"{mode}/{dtype}/{max_mb:g}": {"mode": provider.mode, "mb": provider.nbytes / (1024 * 1024)}
+                for (mode, dtype, max_mb), provider in self.distance_providers.items()
+            },
+        }
+
+    def __repr__(self):
+        return f"CompiledDataset({self.inst_name}, customers={self.num_customers}, boxes={len(self.box_ids)})"
+
+
+def compile_dataset(source, use_sidecar: bool = USE_DATASET_SIDECAR) -> CompiledDataset:
+    """
+    Return the compiled form of a merged dataset, building it on first use.
+    Accepts a path or an already compiled dataset. With use_sidecar the arrays
+    come from (and are saved to) the binary sidecar next to the JSON.
+    """
+    if isinstance(source, CompiledDataset):
+        return source
+    key = str(source)
+    dataset = _PINNED_DATASETS.get(key) or _COMPILED_CACHE.get(key)
+    if dataset is None:
+        path = Path(source)
+        if not path.exists():
+            raise FileNotFoundError(f"Merged JSON not found: {path.resolve()}")
+        resolved = str(path.resolve())
+        dataset = _PINNED_DATASETS.get(resolved) or _COMPILED_CACHE.get(resolved)
+        if dataset is None:
+            dataset = CompiledDataset(load_compiled_arrays(path, use_sidecar=use_sidecar), resolved)
+            _COMPILED_CACHE[resolved] = dataset
+        _COMPILED_CACHE[key] = dataset
+    return dataset
+
+
+def pin_dataset(dataset: CompiledDataset, keys) -> None:
+    """Make compile_dataset return dataset for each of keys, outside the bounded cache."""
+    for key in keys:
+        _PINNED_DATASETS[str(key)] = dataset
+
+
+def compiled_cache_stats() -> dict:
+    stats = _COMPILED_CACHE.stats()
+    stats["pinned"] = len(_PINNED_DATASETS)
+    return stats
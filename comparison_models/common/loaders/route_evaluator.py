@@ -1,10 +1,21 @@
 ﻿#C:\Kanu\Kanu(D)\Dissertation\Dissertation-3L-SDVRP\comparison_models\common\loaders\route_evaluator.py
 
-import json
 from pathlib import Path
 from typing import Tuple, Dict, List, Any
 
-_DATASET_CACHE: dict[str, dict[str, Any]] = {}
+from comparison_models.common.bounded_cache import BoundedCache
+from comparison_models.common.loaders.compiled_dataset import (
+    CompiledDataset,
+    _normalize_container_for_packer,
+    compile_dataset,
+)
+
+DATASET_CACHE_MAX_ENTRIES = 16
+_DATASET_CACHE = BoundedCache("dataset", max_entries=DATASET_CACHE_MAX_ENTRIES)
+
+
+def dataset_cache_stats() -> dict:
+    return _DATASET_CACHE.stats()
 
 
 def split_depot_and_customers(customers: list[dict]) -> tuple[dict | None, list[dict]]:
@@ -15,25 +26,23 @@ def split_depot_and_customers(customers: list[dict]) -> tuple[dict | None, list[
     return depot_customer, real_customers
 
 def load_merged(merged_json_path: str) -> Tuple[str, dict, list, list]:
+    """
+    (inst_name, container, customers, boxes) of a merged dataset. The data comes
+    from the compiled dataset, i.e. from its binary sidecar when that is current,
+    so customers/boxes are rebuilt with the fields the evaluators use
+    (customer_id, x, y, demand, assigned_boxes / box_id, length, width, height)
+    and the container holds the packer's L, W, H.
+    """
     p = Path(merged_json_path)
     if not p.exists():
         raise FileNotFoundError(f"Merged JSON not found: {p.resolve()}")
 
     cache_key = str(p.resolve())
-    if cache_key in _DATASET_CACHE:
-        cached = _DATASET_CACHE[cache_key]
+    cached = _DATASET_CACHE.get(cache_key)
+    if cached is not None:
         return cached["loaded"]
 
-    with p.open("r", encoding="utf-8-sig") as f:
-        try:
-            d = json.load(f)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Failed to parse merged JSON {p.resolve()}: {e}") from e
-
-    inst_name = d.get("inst_name") or d.get("name") or p.stem
-    container = d.get("container", {})
-    customers = d.get("customers", [])
-    boxes = d.get("boxes", [])
+    inst_name, container, customers, boxes = compile_dataset(p).as_merged()
     depot_customer, real_customers = split_depot_and_customers(customers)
     customer_map = {customer.get("customer_id"): customer for customer in real_customers}
     box_map = {box.get("box_id"): box for box in boxes}
@@ -48,64 +57,246 @@ def load_merged(merged_json_path: str) -> Tuple[str, dict, list, list]:
     return loaded
 
 try:
-    from comparison_models.common.utils.packer import place_boxes_in_container as _place_boxes_in_container
+    from comparison_models.common.utils.packer import (
+        new_packing_state as _new_packing_state,
+        pack_boxes_into_state as _pack_boxes_into_state,
+        place_boxes_in_container as _place_boxes_in_container,
+        box_fits_container as _box_fits_container,
+        box_volume as _box_volume,
+        exceeds_free_volume as _exceeds_free_volume,
+        packing_mode_flags as _packing_mode_flags,
+        shelf_pack_bound as _shelf_pack_bound,
+    )
     _HAS_PACKER = True
 except Exception:
     _HAS_PACKER = False
 
-def _normalize_container_for_packer(container: dict) -> dict:
+PREFIX_TRIE_MAX_NODES = 50000
+
+
+class PackingPrefixTrie:
     """
-    Return a dict with keys 'L','W','H' (numbers) for the packer.
-    Tries several likely key names in order.
+    Trie over route customer sequences. Each node holds the packer state reached
+    after packing the boxes of the customers on its path, so evaluating a route
+    resumes from its longest cached prefix instead of packing from scratch.
+    When the node budget is exhausted the trie is cleared and rebuilt.
+    In "feasibility" mode a failed prefix ends the walk: every extension fails too.
+    Packing from scratch checks the whole route's box volume against the empty
+    container before the first box, so a route whose volume does not fit fails
+    with nothing packed, whatever prefix is cached.
     """
-    # helper to pick numeric value from several keys
-    def pick(keys, default=None):
-        for k in keys:
-            if k in container and container[k] is not None:
-                # if container[k] is a dict/str etc, try to coerce to float if possible
-                v = container[k]
-                try:
-                    return float(v)
-                except Exception:
-                    # leave as-is for now
-                    return v
-        return default
-
-    L = pick(["L","length","l","Length","len","width","Width"])
-    W = pick(["W","width","w","Width","width","depth","Depth","height"])
-    H = pick(["H","height","h","Height","depth","Depth"])
-    # If any value still missing, set a conservative positive default 1.0
-    try:
-        L = float(L) if L is not None else 1.0
-    except Exception:
-        L = 1.0
-    try:
-        W = float(W) if W is not None else 1.0
-    except Exception:
-        W = 1.0
-    try:
-        H = float(H) if H is not None else 1.0
-    except Exception:
-        H = 1.0
 
-    return {"L": L, "W": W, "H": H}
+    def __init__(
+        self,
+        container: dict,
+        max_nodes: int = PREFIX_TRIE_MAX_NODES,
+        split_strategy: str = "guillotine",
+        backend: str = "python",
+        mode: str = "full",
+    ):
+        self.container = container
+        self.split_strategy = split_strategy
+        self.backend = backend
+        self.mode = mode
+        self.record_placements, self.stop_on_failure = _packing_mode_flags(mode)
+        self.max_nodes = max(1, int(max_nodes))
+        self.children: dict = {}
+        self.node_count = 0
+        self.lookups = 0
+        self.customers_reused = 0
+        self.customers_packed = 0
+
+    def clear(self) -> None:
+        self.children = {}
+        self.node_count = 0
+
+    def new_state(self) -> Any:
+        return _new_packing_state(self.container, split_strategy=self.split_strategy, backend=self.backend)
+
+    def pack_route(self, customer_ids: list, boxes_for_customer) -> Any:
+        self.lookups += 1
+        if self.stop_on_failure:
+            route_volume = sum(_box_volume(box) for cid in customer_ids for box in boxes_for_customer(cid))
+            empty = self.new_state()
+            if _exceeds_free_volume(empty, route_volume):
+                empty.failed = True
+                return empty
+        children = self.children
+        state = None
+        depth = 0
+        for cid in customer_ids:
+            node = children.get(cid)
+            if node is None:
+                break
+            state, children = node
+            depth += 1
+        self.customers_reused += depth
+
+        state = state.copy() if state is not None else self.new_state()
+        for cid in customer_ids[depth:]:
+            if state.failed:
+                break
+            _pack_boxes_into_state(
+                state,
+                boxes_for_customer(cid),
+                record_placements=self.record_placements,
+                stop_on_failure=self.stop_on_failure,
+            )
+            self.customers_packed += 1
+            if self.node_count >= self.max_nodes:
+                continue
+            node_children: dict = {}
+            children[cid] = (state.copy(), node_children)
+            children = node_children
+            self.node_count += 1
+        return state
+
+def _get_packing_trie(
+    dataset: CompiledDataset,
+    split_strategy: str = "guillotine",
+    backend: str = "python",
+    mode: str = "full",
+    max_nodes: int = PREFIX_TRIE_MAX_NODES,
+) -> PackingPrefixTrie:
+    tries = dataset.packing_tries
+    trie = tries.get((split_strategy, backend, mode))
+    if trie is None:
+        trie = PackingPrefixTrie(
+            dataset.container,
+            max_nodes=max_nodes,
+            split_strategy=split_strategy,
+            backend=backend,
+            mode=mode,
+        )
+        tries[(split_strategy, backend, mode)] = trie
+        return trie
+    trie.max_nodes = max(1, int(max_nodes))
+    if trie.node_count >= trie.max_nodes:
+        trie.clear()
+    return trie
+
+
+# Keys of a precheck-rejected route that stand in for the packer's counts.
+PRECHECK_ESTIMATE_KEYS = ("boxes_packed_estimate", "fill_rate_estimate")
+
+
+def _precheck_route(container: dict, boxes: list[dict], record_placements: bool = False) -> Dict | None:
+    """
+    Decide the route from cheap bounds when possible, without running the packer.
+    Infeasible: total box volume exceeds the container, or some box fits no
+    orientation of the empty container. Feasible: the shelf layout holds every box.
+    Returns None when the bounds are inconclusive. An infeasible verdict has no
+    packer count, so it carries "boxes_packed_estimate" / "fill_rate_estimate"
+    (fitting boxes in route order while their volume fits) instead of
+    "boxes_packed" / "fill_rate". With record_placements only the feasibility
+    proof is used and its shelf layout is returned as placements.
+    """
+    boxes_total = len(boxes)
+    container_vol = float(container["L"]) * float(container["W"]) * float(container["H"])
+    volumes = [float(b["length"]) * float(b["width"]) * float(b["height"]) for b in boxes]
+    total_vol = sum(volumes)
+    fitting = [_box_fits_container(container, b) for b in boxes]
+
+    reason = None
+    if not all(fitting):
+        reason = "oversize_box"
+    elif total_vol > container_vol:
+        reason = "volume_exceeded"
+
+    if reason is not None and not record_placements:
+        # Estimate: fitting boxes taken in route order while their volume still fits.
+        packed, packed_vol = 0, 0.0
+        for vol, fits in zip(volumes, fitting):
+            if fits and packed_vol + vol <= container_vol:
+                packed += 1
+                packed_vol += vol
+        return {
+            "feasible": False,
+            "boxes_total": boxes_total,
+            "boxes_packed_estimate": packed,
+            "fill_rate_estimate": packed_vol / container_vol if container_vol > 0 else 0.0,
+            "precheck": reason,
+            "packer_skipped": True,
+        }
+
+    placements = [] if record_placements else None
+    if reason is None and _shelf_pack_bound(container, boxes, placements):
+        verdict = {
+            "feasible": True,
+            "boxes_total": boxes_total,
+            "boxes_packed": boxes_total,
+            "fill_rate": total_vol / container_vol if container_vol > 0 else 0.0,
+            "precheck": "shelf_bound",
+            "packer_skipped": True,
+        }
+        if record_placements:
+            verdict["placements"] = placements
+        return verdict
+    return None
 
-def evaluate_route(merged_json_path: str, route: List[int], use_packing: bool = True) -> Dict:
+
+def new_packing_stats() -> dict:
+    """Counters for route evaluations and packer calls avoided by the precheck or the shared table."""
+    return {
+        "route_evaluations": 0,
+        "packer_calls": 0,
+        "packer_calls_skipped": 0,
+        "precheck_infeasible": 0,
+        "precheck_feasible": 0,
+        "shared_cache_hits": 0,
+    }
+
+
+def record_packing_stats(stats: dict, route_eval: Dict) -> None:
+    stats["route_evaluations"] += 1
+    if route_eval.get("packer_skipped"):
+        stats["packer_calls_skipped"] += 1
+        if route_eval.get("feasible"):
+            stats["precheck_feasible"] += 1
+        else:
+            stats["precheck_infeasible"] += 1
+    elif route_eval.get("shared_cache"):
+        stats["shared_cache_hits"] += 1
+    else:
+        stats["packer_calls"] += 1
+
+
+def evaluate_route(
+    merged_json_path: str | CompiledDataset,
+    route: List[int],
+    use_packing: bool = True,
+    use_prefix_cache: bool = True,
+    split_strategy: str = "guillotine",
+    backend: str = "python",
+    precheck: bool = False,
+    packing_mode: str = "count",
+    prefix_trie_max_nodes: int = PREFIX_TRIE_MAX_NODES,
+) -> Dict:
     """
     Prepare boxes for the route and call the packer with a normalized container dict.
+    merged_json_path may also be a CompiledDataset (see compile_dataset).
+    With use_prefix_cache the packer resumes from the longest route prefix already
+    packed for this dataset (results are identical to packing from scratch); the
+    prefix trie is cleared once it holds prefix_trie_max_nodes nodes.
+    split_strategy selects the packer free-space splitting (only "guillotine") and
+    backend the free-space implementation ("python" or the array-backed "numpy").
+    With precheck, routes decided by cheap volume/shelf bounds skip the packer and
+    carry "precheck" (reason) and "packer_skipped" flags in the result; routes it
+    rejects report estimated counts only (see _precheck_route).
+    packing_mode "count" (default) gives exact counts without placement detail,
+    "full" also returns the box "placements", and "feasibility" stops at the first
+    box that cannot be placed (boxes_packed and fill_rate are then lower bounds,
+    flagged with "early_exit").
+    When a process-pool initializer attached a shared packing table to the dataset
+    (see shared_dataset), counts packed by other workers are reused and the result
+    carries "shared_cache".
     """
     try:
-        inst_name, container, customers, boxes = load_merged(merged_json_path)
+        dataset = compile_dataset(merged_json_path)
     except Exception:
         return {"feasible": False, "boxes_total": 0, "boxes_packed": 0, "fill_rate": 0.0}
 
-    cache_key = str(Path(merged_json_path).resolve())
-    cached = _DATASET_CACHE.get(cache_key, {})
-    depot_customer, real_customers = split_depot_and_customers(customers)
-    depot_customer_id = depot_customer.get("customer_id") if depot_customer else None
-    customer_map = cached.get("customer_map") or {c.get("customer_id"): c for c in real_customers}
-    box_map = cached.get("box_map") or {b.get("box_id"): b for b in boxes}
-    route_customer_ids = [cid for cid in route if cid != depot_customer_id]
+    route_customer_ids = [cid for cid in route if cid != dataset.depot_id]
 
     if not route_customer_ids:
         return {
@@ -116,14 +307,10 @@ def evaluate_route(merged_json_path: str, route: List[int], use_packing: bool =
         }
 
     # Collect boxes for this route by customer assigned_boxes (preserve order)
+    boxes_for_customer = dataset.boxes_for_customer
     boxes_for_route = []
     for cid in route_customer_ids:
-        c = customer_map.get(cid)
-        if c:
-            for bid in c.get("assigned_boxes", []):
-                b = box_map.get(bid)
-                if b:
-                    boxes_for_route.append(b)
+        boxes_for_route.extend(boxes_for_customer(cid))
 
     boxes_total = len(boxes_for_route)
 
@@ -137,18 +324,50 @@ def evaluate_route(merged_json_path: str, route: List[int], use_packing: bool =
     # If packer available, call it using normalized container
     if _HAS_PACKER:
         try:
-            packer_container = _normalize_container_for_packer(container)
-            placements, packed_vol, placed_count = _place_boxes_in_container(packer_container, boxes_for_route)
+            packer_container = dataset.container
+            if precheck:
+                verdict = _precheck_route(packer_container, boxes_for_route, record_placements=packing_mode == "full")
+                if verdict is not None:
+                    return verdict
+            shared = dataset.shared_packing if packing_mode != "full" else None
+            shared_hit = None
+            if shared is not None:
+                shared_key = shared.route_key(route_customer_ids, split_strategy, backend, packing_mode)
+                shared_hit = shared.get(shared_key)
+            if shared_hit is not None:
+                placements = []
+                placed_count, packed_vol = shared_hit
+            elif use_prefix_cache:
+                trie = _get_packing_trie(dataset, split_strategy, backend, packing_mode, prefix_trie_max_nodes)
+                state = trie.pack_route(route_customer_ids, boxes_for_customer)
+                placements, packed_vol, placed_count = state.placements, state.packed_volume, state.placed_count
+            else:
+                placements, packed_vol, placed_count = _place_boxes_in_container(
+                    packer_container,
+                    boxes_for_route,
+                    split_strategy=split_strategy,
+                    backend=backend,
+                    mode=packing_mode,
+                )
+            if shared is not None and shared_hit is None:
+                shared.put(shared_key, placed_count, packed_vol)
             # compute container volume from normalized container
             container_vol = float(packer_container.get("L",1.0)) * float(packer_container.get("W",1.0)) * float(packer_container.get("H",1.0))
             fill_rate = float(packed_vol) / container_vol if container_vol > 0 else 0.0
             feasible = (placed_count == boxes_total) or (boxes_total == 0)
-            return {
+            result = {
                 "feasible": bool(feasible),
                 "boxes_total": int(boxes_total),
                 "boxes_packed": int(placed_count),
                 "fill_rate": float(fill_rate),
             }
+            if packing_mode == "full":
+                result["placements"] = list(placements)
+            elif packing_mode == "feasibility":
+                result["early_exit"] = not feasible
+            if shared_hit is not None:
+                result["shared_cache"] = True
+            return result
         except Exception as e:
             print(f"[route_evaluator] packer invocation failed: {e}")
 
@@ -157,3 +376,24 @@ def evaluate_route(merged_json_path: str, route: List[int], use_packing: bool =
     fill_rate = (packed / boxes_total) if boxes_total > 0 else 0.0
     feasible = True if boxes_total == 0 else (fill_rate >= 0.0)
     return {"feasible": bool(feasible), "boxes_total": boxes_total, "boxes_packed": packed, "fill_rate": fill_rate}
+
+
+def repack_route_details(merged_json_path: str, route_details: list[dict], use_packing: bool = True, **packing_options) -> list[dict]:
+    """
+    Re-pack the routes of a final solution in full detail (packing_mode="full").
+    Returns copies of the route detail dicts with exact feasible / boxes_packed /
+    fill_rate values and the box "placements" of each route. The precheck is off,
+    so every reported count and placement comes from the packer.
+    """
+    options = dict(packing_options, packing_mode="full", precheck=False)
+    refreshed = []
+    for detail in route_details:
+        route_eval = evaluate_route(merged_json_path, detail["route"], use_packing=use_packing, use_prefix_cache=False, **options)
+        updated = dict(detail)
+        for key in ("feasible", "boxes_total", "boxes_packed", "fill_rate"):
+            updated[key] = route_eval.get(key, detail.get(key))
+        updated["placements"] = route_eval.get("placements", [])
+        for key in PRECHECK_ESTIMATE_KEYS:
+            updated.pop(key, None)
+        refreshed.append(updated)
+    return refreshed
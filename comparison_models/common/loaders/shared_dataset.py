@@ -0,0 +1,216 @@
+# comparison_models/common/loaders/shared_dataset.py
+# Shared-memory layer for process-pool runs. The parent publishes the compiled
+# arrays of every dataset plus one packing-result table per dataset; workers
+# attach to them in the pool initializer, so a dataset is loaded once per run
+# and a route packed by one seed's job is reused by every other job on the
+# same dataset.
+
+import hashlib
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from comparison_models.common.loaders.compiled_dataset import (
+    CompiledDataset,
+    compile_dataset,
+    pin_dataset,
+)
+
+SHARED_PACKING_TABLE_SLOTS = 1 << 18
+SHARED_TABLE_MAX_PROBES = 16
+ARRAY_ALIGNMENT = 16
+
+# Segments attached by this process; kept referenced so the views stay valid.
+_ATTACHED_SEGMENTS: list[shared_memory.SharedMemory] = []
+
+
+def _attach_segment(name: str) -> shared_memory.SharedMemory:
+    # Pool workers share the parent's resource tracker, so attaching here does
+    # not hand the segment's lifetime to the worker; the parent unlinks it.
+    shm = shared_memory.SharedMemory(name=name)
+    _ATTACHED_SEGMENTS.append(shm)
+    return shm
+
+
+class SharedPackingTable:
+    """
+    Fixed-size open-addressing table of packing results in one shared segment:
+    a 128-bit route key -> (boxes placed, packed volume). Reads are lock-free;
+    a slot's ready flag is written last, under the lock, and a written slot is
+    never reused, so a reader sees either nothing or a complete entry. When the
+    probe window is full the result is simply not shared.
+    """
+
+    ENTRY_BYTES = 16 + 8 + 4 + 1
+
+    def __init__(self, shm: shared_memory.SharedMemory, slots: int, lock):
+        self.shm = shm
+        self.slots = slots
+        self.lock = lock
+        buf = shm.buf
+        self.keys = np.ndarray((slots, 2), dtype=np.uint64, buffer=buf, offset=0)
+        self.volumes = np.ndarray((slots,), dtype=np.float64, buffer=buf, offset=16 * slots)
+        self.placed = np.ndarray((slots,), dtype=np.int32, buffer=buf, offset=24 * slots)
+        self.ready = np.ndarray((slots,), dtype=np.uint8, buffer=buf, offset=28 * slots)
+        self.hits = 0
+        self.misses = 0
+        self.inserts = 0
+        self.dropped = 0
+
+    @classmethod
+    def create(cls, slots: int, lock) -> "SharedPackingTable":
+        shm = shared_memory.SharedMemory(create=True, size=max(1, slots * cls.ENTRY_BYTES))
+        table = cls(shm, slots, lock)
+        table.ready[:] = 0
+        return table
+
+    @classmethod
+    def attach(cls, name: str, slots: int, lock) -> "SharedPackingTable":
+        return cls(_attach_segment(name), slots, lock)
+
+    @staticmethod
+    def route_key(route_customer_ids, split_strategy, backend, packing_mode) -> tuple[int, int]:
+        payload = repr((split_strategy, backend, packing_mode, tuple(route_customer_ids))).encode()
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+
+    def _probe(self, key):
+        start = key[0] % self.slots
+        for step in range(min(SHARED_TABLE_MAX_PROBES, self.slots)):
+            yield (start + step) % self.slots
+
+    def get(self, key) -> tuple[int, float] | None:
+        keys = self.keys
+        for slot in self._probe(key):
+            if not self.ready[slot]:
+                break
+            if int(keys[slot, 0]) == key[0] and int(keys[slot, 1]) == key[1]:
+                self.hits += 1
+                return int(self.placed[slot]), float(self.volumes[slot])
+        self.misses += 1
+        return None
+
+    def put(self, key, placed_count: int, packed_volume: float) -> None:
+        with self.lock:
+            for slot in self._probe(key):
+                if self.ready[slot]:
+                    if int(self.keys[slot, 0]) == key[0] and int(self.keys[slot, 1]) == key[1]:
+                        return
+                    continue
+                self.keys[slot, 0] = key[0]
+                self.keys[slot, 1] = key[1]
+                self.placed[slot] = placed_count
+                self.volumes[slot] = packed_volume
+                self.ready[slot] = 1
+                self.inserts += 1
+                return
+        self.dropped += 1
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "inserts": self.inserts, "dropped": self.dropped}
+
+
+def _publish_arrays(arrays: dict) -> tuple[shared_memory.SharedMemory, dict]:
+    """Copy the compiled arrays into one segment; returns it with the array layout."""
+    layout = {}
+    offset = 0
+    for key, value in arrays.items():
+        value = np.ascontiguousarray(value)
+        layout[key] = (offset, value.shape, value.dtype.str)
+        offset += -(-value.nbytes // ARRAY_ALIGNMENT) * ARRAY_ALIGNMENT
+    shm = shared_memory.SharedMemory(create=True, size=max(1, offset))
+    for key, value in arrays.items():
+        start, shape, dtype = layout[key]
+        np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=start)[...] = value
+    return shm, layout
+
+
+def _attach_arrays(name: str, layout: dict) -> dict:
+    shm = _attach_segment(name)
+    arrays = {}
+    for key, (start, shape, dtype) in layout.items():
+        view = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=start)
+        view.flags.writeable = False
+        arrays[key] = view
+    return arrays
+
+
+def attach_shared_dataset(spec: dict) -> CompiledDataset:
+    """
+    Build a dataset over the published arrays and pin it for compile_dataset, so
+    the compiled-dataset cache limit never swaps it for a private copy.
+    """
+    dataset = CompiledDataset(_attach_arrays(spec["arrays_name"], spec["layout"]), spec["path"])
+    if spec.get("table_name"):
+        dataset.shared_packing = SharedPackingTable.attach(spec["table_name"], spec["table_slots"], spec["lock"])
+    pin_dataset(dataset, (spec["path"], *spec.get("aliases", ())))
+    return dataset
+
+
+def init_shared_worker(specs: list[dict], lock) -> None:
+    """ProcessPoolExecutor initializer: attach every published dataset."""
+    for spec in specs:
+        attach_shared_dataset(dict(spec, lock=lock))
+
+
+class SharedEvaluationContext:
+    """
+    Owner side of the shared layer, used around a process pool:
+
+        with SharedEvaluationContext(paths, mp_context) as shared:
+            ProcessPoolExecutor(..., initializer=shared.initializer, initargs=shared.initargs)
+
+    Segments are unlinked on exit. With enabled=False (or no shared memory
+    support) the initializer attaches nothing and workers load datasets as usual.
+    """
+
+    def __init__(self, dataset_paths, mp_context, table_slots: int = SHARED_PACKING_TABLE_SLOTS, enabled: bool = True):
+        self.dataset_paths = [str(path) for path in dataset_paths]
+        self.mp_context = mp_context
+        self.table_slots = int(table_slots)
+        self.enabled = enabled
+        self.lock = None
+        self.specs: list[dict] = []
+        self._owned: list[shared_memory.SharedMemory] = []
+
+    def __enter__(self):
+        if not self.enabled:
+            return self
+        self.lock = self.mp_context.Lock()
+        try:
+            for path in dict.fromkeys(self.dataset_paths):
+                dataset = compile_dataset(path)
+                arrays_shm, layout = _publish_arrays(dataset.arrays)
+                self._owned.append(arrays_shm)
+                spec = {"path": dataset.path, "aliases": [path], "arrays_name": arrays_shm.name, "layout": layout}
+                if self.table_slots > 0:
+                    table = SharedPackingTable.create(self.table_slots, self.lock)
+                    self._owned.append(table.shm)
+                    spec.update(table_name=table.shm.name, table_slots=self.table_slots)
+                self.specs.append(spec)
+        except OSError as exc:
+            print(f"[shared_dataset] shared memory unavailable, workers load datasets themselves: {exc}", flush=True)
+            self._release()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._release()
+        return False
+
+    def _release(self):
+        for shm in self._owned:
+            try:
+                shm.close()
+                shm.unlink()
+            except (OSError, BufferError):
+                pass
+        self._owned = []
+        self.specs = []
+
+    @property
+    def initializer(self):
+        return init_shared_worker
+
+    @property
+    def initargs(self) -> tuple:
+        return (self.specs, self.lock)
@@ -0,0 +1,173 @@
+# comparison_models/common/local_search.py
+# Memetic stage of the GA: 2-opt and Or-opt inside each decoded route, driven
+# by k-nearest-neighbour lists and don't-look bits so a pass costs about
+# O(route length * k) instead of O(route length ** 2). Route membership is
+# kept, so only routes whose customer order changes are packed again (the
+# route cache is keyed by the ordered route).
+
+from collections import deque
+
+LOCAL_SEARCH_MODES = ("off", "elites", "children")
+IMPROVEMENT_EPSILON = 1e-9
+
+
+def new_local_search_stats() -> dict:
+    return {
+        "orders_searched": 0,
+        "orders_improved": 0,
+        "routes_improved": 0,
+        "two_opt_moves": 0,
+        "or_opt_moves": 0,
+        "distance_saved": 0.0,
+    }
+
+
+class RouteLocalSearch:
+    """
+    First-improvement 2-opt and Or-opt (segments of 1..max_segment customers,
+    inserted either way round) on single routes, depot at both ends.
+
+    Candidate moves only connect a customer to one of its k nearest customers
+    in the same route, and a move is only tried when that new edge is shorter
+    than the edge it replaces. Every customer starts active; one whose moves
+    all fail sets its don't-look bit and is revisited only after a move
+    touches it again. The search stops when no customer is active.
+    """
+
+    def __init__(self, distances, neighbors: int = 10, max_segment: int = 3):
+        self.distances = distances
+        self.neighbors = distances.nearest_neighbors(max(1, int(neighbors)))
+        self.max_segment = max(1, int(max_segment))
+        self.stats = new_local_search_stats()
+
+    def improve_order(self, routes) -> list:
+        """The giant tour of the improved routes (routes are contiguous in the order)."""
+        self.stats["orders_searched"] += 1
+        improved = False
+        order = []
+        for route in routes:
+            new_route = self.improve_route(route)
+            improved = improved or new_route is not route
+            order.extend(new_route)
+        if improved:
+            self.stats["orders_improved"] += 1
+        return order
+
+    def improve_route(self, route):
+        """A shorter ordering of route, or route itself when none is found."""
+        if len(route) < 3:
+            return route
+        index = self.distances.index
+        path = [0]
+        path.extend(index[cid] for cid in route)
+        path.append(0)
+        pos = {node: position for position, node in enumerate(path) if node}
+
+        saved = 0.0
+        active = deque(path[1:-1])
+        queued = set(active)
+        while active:
+            node = active.popleft()
+            queued.discard(node)
+            gain, touched = self._two_opt(path, pos, node)
+            if touched is None:
+                gain, touched = self._or_opt(path, pos, node)
+            if touched is None:
+                continue
+            saved += gain
+            for other in touched:
+                if other and other not in queued:
+                    active.append(other)
+                    queued.add(other)
+
+        if not saved:
+            return route
+        self.stats["routes_improved"] += 1
+        self.stats["distance_saved"] += saved
+        customer_at = {index[cid]: cid for cid in route}
+        return [customer_at[node] for node in path[1:-1]]
+
+    def _two_opt(self, path, pos, a):
+        between = self.distances.between
+        i = pos[a]
+        for successor in (True, False):
+            a2 = path[i + 1] if successor else path[i - 1]
+            base = between(a, a2)
+            for c in self.neighbors[a]:
+                j = pos.get(c)
+                if j is None:
+                    continue
+                partial = base - between(a, c)
+                if partial <= IMPROVEMENT_EPSILON:
+                    break
+                c2 = path[j + 1] if successor else path[j - 1]
+                if c == a2 or c2 == a:
+                    continue
+                gain = partial + between(c, c2) - between(a2, c2)
+                if gain <= IMPROVEMENT_EPSILON:
+                    continue
+                if successor:
+                    lo, hi = min(i, j) + 1, max(i, j)
+                else:
+                    lo, hi = min(i, j), max(i, j) - 1
+                path[lo:hi + 1] = path[lo:hi + 1][::-1]
+                for position in range(lo, hi + 1):
+                    pos[path[position]] = position
+                self.stats["two_opt_moves"] += 1
+                return gain, (a, a2, c, c2)
+        return 0.0, None
+
+    def _or_opt(self, path, pos, a):
+        between = self.distances.between
+        i = pos[a]
+        last = len(path) - 2
+        for length in range(1, self.max_segment + 1):
+            e = i + length - 1
+            if e > last:
+                break
+            segment = path[i:e + 1]
+            members = set(segment)
+            prev_node = path[i - 1]
+            next_node = path[e + 1]
+            removal = between(prev_node, a) + between(path[e], next_node) - between(prev_node, next_node)
+            if removal <= IMPROVEMENT_EPSILON:
+                continue
+            ends = ((a, a),) if length == 1 else ((a, path[e]), (path[e], a))
+            for end_node, other_end in ends:
+                for c in self.neighbors[end_node]:
+                    j = pos.get(c)
+                    if j is None or c in members:
+                        continue
+                    link = between(end_node, c)
+                    if link >= removal:
+                        break
+                    # Between c's predecessor u and c (end_node next to c), or
+                    # between c and its successor v (end_node right after c).
+                    for after in (False, True):
+                        u, v = (c, path[j + 1]) if after else (path[j - 1], c)
+                        if u in members or v in members:
+                            continue
+                        outer = v if after else u
+                        cost = link + between(other_end, outer) - between(u, v)
+                        gain = removal - cost
+                        if gain <= IMPROVEMENT_EPSILON:
+                            continue
+                        self._move_segment(path, pos, i, e, c, end_node, after)
+                        self.stats["or_opt_moves"] += 1
+                        return gain, (prev_node, next_node, a, other_end, u, v)
+        return 0.0, None
+
+    @staticmethod
+    def _move_segment(path, pos, i, e, c, end_node, after):
+        segment = path[i:e + 1]
+        del path[i:e + 1]
+        k = path.index(c)
+        if after:
+            oriented = segment if segment[0] == end_node else segment[::-1]
+            path[k + 1:k + 1] = oriented
+        else:
+            oriented = segment if segment[-1] == end_node else segment[::-1]
+            path[k:k] = oriented
+        for position, node in enumerate(path):
+            if node:
+                pos[node] = position
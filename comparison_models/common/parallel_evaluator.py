@@ -0,0 +1,138 @@
+# comparison_models/common/parallel_evaluator.py
+# Opt-in parallel population evaluation inside one GARunner.run. A persistent
+# spawn pool keeps one runner per worker with the dataset preloaded; chunks of
+# permutations are evaluated there and the workers' new cache entries and
+# packing counters are merged back into the parent runner.
+
+import copy
+import importlib
+import itertools
+import multiprocessing
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+from comparison_models.common.loaders.compiled_dataset import compile_dataset
+
+# Runner caches whose new entries are shipped back to the parent after a chunk.
+MERGED_CACHES = ("route_eval_cache", "permutation_eval_cache")
+CHUNKS_PER_WORKER = 4
+
+_WORKER_STATE: dict = {}
+
+
+def _init_worker(runner_module: str, config: dict, dataset_path: str, method: str) -> None:
+    runner = importlib.import_module(runner_module).GARunner(config)
+    dataset = compile_dataset(dataset_path)
+    if hasattr(runner, "num_customers") and not runner.num_customers:
+        runner.num_customers = dataset.num_customers
+    for name in MERGED_CACHES:
+        cache = getattr(runner, name, None)
+        if hasattr(cache, "track_inserts"):
+            cache.track_inserts()
+    _WORKER_STATE.update(
+        runner=runner,
+        dataset=dataset,
+        evaluate=getattr(runner, method),
+        sent={name: 0 for name in MERGED_CACHES},
+    )
+
+
+def _evaluate_chunk(permutations: list, options: dict) -> tuple[list, dict, dict]:
+    runner = _WORKER_STATE["runner"]
+    dataset = _WORKER_STATE["dataset"]
+    evaluate = _WORKER_STATE["evaluate"]
+    results = [evaluate(dataset, perm, **options) for perm in permutations]
+
+    cache_deltas = {}
+    for name, sent in _WORKER_STATE["sent"].items():
+        cache = getattr(runner, name, None)
+        if cache is None:
+            continue
+        if hasattr(cache, "drain_inserted"):
+            # Bounded caches evict, so positions are no measure of what is new.
+            cache_deltas[name] = cache.drain_inserted()
+            continue
+        cache_deltas[name] = list(itertools.islice(cache.items(), sent, None))
+        _WORKER_STATE["sent"][name] = len(cache)
+
+    packing_stats = getattr(runner, "packing_stats", None)
+    stats_delta = {}
+    if packing_stats is not None:
+        stats_delta = dict(packing_stats)
+        for key in packing_stats:
+            packing_stats[key] = 0
+    return results, cache_deltas, stats_delta
+
+
+class ParallelEvaluator:
+    """
+    Evaluates permutations on `workers` processes, each running the runner's own
+    evaluate_permutation (or the runner method named by `method`), so scores and infos equal the serial ones; evaluation
+    consumes no randomness, so the GA's random stream is untouched too. The
+    parent's caches and packing_stats receive what the workers computed.
+
+    local_lookup(perm, **options) may return a cached (score, info) of the parent
+    runner; those permutations, and duplicates within a batch, are not dispatched.
+    """
+
+    def __init__(self, runner, runner_module: str, dataset_path: str, workers: int, chunk_size: int = 0, local_lookup=None, method: str = "evaluate_permutation"):
+        self.runner = runner
+        self.workers = max(1, int(workers))
+        self.chunk_size = int(chunk_size)
+        self.local_lookup = local_lookup
+        worker_config = dict(runner.config, parallel_eval_workers=0, verbose=False)
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(runner_module, worker_config, str(dataset_path), method),
+        )
+        # Shut the pool down if a run fails before close() is reached.
+        self._finalizer = weakref.finalize(self, self.executor.shutdown, wait=False, cancel_futures=True)
+
+    def _chunks(self, items: list) -> list[list]:
+        size = self.chunk_size or max(1, -(-len(items) // (self.workers * CHUNKS_PER_WORKER)))
+        return [items[start:start + size] for start in range(0, len(items), size)]
+
+    def evaluate(self, permutations: list, **options) -> list[tuple[float, dict]]:
+        results: list = [None] * len(permutations)
+        pending: dict[tuple, list[int]] = {}
+        for index, perm in enumerate(permutations):
+            cached = self.local_lookup(perm, **options) if self.local_lookup is not None else None
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.setdefault(tuple(perm), []).append(index)
+
+        keys = list(pending)
+        futures = [
+            self.executor.submit(_evaluate_chunk, [list(key) for key in chunk], options)
+            for chunk in self._chunks(keys)
+        ]
+        offset = 0
+        for future in futures:
+            chunk_results, cache_deltas, stats_delta = future.result()
+            for key, result in zip(keys[offset:offset + len(chunk_results)], chunk_results):
+                indices = pending[key]
+                results[indices[0]] = result
+                for index in indices[1:]:
+                    results[index] = copy.deepcopy(result)
+            offset += len(chunk_results)
+            self._merge(cache_deltas, stats_delta)
+        return results
+
+    def _merge(self, cache_deltas: dict, stats_delta: dict) -> None:
+        for name, entries in cache_deltas.items():
+            cache = getattr(self.runner, name, None)
+            if cache is None:
+                continue
+            for key, value in entries:
+                cache.setdefault(key, value)
+        packing_stats = getattr(self.runner, "packing_stats", None)
+        if packing_stats is not None:
+            for key, value in stats_delta.items():
+                packing_stats[key] = packing_stats.get(key, 0) + value
+
+    def close(self) -> None:
+        self._finalizer.detach()
+        self.executor.shutdown(wait=True, cancel_futures=True)
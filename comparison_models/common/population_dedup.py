@@ -0,0 +1,147 @@
+# comparison_models/common/population_dedup.py
+# Duplicate individuals in the GA population. Children often equal a parent or
+# each other (no crossover and no mutation), and the elites come back every
+# generation; with deduplication each distinct permutation is evaluated once
+# and its result is reused for the copies, within a generation and in the one
+# after it. Evaluation is deterministic per permutation, so results do not
+# change; only the evaluation count does.
+
+import numpy as np
+
+HASH_SEED = 0x5EED
+
+
+def _mix64(x):
+    """splitmix64 finaliser on a uint64 array (wraps modulo 2**64)."""
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def new_dedup_stats() -> dict:
+    return {
+        "individuals": 0,
+        "evaluations": 0,
+        "reused_results": 0,
+        "reused_from_previous_generation": 0,
+        "immigrants": 0,
+        "unique_evaluation_rate": [],
+    }
+
+
+class PermutationHasher:
+    """
+    64-bit Zobrist hash of a customer permutation: the XOR over positions i of
+    key(i, customer), where key mixes a random 64-bit word of the customer with
+    one of the position. Keys are derived from two length-n tables instead of an
+    n x n Zobrist table.
+    """
+
+    def __init__(self, customer_ids, seed: int = HASH_SEED):
+        rng = np.random.default_rng(seed)
+        count = len(customer_ids)
+        self.index = {cid: position for position, cid in enumerate(customer_ids)}
+        self.customer_keys = rng.integers(0, np.iinfo(np.uint64).max, size=count, dtype=np.uint64, endpoint=True)
+        self.position_keys = rng.integers(0, np.iinfo(np.uint64).max, size=count, dtype=np.uint64, endpoint=True)
+
+    def __call__(self, perm) -> int:
+        index = self.index
+        rows = np.fromiter((index[cid] for cid in perm), dtype=np.intp, count=len(perm))
+        keys = _mix64(self.customer_keys[rows] ^ self.position_keys[:len(rows)])
+        return int(np.bitwise_xor.reduce(keys)) if len(rows) else 0
+
+
+class PopulationDedup:
+    """
+    Evaluates each distinct individual of a population once.
+
+    evaluate(population, evaluate_indices, variant) hashes every individual,
+    calls evaluate_indices(indices) for the first occurrence of each
+    permutation not yet seen in this or the previous generation, and returns
+    one result per individual. variant separates evaluations that differ for
+    the same permutation (e.g. fast vs adaptive decoding). A hash match only
+    counts once the permutations compare equal, so collisions cost an
+    evaluation, never a wrong result. Results are shared between copies, not
+    copied; the runners treat them as read-only.
+
+    begin_generation() / end_generation() bracket each generation; the latter
+    records the generation's unique-evaluation rate (evaluations / individuals).
+    """
+
+    def __init__(self, customer_ids):
+        self.hasher = PermutationHasher(customer_ids)
+        self.stats = new_dedup_stats()
+        self.current = {}
+        self.previous = {}
+        self.generation_individuals = 0
+        self.generation_evaluations = 0
+
+    def begin_generation(self):
+        self.previous = self.current
+        self.current = {}
+        self.generation_individuals = 0
+        self.generation_evaluations = 0
+
+    def end_generation(self):
+        rate = self.generation_evaluations / self.generation_individuals if self.generation_individuals else 1.0
+        self.stats["unique_evaluation_rate"].append(rate)
+
+    def lookup(self, key, individual):
+        """(result, from previous generation) of an already evaluated individual, or (None, False)."""
+        for memo, from_previous in ((self.current, False), (self.previous, True)):
+            entry = memo.get(key)
+            if entry is not None and entry[0] == individual:
+                return entry[1], from_previous
+        return None, False
+
+    def evaluate(self, population, evaluate_indices, variant=None):
+        results = [None] * len(population)
+        keys = [(variant, self.hasher(individual)) for individual in population]
+        indices = []
+        copies = []
+        for position, (key, individual) in enumerate(zip(keys, population)):
+            result, from_previous = self.lookup(key, individual)
+            if result is not None:
+                results[position] = result
+                self.stats["reused_results"] += 1
+                self.stats["reused_from_previous_generation"] += from_previous
+                continue
+            entry = self.current.get(key)
+            if entry is None:
+                # Placeholder until evaluated; later copies of it wait for its result.
+                self.current[key] = (individual, None, position)
+                indices.append(position)
+            elif entry[1] is None and entry[0] == individual:
+                copies.append((position, entry[2]))
+                self.stats["reused_results"] += 1
+            else:
+                # Hash collision with a different permutation: evaluate it anyway.
+                indices.append(position)
+
+        for position, result in zip(indices, evaluate_indices(indices)):
+            results[position] = result
+            key = keys[position]
+            if self.current[key][0] is population[position]:
+                self.current[key] = (population[position], result)
+        for position, first in copies:
+            results[position] = results[first]
+
+        self.stats["individuals"] += len(population)
+        self.stats["evaluations"] += len(indices)
+        self.generation_individuals += len(population)
+        self.generation_evaluations += len(indices)
+        return results
+
+    def duplicate_positions(self, population, start=0):
+        """Positions >= start whose individual repeats an earlier one."""
+        seen = {}
+        positions = []
+        for position, individual in enumerate(population):
+            earlier = seen.setdefault(self.hasher(individual), [])
+            if position >= start and any(population[other] == individual for other in earlier):
+                positions.append(position)
+            else:
+                earlier.append(position)
+        return positions
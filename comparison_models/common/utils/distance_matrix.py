@@ -0,0 +1,204 @@
+# comparison_models/common/utils/distance_matrix.py
+# Euclidean distance provider built once per compiled dataset. Index 0 is the
+# depot, customers follow in CompiledDataset row order (index = row + 1).
+
+from math import sqrt
+
+import numpy as np
+
+DISTANCE_MODES = ("auto", "full", "condensed", "on_the_fly")
+DISTANCE_DTYPES = ("float64", "float32")
+DEFAULT_MAX_MATRIX_MB = 256
+BUILD_CHUNK_ROWS = 256
+PYTHON_ROW_ENTRY_BYTES = 40
+
+
+class DistanceProvider:
+    """
+    Storage modes:
+      full        (n+1) x (n+1) matrix
+      condensed   upper triangle incl. the diagonal, (n+1)(n+2)/2 entries
+      on_the_fly  nothing stored; distances come from the coordinates per call
+    "auto" takes the first mode that fits in max_bytes. A full matrix that also
+    fits as nested Python lists (about 40 bytes per entry in total) is mirrored
+    into `rows`: for typical route lengths a Python walk over row lists beats
+    a NumPy gather, whose call overhead dominates.
+
+    Entries are sqrt((xa - xb) ** 2 + (ya - yb) ** 2), the value GARunner.euclid
+    returns, and route sums are taken edge by edge in route order, so float64
+    distances match the dict-based route_distance exactly. float32 storage
+    halves memory at the cost of rounding.
+    """
+
+    def __init__(self, dataset, mode="auto", dtype="float64", max_bytes=DEFAULT_MAX_MATRIX_MB * 1024 * 1024):
+        if mode not in DISTANCE_MODES:
+            raise ValueError(f"Unknown distance matrix mode '{mode}'. Valid values: {', '.join(DISTANCE_MODES)}")
+        if dtype not in DISTANCE_DTYPES:
+            raise ValueError(f"Unknown distance matrix dtype '{dtype}'. Valid values: {', '.join(DISTANCE_DTYPES)}")
+
+        self.index = {cid: row + 1 for cid, row in dataset.customer_index.items()}
+        depot_xy = np.array([dataset.depot_xy], dtype=np.float64)
+        self.coords = np.vstack([depot_xy, dataset.xy])
+        self.points = [tuple(dataset.depot_xy)] + [dataset.points[cid] for cid in dataset.customer_ids]
+        self.size = len(self.coords)
+        self.dtype = np.dtype(dtype)
+
+        if mode == "auto":
+            itemsize = self.dtype.itemsize
+            if self.size * self.size * itemsize <= max_bytes:
+                mode = "full"
+            elif self.size * (self.size + 1) // 2 * itemsize <= max_bytes:
+                mode = "condensed"
+            else:
+                mode = "on_the_fly"
+        self.mode = mode
+
+        self.matrix = None
+        self.condensed = None
+        self.rows = None
+        self.neighbor_lists: dict[int, list[list[int]]] = {}
+        if mode == "full":
+            self.matrix = np.empty((self.size, self.size), dtype=self.dtype)
+            for start in range(0, self.size, BUILD_CHUNK_ROWS):
+                self.matrix[start:start + BUILD_CHUNK_ROWS] = self._block(np.arange(start, min(start + BUILD_CHUNK_ROWS, self.size)))
+            if self.size * self.size * PYTHON_ROW_ENTRY_BYTES <= max_bytes:
+                self.rows = self.matrix.tolist()
+        elif mode == "condensed":
+            self.condensed = np.empty(self.size * (self.size + 1) // 2, dtype=self.dtype)
+            for i in range(self.size):
+                start = self._condensed_offset(i)
+                self.condensed[start:start + self.size - i] = self._edges(np.full(self.size - i, i), np.arange(i, self.size))
+
+    @property
+    def nbytes(self) -> int:
+        if self.matrix is not None:
+            rows_bytes = self.size * self.size * (PYTHON_ROW_ENTRY_BYTES - self.dtype.itemsize) if self.rows is not None else 0
+            return int(self.matrix.nbytes) + rows_bytes
+        if self.condensed is not None:
+            return int(self.condensed.nbytes)
+        return 0
+
+    def _block(self, rows):
+        diff = self.coords[rows, None, :] - self.coords[None, :, :]
+        return np.sqrt(diff[..., 0] ** 2 + diff[..., 1] ** 2).astype(self.dtype, copy=False)
+
+    def _condensed_offset(self, i):
+        return i * (2 * self.size - i + 1) // 2
+
+    def _edges(self, a, b):
+        diff = self.coords[a] - self.coords[b]
+        return np.sqrt(diff[:, 0] ** 2 + diff[:, 1] ** 2).astype(self.dtype, copy=False)
+
+    def edge_lengths(self, a, b) -> np.ndarray:
+        """Distances between index arrays a and b, element-wise."""
+        a = np.asarray(a, dtype=np.intp)
+        b = np.asarray(b, dtype=np.intp)
+        if self.matrix is not None:
+            return self.matrix[a, b]
+        if self.condensed is not None:
+            lo = np.minimum(a, b)
+            hi = np.maximum(a, b)
+            return self.condensed[lo * (2 * self.size - lo + 1) // 2 + (hi - lo)]
+        return self._edges(a, b)
+
+    def between(self, i, j) -> float:
+        """Distance between two indices (0 = depot)."""
+        if self.rows is not None:
+            return self.rows[i][j]
+        if self.matrix is not None:
+            return float(self.matrix[i, j])
+        if self.condensed is not None:
+            if i > j:
+                i, j = j, i
+            return float(self.condensed[self._condensed_offset(i) + (j - i)])
+        a = self.points[i]
+        b = self.points[j]
+        value = sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2)
+        return value if self.dtype == np.float64 else float(self.dtype.type(value))
+
+    def nearest_neighbors(self, k: int) -> list[list[int]]:
+        """
+        The k nearest customer indices of every index (0 = depot, whose list is
+        included too), nearest first and ties by index. Built once per k from
+        the coordinates, BUILD_CHUNK_ROWS rows at a time.
+        """
+        neighbors = self.neighbor_lists.get(k)
+        if neighbors is None:
+            count = max(0, min(int(k), self.size - 2))
+            neighbors = []
+            for start in range(0, self.size, BUILD_CHUNK_ROWS):
+                rows = np.arange(start, min(start + BUILD_CHUNK_ROWS, self.size))
+                block = self._block(rows).astype(np.float64)
+                block[:, 0] = np.inf
+                block[np.arange(len(rows)), rows] = np.inf
+                nearest = np.argsort(block, axis=1, kind="stable")[:, :count]
+                neighbors.extend(nearest.tolist())
+            self.neighbor_lists[k] = neighbors
+        return neighbors
+
+    def distance(self, cid_a, cid_b) -> float:
+        return self.between(self.index[cid_a], self.index[cid_b])
+
+    def depot_distance(self, cid) -> float:
+        return self.between(0, self.index[cid])
+
+    def route_indices(self, route) -> list[int]:
+        index = self.index
+        return [index[cid] for cid in route]
+
+    def partition_distances(self, routes) -> list[float]:
+        """
+        Closed depot-to-depot distance of every route, gathered in one vectorized
+        lookup and summed edge by edge in route order.
+        """
+        if self.rows is not None:
+            return [self.route_distance(route) for route in routes]
+        index = self.index
+        starts = []
+        ends = []
+        bounds = []
+        for route in routes:
+            bounds.append(len(starts))
+            if not route:
+                continue
+            path = [0]
+            path.extend(index[cid] for cid in route)
+            path.append(0)
+            starts.extend(path[:-1])
+            ends.extend(path[1:])
+        bounds.append(len(starts))
+        edges = self.edge_lengths(starts, ends).tolist() if starts else []
+
+        distances = []
+        for k in range(len(routes)):
+            dist = 0.0
+            for edge in edges[bounds[k]:bounds[k + 1]]:
+                dist += edge
+            distances.append(dist)
+        return distances
+
+    def route_distance(self, route) -> float:
+        if not route:
+            return 0.0
+        rows = self.rows
+        if rows is None:
+            return self.partition_distances([route])[0]
+        index = self.index
+        prev = 0
+        dist = 0.0
+        for cid in route:
+            current = index[cid]
+            dist += rows[prev][current]
+            prev = current
+        return dist + rows[prev][0]
+
+
+def get_distance_provider(dataset, mode="auto", dtype="float64", max_mb=DEFAULT_MAX_MATRIX_MB) -> DistanceProvider:
+    """Distance provider for a CompiledDataset, built once per (mode, dtype, budget)."""
+    providers = dataset.distance_providers
+    key = (mode, dtype, max_mb)
+    provider = providers.get(key)
+    if provider is None:
+        provider = DistanceProvider(dataset, mode=mode, dtype=dtype, max_bytes=int(max_mb * 1024 * 1024))
+        providers[key] = provider
+    return provider
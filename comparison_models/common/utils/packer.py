@@ -1,9 +1,17 @@
 ﻿# Rotation-enabled free-space placer (tries 6 orthogonal orientations)
-# Simple first-fit with basic free-space splitting. No merging.
+# Simple first-fit over an ordered free-space list. Free spaces are split
+# guillotine-style (right/front/top children, the original heuristic).
 
 import math
 from copy import deepcopy
 
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except Exception:
+    np = None
+    _HAS_NUMPY = False
+
 # All 6 axis-aligned orientations (l,w,h permutations)
 ORIENTATIONS = [
     ("l","w","h"),
@@ -13,6 +21,16 @@ ORIENTATIONS = [
     ("h","l","w"),
     ("h","w","l"),
 ]
+# ORIENTATIONS as column indexes into (length, width, height)
+ORIENTATION_INDEX = [["lwh".index(axis) for axis in ox] for ox in ORIENTATIONS]
+
+FIT_EPS = 1e-9
+MIN_SPACE_DIM = 1e-6
+SPLIT_STRATEGIES = ("guillotine",)
+PACKER_BACKENDS = ("python", "numpy")
+# full: placement dicts for every box; count: exact counts/volume only;
+# feasibility: counts only, stop at the first box that cannot be placed
+PACKING_MODES = ("full", "count", "feasibility")
 
 class FreeSpace:
     def __init__(self, x, y, z, l, w, h):
@@ -20,7 +38,7 @@ class FreeSpace:
         self.l = l; self.w = w; self.h = h
 
     def fits_dims(self, l, w, h):
-        return (l <= self.l + 1e-9) and (w <= self.w + 1e-9) and (h <= self.h + 1e-9)
+        return (l <= self.l + FIT_EPS) and (w <= self.w + FIT_EPS) and (h <= self.h + FIT_EPS)
 
     def __repr__(self):
         return f"FS(({self.x},{self.y},{self.z}) {self.l}x{self.w}x{self.h})"
@@ -50,62 +68,403 @@ def try_place_box_in_fs(box, fs):
     candidates.sort(key=lambda x: x[0])
     return candidates[0][1]
 
-def place_boxes_in_container(container, boxes, max_boxes=None):
+def _is_usable(fs):
+    return fs.l > MIN_SPACE_DIM and fs.w > MIN_SPACE_DIM and fs.h > MIN_SPACE_DIM
+
+def _sorted_dims(l, w, h):
+    if l > w:
+        l, w = w, l
+    if w > h:
+        w, h = h, w
+    if l > w:
+        l, w = w, l
+    return l, w, h
+
+def _space_key(fs):
+    """(smallest, middle, largest dim, padded volume) of a free space."""
+    d0, d1, d2 = _sorted_dims(fs.l, fs.w, fs.h)
+    return (d0, d1, d2, (d0 + FIT_EPS) * (d1 + FIT_EPS) * (d2 + FIT_EPS))
+
+def box_fit_key(box):
+    """(smallest, middle, largest dim, volume) of a box dict."""
+    d0, d1, d2 = _sorted_dims(box['length'], box['width'], box['height'])
+    return (d0, d1, d2, d0 * d1 * d2)
+
+def box_fits_container(container, box):
+    """True if the box fits the empty container in at least one orientation."""
+    b0, b1, b2 = _sorted_dims(box['length'], box['width'], box['height'])
+    c0, c1, c2 = _sorted_dims(container['L'], container['W'], container['H'])
+    return b0 <= c0 + FIT_EPS and b1 <= c1 + FIT_EPS and b2 <= c2 + FIT_EPS
+
+def shelf_pack_bound(container, boxes, placements=None):
     """
-    container: dict with L,W,H
-    boxes: list of dicts {'box_id','length','width','height'}
-    returns: placements list [{'box_id','x','y','z','l','w','h'}], packed_volume, placed_count
+    Cheap sufficient condition for feasibility.
+    Boxes lie flat (smallest dim up, largest side along the longer floor axis),
+    sorted by height, in shelves across the floor. Boxes that no longer fit on
+    the floor are stacked first-fit on supported surfaces: the floor left
+    beside and beyond the shelves, and the top faces of placed boxes. A box
+    only goes on a surface that covers its whole footprint, and the rest of
+    the surface is split guillotine-style, so every box rests on the floor or
+    on a single box below it, as in a load the packer can build.
+    Returns True only if this layout holds every box, i.e. a valid loading exists.
+    A False result proves nothing; the real packer has to decide.
+    If a placements list is given, the layout is appended to it on success.
+    """
+    long_is_l = container['L'] >= container['W']
+    floor_long = max(container['L'], container['W']) + FIT_EPS
+    floor_short = min(container['L'], container['W']) + FIT_EPS
+    height = container['H'] + FIT_EPS
+    items = []
+    for box in boxes:
+        d0, d1, d2 = _sorted_dims(box['length'], box['width'], box['height'])
+        if d2 > floor_long or d1 > floor_short or d0 > height:
+            return False
+        items.append((d0, d2, d1, box))
+    items.sort(key=lambda item: item[0], reverse=True)
+
+    layout = []
+    # surfaces: (x, y, z, a, d) rectangles that fully support anything placed inside them
+    surfaces = []
+    shelf_y = shelf_d = x = 0.0
+    placed = 0
+    for h, a, d, box in items:
+        if x + a > floor_long or shelf_y + d > floor_short:
+            if shelf_y + shelf_d + d > floor_short:
+                break
+            # next shelf; the floor right of the current one stays usable
+            surfaces.append((x, shelf_y, 0.0, floor_long - x, shelf_d))
+            shelf_y += shelf_d
+            x = shelf_d = 0.0
+        layout.append((box, x, shelf_y, 0.0, a, d, h))
+        x += a
+        shelf_d = max(shelf_d, d)
+        placed += 1
+    if placed < len(items):
+        surfaces.append((x, shelf_y, 0.0, floor_long - x, shelf_d))
+        surfaces.append((0.0, shelf_y + shelf_d, 0.0, floor_long, floor_short - shelf_y - shelf_d))
+        surfaces.extend((x0, y0, z0 + h0, a0, d0) for _, x0, y0, z0, a0, d0, h0 in layout)
+
+    for h, a, d, box in items[placed:]:
+        for index, (sx, sy, sz, sa, sd) in enumerate(surfaces):
+            if sz + h > height:
+                continue
+            if a <= sa + FIT_EPS and d <= sd + FIT_EPS:
+                pa, pd = a, d
+            elif d <= sa + FIT_EPS and a <= sd + FIT_EPS:
+                pa, pd = d, a
+            else:
+                continue
+            layout.append((box, sx, sy, sz, pa, pd, h))
+            children = (
+                (sx + pa, sy, sz, sa - pa, sd),
+                (sx, sy + pd, sz, pa, sd - pd),
+                (sx, sy, sz + h, pa, pd),
+            )
+            surfaces[index:index + 1] = [child for child in children if child[3] > FIT_EPS and child[4] > FIT_EPS]
+            break
+        else:
+            return False
+
+    if placements is not None:
+        for box, x, y, z, a, d, h in layout:
+            if long_is_l:
+                placements.append({'box_id': box['box_id'], 'x': x, 'y': y, 'z': z, 'l': a, 'w': d, 'h': h})
+            else:
+                placements.append({'box_id': box['box_id'], 'x': y, 'y': x, 'z': z, 'l': d, 'w': a, 'h': h})
+    return True
+
+def guillotine_children(fs, l, w, h):
+    """Right/front/top children of fs after placing an l x w x h box at its origin."""
+    # Right space
+    rx = FreeSpace(fs.x + l, fs.y, fs.z, fs.l - l, fs.w, fs.h)
+
+    # Front space
+    fy = FreeSpace(fs.x, fs.y + w, fs.z, l, fs.w - w, fs.h)
+
+    # Top space
+    tz = FreeSpace(fs.x, fs.y, fs.z + h, l, w, fs.h - h)
+
+    return [s for s in (rx, fy, tz) if _is_usable(s)]
+
+
+class FreeSpaceManager:
+    """
+    Ordered free-space list used by the first-fit packer.
+    Each space keeps its sorted dimensions so a box only runs the orientation test
+    on spaces whose sorted dims dominate the box's sorted dims (an exact fit test
+    for axis-aligned rotations). Upper bounds on the largest space dimension and
+    volume let a box that fits nowhere skip the scan entirely; children never
+    exceed their parent, so the bounds stay valid and are tightened after every
+    scan that finds no fit. The used space is replaced by its disjoint
+    right/front/top guillotine children.
+    """
+    __slots__ = ("spaces", "keys", "split_strategy", "max_largest_dim", "max_volume")
+
+    def __init__(self, spaces=(), split_strategy="guillotine"):
+        if split_strategy not in SPLIT_STRATEGIES:
+            raise ValueError(f"Unknown split strategy '{split_strategy}'. Valid values: {', '.join(SPLIT_STRATEGIES)}")
+        self.split_strategy = split_strategy
+        self._set_spaces(list(spaces))
+
+    def _set_spaces(self, spaces):
+        self.spaces = spaces
+        self.keys = [_space_key(fs) for fs in spaces]
+        self._tighten_bounds()
+
+    def _tighten_bounds(self):
+        self.max_largest_dim = max((key[2] for key in self.keys), default=-1.0)
+        self.max_volume = max((key[3] for key in self.keys), default=-1.0)
+
+    def copy(self):
+        clone = FreeSpaceManager.__new__(FreeSpaceManager)
+        clone.split_strategy = self.split_strategy
+        clone.spaces = list(self.spaces)
+        clone.keys = list(self.keys)
+        clone.max_largest_dim = self.max_largest_dim
+        clone.max_volume = self.max_volume
+        return clone
+
+    def __len__(self):
+        return len(self.spaces)
+
+    def __iter__(self):
+        return iter(self.spaces)
+
+    def can_fit_anywhere(self, box_key):
+        return box_key[2] <= self.max_largest_dim + FIT_EPS and box_key[3] <= self.max_volume
+
+    def first_fit(self, box):
+        """Return (index, fs, (l,w,h)) for the first space that fits box, or None."""
+        box_key = box_fit_key(box)
+        if not self.can_fit_anywhere(box_key):
+            return None
+        b0, b1, b2 = box_key[0], box_key[1], box_key[2]
+        for i, key in enumerate(self.keys):
+            if b0 <= key[0] + FIT_EPS and b1 <= key[1] + FIT_EPS and b2 <= key[2] + FIT_EPS:
+                fs = self.spaces[i]
+                chosen = try_place_box_in_fs(box, fs)
+                if chosen:
+                    return i, fs, chosen
+        self._tighten_bounds()
+        return None
+
+    def place(self, index, fs, l, w, h):
+        """Update the free spaces after placing an l x w x h box at the origin of spaces[index]."""
+        new_spaces = guillotine_children(fs, l, w, h)
+        # remove used fs and insert new ones at front
+        del self.spaces[index]
+        del self.keys[index]
+        self.spaces = new_spaces + self.spaces
+        self.keys = [_space_key(s) for s in new_spaces] + self.keys
+
+class ArrayFreeSpaceManager:
+    """
+    Array-backed free-space list for the guillotine split.
+    Free spaces live in an (n, 6) array of x, y, z, l, w, h rows and a box's six
+    orientations in a (6, 3) array, so the fit test of every (space, orientation)
+    pair is one broadcast. Leftover volume is then computed for the six
+    orientations of the first fitting space; choosing the smallest (first one on
+    ties) matches try_place_box_in_fs, so results are identical to the python
+    backend.
+    Rows are stored in reverse first-fit order: children are appended at the end
+    and used spaces are only masked out, so a placement never shifts the array.
+    """
+    __slots__ = ("rows", "alive", "size", "split_strategy")
+
+    def __init__(self, spaces=(), split_strategy="guillotine"):
+        if not _HAS_NUMPY:
+            raise ImportError("numpy is required for the numpy packer backend")
+        if split_strategy not in SPLIT_STRATEGIES:
+            raise ValueError(f"Unknown split strategy '{split_strategy}'. Valid values: {', '.join(SPLIT_STRATEGIES)}")
+        self.split_strategy = split_strategy
+        spaces = list(spaces)[::-1]
+        capacity = max(16, 4 * len(spaces))
+        self.rows = np.zeros((capacity, 6))
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.size = 0
+        self._append([(fs.x, fs.y, fs.z, fs.l, fs.w, fs.h) for fs in spaces])
+
+    def _append(self, new_rows):
+        needed = self.size + len(new_rows)
+        if needed > len(self.rows):
+            capacity = max(needed, 2 * len(self.rows))
+            rows = np.zeros((capacity, 6))
+            alive = np.zeros(capacity, dtype=bool)
+            rows[:self.size] = self.rows[:self.size]
+            alive[:self.size] = self.alive[:self.size]
+            self.rows, self.alive = rows, alive
+        if new_rows:
+            self.rows[self.size:needed] = new_rows
+            self.alive[self.size:needed] = True
+        self.size = needed
+
+    def copy(self):
+        clone = ArrayFreeSpaceManager.__new__(ArrayFreeSpaceManager)
+        clone.split_strategy = self.split_strategy
+        clone.rows = self.rows.copy()
+        clone.alive = self.alive.copy()
+        clone.size = self.size
+        return clone
+
+    def __len__(self):
+        return int(self.alive[:self.size].sum())
+
+    def __iter__(self):
+        live = np.flatnonzero(self.alive[:self.size])[::-1]
+        return (FreeSpace(*row) for row in self.rows[live].tolist())
+
+    def first_fit(self, box):
+        """Return (index, fs, (l,w,h)) for the first space that fits box, or None."""
+        dims = (box['length'], box['width'], box['height'])
+        orientations = np.array(dims)[ORIENTATION_INDEX]
+        space_dims = self.rows[:self.size, None, 3:6]
+        fits = (orientations[None, :, :] <= space_dims + FIT_EPS).all(axis=2)
+        candidates = fits.any(axis=1) & self.alive[:self.size]
+        # first-fit order is reverse storage order
+        reverse_position = int(candidates[::-1].argmax())
+        index = self.size - 1 - reverse_position
+        if index < 0 or not candidates[index]:
+            return None
+        row = self.rows[index]
+        positive = np.maximum(row[3:6] - orientations, 0)
+        leftover = positive[:, 0] * positive[:, 1] * positive[:, 2]
+        leftover[~fits[index]] = np.inf
+        ox = ORIENTATION_INDEX[int(leftover.argmin())]
+        fs = FreeSpace(*row.tolist())
+        return index, fs, (dims[ox[0]], dims[ox[1]], dims[ox[2]])
+
+    def place(self, index, fs, l, w, h):
+        """Update the free spaces after placing an l x w x h box at the origin of rows[index]."""
+        self.alive[index] = False
+        children = guillotine_children(fs, l, w, h)
+        self._append([(s.x, s.y, s.z, s.l, s.w, s.h) for s in reversed(children)])
+
+
+def new_free_space_manager(spaces, split_strategy="guillotine", backend="python"):
+    if backend == "numpy":
+        return ArrayFreeSpaceManager(spaces, split_strategy=split_strategy)
+    if backend != "python":
+        raise ValueError(f"Unknown packer backend '{backend}'. Valid values: {', '.join(PACKER_BACKENDS)}")
+    return FreeSpaceManager(spaces, split_strategy=split_strategy)
+
+
+class PackingState:
+    """
+    Resumable snapshot of a sequential packing run.
+    Packing is first-fit in box order, so the state after packing a prefix of
+    boxes is exactly what the packer would hold before the next box.
+    FreeSpace objects and placement dicts are never mutated after creation,
+    which makes copy() a cheap shallow copy.
+    A failed state (early exit) stays failed: no extension of it can fit.
+    """
+    __slots__ = ("free", "placements", "packed_volume", "placed_count", "capacity", "failed")
+
+    def __init__(self, free, placements=None, packed_volume=0.0, placed_count=0, capacity=math.inf, failed=False):
+        self.free = free
+        self.placements = placements if placements is not None else []
+        self.packed_volume = packed_volume
+        self.placed_count = placed_count
+        self.capacity = capacity
+        self.failed = failed
+
+    def copy(self):
+        return PackingState(
+            self.free.copy(), list(self.placements), self.packed_volume, self.placed_count, self.capacity, self.failed
+        )
+
+    def __repr__(self):
+        return f"PackingState(placed={self.placed_count}, free={len(self.free)}, vol={self.packed_volume:.2f})"
+
+def new_packing_state(container, split_strategy="guillotine", backend="python"):
+    """Empty-container state for a container dict with L,W,H."""
+    root = FreeSpace(0,0,0, container['L'], container['W'], container['H'])
+    return PackingState(
+        new_free_space_manager([root], split_strategy=split_strategy, backend=backend),
+        capacity=container['L'] * container['W'] * container['H'],
+    )
+
+def packing_mode_flags(mode):
+    """(record_placements, stop_on_failure) for a packing mode."""
+    if mode not in PACKING_MODES:
+        raise ValueError(f"Unknown packing mode '{mode}'. Valid values: {', '.join(PACKING_MODES)}")
+    return mode == "full", mode == "feasibility"
+
+def box_volume(box):
+    return box['length'] * box['width'] * box['height']
+
+def exceeds_free_volume(state, volume, packed_volume=None):
+    """True if `volume` more box volume cannot fit in what is left of the container."""
+    if packed_volume is None:
+        packed_volume = state.packed_volume
+    return volume > (state.capacity - packed_volume) * (1.0 + FIT_EPS)
+
+def pack_boxes_into_state(state, boxes, max_boxes=None, record_placements=True, stop_on_failure=False):
+    """
+    Continue packing `boxes` (in given order) on top of `state`.
+    The state is updated in place and returned.
     Strategy:
-      - For each box (in given order) try to place it in the first free space with any orientation
-      - If placed, split free space into a small set of children (right/front/top + extras)
-      - This is a simple heuristic (no merging)
+      - For each box try to place it in the first free space with any orientation
+      - If placed, let the free-space manager split / prune the free spaces
+    With stop_on_failure the run ends (state.failed) at the first box that does
+    not fit, or as soon as the remaining box volume exceeds the free volume.
+    Without record_placements no placement dicts are built.
     """
-    free = [FreeSpace(0,0,0, container['L'], container['W'], container['H'])]
-    placements = []
-    packed_vol = 0.0
-    placed_count = 0
+    if stop_on_failure and state.failed:
+        return state
+    free = state.free
+    placements = state.placements
+    packed_vol = state.packed_volume
+    placed_count = state.placed_count
+    remaining_vol = sum(box_volume(box) for box in boxes) if stop_on_failure else 0.0
 
     for box in boxes:
         if max_boxes and placed_count >= max_boxes:
             break
-        placed = False
-        for i, fs in enumerate(free):
-            chosen = try_place_box_in_fs(box, fs)
-            if chosen:
-                l, w, h = chosen
-                # place at fs origin
-                placements.append({
-                    'box_id': box['box_id'],
-                    'x': fs.x,
-                    'y': fs.y,
-                    'z': fs.z,
-                    'l': l,
-                    'w': w,
-                    'h': h
-                })
-                packed_vol += l * w * h
-                placed_count += 1
-                # Split used free space into new free spaces (conservative)
-                # Right space (x + l)
-                                # Right space
-                rx = FreeSpace(fs.x + l, fs.y, fs.z, fs.l - l, fs.w, fs.h)
-
-                # Front space
-                fy = FreeSpace(fs.x, fs.y + w, fs.z, l, fs.w - w, fs.h)
-
-                # Top space
-                tz = FreeSpace(fs.x, fs.y, fs.z + h, l, w, fs.h - h)
-
-                new_spaces = []
-                for s in [rx, fy, tz]:
-                    if s.l > 1e-6 and s.w > 1e-6 and s.h > 1e-6:
-                        new_spaces.append(s)
-
-                # remove used fs and insert new ones at front
-                del free[i]
-                free = new_spaces + free
-                placed = True
+        if stop_on_failure:
+            if exceeds_free_volume(state, remaining_vol, packed_vol):
+                state.failed = True
+                break
+            remaining_vol -= box_volume(box)
+        fit = free.first_fit(box)
+        if fit is None:
+            if stop_on_failure:
+                state.failed = True
                 break
-        if not placed:
             continue
-    return placements, packed_vol, placed_count
+        i, fs, (l, w, h) = fit
+        if record_placements:
+            # place at fs origin
+            placements.append({
+                'box_id': box['box_id'],
+                'x': fs.x,
+                'y': fs.y,
+                'z': fs.z,
+                'l': l,
+                'w': w,
+                'h': h
+            })
+        packed_vol += l * w * h
+        placed_count += 1
+        free.place(i, fs, l, w, h)
+
+    state.packed_volume = packed_vol
+    state.placed_count = placed_count
+    return state
+
+def place_boxes_in_container(container, boxes, max_boxes=None, split_strategy="guillotine", backend="python", mode="full"):
+    """
+    container: dict with L,W,H
+    boxes: list of dicts {'box_id','length','width','height'}
+    mode: one of PACKING_MODES; placements stay empty unless mode is "full"
+    returns: placements list [{'box_id','x','y','z','l','w','h'}], packed_volume, placed_count
+    """
+    record_placements, stop_on_failure = packing_mode_flags(mode)
+    state = new_packing_state(container, split_strategy=split_strategy, backend=backend)
+    state = pack_boxes_into_state(
+        state,
+        boxes,
+        max_boxes=max_boxes,
+        record_placements=record_placements,
+        stop_on_failure=stop_on_failure,
+    )
+    return state.placements, state.packed_volume, state.placed_count
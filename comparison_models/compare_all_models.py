@@ -26,6 +26,10 @@ from comparison_models.common.experiment_utils import (
     recommended_max_workers,
     write_csv_rows,
 )
+from comparison_models.common.island_model import MIGRATION_TOPOLOGIES
+from comparison_models.common.local_search import LOCAL_SEARCH_MODES
+from comparison_models.common.loaders.shared_dataset import SHARED_PACKING_TABLE_SLOTS, SharedEvaluationContext
+from comparison_models.proposed_model.config import ISLANDS, MIGRATION_INTERVAL, MIGRATION_SIZE, MIGRATION_TOPOLOGY
 from comparison_models.proposed_model.run_experiments import run_from_config as run_proposed_model
 
 try:
@@ -176,6 +180,18 @@ def run_single_job(job: dict) -> dict:
             "mut_prob": config["mut_prob"],
             "max_boxes_per_route": config["max_boxes_per_route"],
             "verbose": config["verbose"],
+            "islands": config["islands"],
+            "migration_interval": config["migration_interval"],
+            "migration_size": config["migration_size"],
+            "migration_topology": config["migration_topology"],
+            "stagnation_window": config["stagnation_window"],
+            "min_relative_improvement": config["min_relative_improvement"],
+            "time_budget_seconds": config["time_budget_seconds"],
+            "packer_call_budget": config["packer_call_budget"],
+            "local_search": config["local_search"],
+            "deduplicate_population": config["deduplicate_population"],
+            "duplicate_immigrants": config["duplicate_immigrants"],
+            "resume": config["resume"],
             "progress_label": f"{model_name} {dataset_name} seed {seed}",
         }
     )
@@ -231,6 +247,71 @@ def main() -> int:
         help="Rerun seeds even if their output files already exist.",
     )
     parser.add_argument("--verbose", action="store_true")
+    parser.add_argument(
+        "--islands",
+        type=int,
+        default=ISLANDS,
+        help="Island-model GA: sub-populations per run, each in its own process. Lower --max-workers accordingly.",
+    )
+    parser.add_argument("--migration-interval", type=int, default=MIGRATION_INTERVAL, help="Generations between elite exchanges.")
+    parser.add_argument("--migration-size", type=int, default=MIGRATION_SIZE, help="Elites sent to the next island per exchange.")
+    parser.add_argument("--migration-topology", choices=MIGRATION_TOPOLOGIES, default=MIGRATION_TOPOLOGY)
+    parser.add_argument(
+        "--stagnation-window",
+        type=int,
+        default=0,
+        help="Stop a run when its best score has not improved for this many generations (0 = off).",
+    )
+    parser.add_argument(
+        "--min-relative-improvement",
+        type=float,
+        default=0.0,
+        help="With --stagnation-window: also stop when the window improved the best score by less than this fraction.",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        help="Wall-clock seconds per run after which no new generation is started (same budget for every model).",
+    )
+    parser.add_argument(
+        "--packer-call-budget",
+        type=int,
+        default=None,
+        help="Packer calls per run after which no new generation is started.",
+    )
+    parser.add_argument(
+        "--local-search",
+        choices=LOCAL_SEARCH_MODES,
+        default="off",
+        help="Memetic 2-opt/Or-opt inside the decoded routes of the elites or of every child (all models).",
+    )
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="Evaluate every individual, even copies of one already scored in this or the previous generation (all models).",
+    )
+    parser.add_argument(
+        "--duplicate-immigrants",
+        action="store_true",
+        help="Replace children that repeat another individual with random permutations (all models).",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Ignore checkpoints of interrupted seeds and run them from the start.",
+    )
+    parser.add_argument(
+        "--no-shared-memory",
+        action="store_true",
+        help="Let every worker load datasets and pack routes on its own instead of sharing them.",
+    )
+    parser.add_argument(
+        "--shared-table-slots",
+        type=int,
+        default=SHARED_PACKING_TABLE_SLOTS,
+        help="Slots of the shared packing-result table per dataset (0 disables it).",
+    )
     args = parser.parse_args()
 
     dataset_paths = _resolve_dataset_filters(args.dataset, args.dataset_manifest)
@@ -291,6 +372,18 @@ def main() -> int:
                             "mut_prob": args.mut_prob,
                             "max_boxes_per_route": args.max_boxes_per_route,
                             "verbose": args.verbose,
+                            "islands": args.islands,
+                            "migration_interval": args.migration_interval,
+                            "migration_size": args.migration_size,
+                            "migration_topology": args.migration_topology,
+                            "stagnation_window": args.stagnation_window,
+                            "min_relative_improvement": args.min_relative_improvement,
+                            "time_budget_seconds": args.time_budget,
+                            "packer_call_budget": args.packer_call_budget,
+                            "local_search": args.local_search,
+                            "deduplicate_population": not args.no_dedup,
+                            "duplicate_immigrants": args.duplicate_immigrants,
+                            "resume": not args.no_resume,
                         },
                     }
                 )
@@ -326,9 +419,18 @@ def main() -> int:
         failed = 0
         pipeline_start = time.perf_counter()
 
-        with ProcessPoolExecutor(
+        mp_context = multiprocessing.get_context("spawn")
+        shared = SharedEvaluationContext(
+            sorted({job["dataset_path"] for job in jobs}),
+            mp_context,
+            table_slots=args.shared_table_slots,
+            enabled=not args.no_shared_memory,
+        )
+        with shared, ProcessPoolExecutor(
             max_workers=max_workers,
-            mp_context=multiprocessing.get_context("spawn"),
+            mp_context=mp_context,
+            initializer=shared.initializer,
+            initargs=shared.initargs,
         ) as executor:
             future_to_job = {
                 executor.submit(run_single_job, job): job
@@ -1,23 +1,29 @@
 ﻿# comparison_models/proposed_model/ga_runner.py
 
 import time
-import random
 import json
-import copy
-from math import sqrt
+import heapq
+from bisect import bisect_left, bisect_right
 
-from comparison_models.common.algorithms.crossover import order_crossover
+from comparison_models.proposed_model import config as model_config
 from comparison_models.proposed_model.mutation import (
     swap_mutation,
     hybrid_mutation,
 )
-from comparison_models.common.algorithms.selection import tournament_select
-from comparison_models.common.loaders.route_evaluator import load_merged, evaluate_route, split_depot_and_customers
+from comparison_models.common.algorithms.split import optimal_split, threshold_splits
+from comparison_models.common.loaders.route_evaluator import PRECHECK_ESTIMATE_KEYS, repack_route_details
+from comparison_models.common.ga_engine import GAEngine
+from comparison_models.common.loaders.compiled_dataset import compile_dataset
+from comparison_models.common.evaluation_record import EvaluationRecord
+from comparison_models.common.utils.distance_matrix import get_distance_provider
 from comparison_models.proposed_model.config import (
     USE_PACKING,
+    PERMUTATION_CACHE_MAX_ENTRIES,
+    PERMUTATION_CACHE_MAX_MB,
+    SPLIT_CANDIDATE_CACHE_MAX_ENTRIES,
+    SPLIT_CANDIDATE_CACHE_MAX_MB,
     PENALTY_ALPHA,
     USE_ENHANCED_MUTATION,
-    MODEL_NAME,
     ENABLE_ADAPTIVE_DECODING,
     ENABLE_TINY_ROUTE_REPAIR,
     ROUTE_COUNT_PENALTY,
@@ -69,20 +75,26 @@ from comparison_models.proposed_model.config import (
 )
 
 
-class GARunner:
+def new_delta_eval_stats() -> dict:
+    """Counters of mutation-only children decoded from their parent's partition."""
+    return {"delta_evaluations": 0, "routes_reused": 0}
+
+
+class GARunner(GAEngine):
+    """
+    Proposed model: adaptive multi-threshold decoding of the best individuals,
+    tiny-route merge and customer relocation repair, size-scaled penalties and
+    the hybrid mutation, on the common GA loop of common/ga_engine.py.
+    """
+
+    defaults = model_config
+
     def __init__(self, config: dict):
-        self.config = config or {}
-        self.pop_size = int(self.config.get("pop_size", self.config.get("population_size", 80)))
-        self.gens = int(self.config.get("gens", self.config.get("num_generations", 200)))
-        self.cx_prob = float(self.config.get("cx_prob", self.config.get("crossover_prob", 0.9)))
-        self.mut_prob = float(self.config.get("mut_prob", self.config.get("mutation_prob", 0.2)))
-        self.max_boxes_per_route = int(self.config.get("max_boxes_per_route", self.config.get("maxboxes", 48)))
-        self.seed = int(self.config.get("seed", 42))
-        self.verbose = bool(self.config.get("verbose", False))
-        self.progress_label = str(self.config.get("progress_label", MODEL_NAME))
-        self.route_eval_cache: dict[tuple[int, ...], dict] = {}
-        self.permutation_eval_cache: dict[tuple[str, tuple[int, ...]], tuple[float, dict]] = {}
-        self.split_candidate_cache: dict[tuple[int, ...], list[dict]] = {}
+        super().__init__(config)
+        self.delta_eval_stats = new_delta_eval_stats()
+        # permutation cache key -> EvaluationRecord; order -> frozen split candidates.
+        self.permutation_eval_cache = self.new_cache("permutation", PERMUTATION_CACHE_MAX_ENTRIES, PERMUTATION_CACHE_MAX_MB)
+        self.split_candidate_cache = self.new_cache("split_candidate", SPLIT_CANDIDATE_CACHE_MAX_ENTRIES, SPLIT_CANDIDATE_CACHE_MAX_MB)
         self.split_offsets = list(self.config.get("split_offsets", [-5, 0, 5]))
         self.very_large_split_offsets = list(self.config.get("very_large_split_offsets", [-5, 0, 2]))
         self.adaptive_top_fraction = float(self.config.get("adaptive_top_fraction", 0.35))
@@ -353,47 +365,50 @@ class GARunner:
         return 1.01
 
     @staticmethod
-    def euclid(a, b):
-        return sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2)
-
-    @staticmethod
-    def route_distance(depot, customers_map, route):
-        if not route:
-            return 0.0
-
-        dist = 0.0
-
-        first = customers_map[route[0]]
-        dist += GARunner.euclid((depot[0], depot[1]), (first["x"], first["y"]))
-
-        for i in range(len(route) - 1):
-            c1 = customers_map[route[i]]
-            c2 = customers_map[route[i + 1]]
-            dist += GARunner.euclid((c1["x"], c1["y"]), (c2["x"], c2["y"]))
-
-        last = customers_map[route[-1]]
-        dist += GARunner.euclid((last["x"], last["y"]), (depot[0], depot[1]))
-
-        return dist
-
-    @staticmethod
-    def build_customer_boxcount_map(customers):
-        return {
-            c["customer_id"]: len(c.get("assigned_boxes", []))
-            for c in customers
-        }
+    def changed_span(parent, child):
+        """(first, last) positions where child differs from parent, or None if equal."""
+        n = len(child)
+        first = 0
+        while first < n and child[first] == parent[first]:
+            first += 1
+        if first == n:
+            return None
+        last = n - 1
+        while child[last] == parent[last]:
+            last -= 1
+        return first, last
 
     @staticmethod
-    def decode_by_boxcount(order, cust_boxcount_map, max_boxes_per_route=48):
-        routes = []
+    def decode_by_boxcount_delta(order, cust_boxcount_map, parent_routes, first, last, max_boxes_per_route=48):
+        """
+        decode_by_boxcount for an order that equals the parent order decoded into
+        parent_routes everywhere outside positions first..last. Routes ending before
+        `first - 1` are kept; decoding restarts at the parent route holding
+        `first - 1` and stops once a route starts, past `last`, where a parent route starts, since
+        the rest of the split is then the parent's. Unchanged routes are copied.
+        """
+        starts = []
+        position = 0
+        for route in parent_routes:
+            starts.append(position)
+            position += len(route)
+        start_index = {start: index for index, start in enumerate(starts)}
+
+        # A route is closed by the customer after it, so the route ending just
+        # before `first` may change too.
+        k = bisect_right(starts, max(first - 1, 0)) - 1
+        routes = [route[:] for route in parent_routes[:k]]
         cur = []
         cur_boxes = 0
-
-        for cid in order:
+        for i in range(starts[k], len(order)):
+            cid = order[i]
             b = cust_boxcount_map.get(cid, 0)
 
             if cur and (cur_boxes + b > max_boxes_per_route):
                 routes.append(cur)
+                if i > last and i in start_index:
+                    routes.extend(route[:] for route in parent_routes[start_index[i]:])
+                    return routes
                 cur = [cid]
                 cur_boxes = b
             else:
@@ -409,41 +424,16 @@ class GARunner:
         self,
         order,
         cust_boxcount_map,
-        depot,
-        customers_map,
+        distances,
         max_boxes_per_route=48,
         distance_limit=None,
     ):
-        routes = []
-        cur = []
-        cur_boxes = 0
-
-        for cid in order:
-            customer_boxes = cust_boxcount_map.get(cid, 0)
-            should_split = False
-
-            if cur and (cur_boxes + customer_boxes > max_boxes_per_route):
-                should_split = True
-            elif cur and distance_limit is not None:
-                tentative_route = cur + [cid]
-                tentative_distance = self.route_distance(depot, customers_map, tentative_route)
-                enough_boxes_to_split = cur_boxes >= max(1, int(max_boxes_per_route * 0.5))
-                route_is_long = tentative_distance > distance_limit
-                if enough_boxes_to_split and route_is_long:
-                    should_split = True
-
-            if should_split:
-                routes.append(cur)
-                cur = [cid]
-                cur_boxes = customer_boxes
-            else:
-                cur.append(cid)
-                cur_boxes += customer_boxes
-
-        if cur:
-            routes.append(cur)
-
-        return routes
+        return threshold_splits(
+            order,
+            cust_boxcount_map,
+            distances,
+            adaptive_limits=[(max_boxes_per_route, distance_limit)],
+        )[1][0]
 
     def route_box_count(self, route, cust_boxcount_map):
         return sum(cust_boxcount_map.get(customer_id, 0) for customer_id in route)
@@ -483,28 +473,30 @@ class GARunner:
             "overflow_route_count": overflow_route_count,
         }
 
-    def estimate_distance_limit(self, order, cust_box_map, depot, customers_map, split_limit):
+    def estimate_distance_limit(self, order, cust_box_map, distances, split_limit, giant_tour_distance=None, total_boxes=None):
         if not order:
             return None
 
-        total_boxes = sum(cust_box_map.get(customer_id, 0) for customer_id in order)
+        if total_boxes is None:
+            total_boxes = sum(cust_box_map.get(customer_id, 0) for customer_id in order)
         expected_route_count = max(1, round(total_boxes / max(1, split_limit)))
-        giant_tour_distance = self.route_distance(depot, customers_map, order)
+        if giant_tour_distance is None:
+            giant_tour_distance = distances.route_distance(order)
         return (giant_tour_distance / expected_route_count) * 1.15
 
-    def generate_candidate_route_partitions(self, order, cust_box_map, depot, customers_map):
+    def generate_candidate_route_partitions(self, order, cust_box_map, distances):
         order_key = tuple(order)
-        if order_key in self.split_candidate_cache:
-            return copy.deepcopy(self.split_candidate_cache[order_key])
-
-        candidates = []
-        seen_signatures = set()
-        base_routes = self.decode_by_boxcount(
-            order,
-            cust_box_map,
-            max_boxes_per_route=self.max_boxes_per_route,
-        )
-        base_route_count = len(base_routes)
+        cached_candidates = self.split_candidate_cache.get(order_key)
+        if cached_candidates is not None:
+            return [
+                {
+                    "split_limit": split_limit,
+                    "strategy": strategy,
+                    "distance_limit": distance_limit,
+                    "routes": [list(route) for route in routes],
+                }
+                for split_limit, strategy, distance_limit, routes in cached_candidates
+            ]
 
         if self.dataset_scale() == "very_large":
             candidate_offsets = self.very_large_split_offsets
@@ -512,15 +504,43 @@ class GARunner:
             candidate_offsets = [-5, 0, 1]
         else:
             candidate_offsets = self.split_offsets
+        split_limits = [max(1, self.max_boxes_per_route + int(offset)) for offset in candidate_offsets]
 
-        for offset in candidate_offsets:
-            split_limit = max(1, self.max_boxes_per_route + int(offset))
-
-            plain_routes = self.decode_by_boxcount(
+        # Every threshold decode of the order comes out of one threshold_splits call.
+        giant_tour_distance = distances.route_distance(order)
+        total_boxes = sum(cust_box_map.get(customer_id, 0) for customer_id in order)
+        distance_limits = [
+            self.estimate_distance_limit(
                 order,
                 cust_box_map,
-                max_boxes_per_route=split_limit,
+                distances,
+                split_limit,
+                giant_tour_distance=giant_tour_distance,
+                total_boxes=total_boxes,
             )
+            for split_limit in split_limits
+        ]
+        box_partitions, adaptive_partitions = threshold_splits(
+            order,
+            cust_box_map,
+            distances,
+            box_limits=[self.max_boxes_per_route] + split_limits,
+            adaptive_limits=[
+                (max(1, int(round(split_limit * (1.0 + self.elite_overflow_ratio)))), distance_limit)
+                for split_limit, distance_limit in zip(split_limits, distance_limits)
+            ],
+        )
+        base_routes = box_partitions[0]
+        base_route_count = len(base_routes)
+
+        candidates = []
+        seen_signatures = set()
+        for split_limit, plain_routes, distance_limit, adaptive_routes in zip(
+            split_limits,
+            box_partitions[1:],
+            distance_limits,
+            adaptive_partitions,
+        ):
             plain_signature = tuple(tuple(route) for route in plain_routes)
             if plain_signature not in seen_signatures:
                 if len(plain_routes) <= base_route_count + 1:
@@ -534,21 +554,6 @@ class GARunner:
                         }
                     )
 
-            distance_limit = self.estimate_distance_limit(
-                order,
-                cust_box_map,
-                depot,
-                customers_map,
-                split_limit,
-            )
-            adaptive_routes = self.decode_with_adaptive_splits(
-                order,
-                cust_box_map,
-                depot,
-                customers_map,
-                max_boxes_per_route=max(1, int(round(split_limit * (1.0 + self.elite_overflow_ratio)))),
-                distance_limit=distance_limit,
-            )
             adaptive_signature = tuple(tuple(route) for route in adaptive_routes)
             if adaptive_signature not in seen_signatures:
                 if len(adaptive_routes) <= base_route_count + 1:
@@ -572,7 +577,15 @@ class GARunner:
                 }
             )
 
-        self.split_candidate_cache[order_key] = copy.deepcopy(candidates)
+        self.split_candidate_cache[order_key] = tuple(
+            (
+                candidate["split_limit"],
+                candidate["strategy"],
+                candidate["distance_limit"],
+                tuple(tuple(route) for route in candidate["routes"]),
+            )
+            for candidate in candidates
+        )
         return candidates
 
     def prescreen_candidate_partitions(self, candidates, cust_box_map):
@@ -674,11 +687,7 @@ class GARunner:
         avg_customers_per_route = sum(route_customer_counts) / len(route_customer_counts) if route_customer_counts else 0.0
         min_customers_per_route = min(route_customer_counts) if route_customer_counts else 0
         max_customers_per_route = max(route_customer_counts) if route_customer_counts else 0
-        tiny_route_count = sum(
-            1 for route in route_details
-            if len(route["route"]) <= self.tiny_route_customer_threshold
-            or route["fill_rate"] <= self.tiny_route_fill_threshold
-        )
+        tiny_route_count = sum(1 for route in route_details if self.is_tiny_route(route))
 
         return {
             "avg_fill_rate": avg_fill_rate,
@@ -717,9 +726,10 @@ class GARunner:
             - (info["avg_fill_rate"] * policy["fill_reward_weight"])
         )
 
-    def finalize_partition_info(self, info, routes, cust_box_map, split_limit, merged_route_count=0):
+    def finalize_partition_info(self, info, routes, cust_box_map, split_limit, merged_route_count=0, route_box_counts=None):
         finalized = dict(info)
-        route_box_counts = self.route_box_counts(routes, cust_box_map)
+        if route_box_counts is None:
+            route_box_counts = self.route_box_counts(routes, cust_box_map)
         finalized["merged_route_count"] = int(merged_route_count)
         finalized["overflow_route_count"] = sum(1 for box_count in route_box_counts if box_count > split_limit)
         finalized["avg_boxes_per_route"] = finalized.get("avg_route_boxes", 0.0)
@@ -727,7 +737,27 @@ class GARunner:
         finalized["max_boxes_per_route"] = finalized.get("max_route_boxes", 0)
         return finalized, self.score_partition_info(finalized)
 
-    def try_repair_routes(self, merged_path, routes, depot, customers_map, cust_box_map, split_limit):
+    def is_tiny_route(self, route_detail):
+        # A route rejected by the packing precheck has no measured fill rate.
+        fill_rate = route_detail.get("fill_rate_estimate", route_detail["fill_rate"])
+        return (
+            len(route_detail["route"]) <= self.tiny_route_customer_threshold
+            or fill_rate <= self.tiny_route_fill_threshold
+        )
+
+    def try_repair_routes(self, merged_path, routes, distances, cust_box_map, split_limit):
+        """
+        Merges tiny routes into a neighbouring route, first tiny route first,
+        until the first remaining one cannot be merged.
+
+        The current partition is kept as per-route details and box counts, and
+        the tiny routes wait in a heap keyed by a label that follows route
+        order (a merged route keeps its neighbour's label), so the next tiny
+        route is found without rescanning. A merge packs only the merged route;
+        candidates that would keep an infeasible route or exceed the box limit
+        are rejected before packing. The aggregates are recombined from the
+        per-route details in route order so scores match a full evaluation.
+        """
         if not self.enable_tiny_route_repair:
             return [list(route) for route in routes if route], 0
         if len(routes) <= 1:
@@ -736,91 +766,100 @@ class GARunner:
         repaired_routes = [list(route) for route in routes if route]
         merged_route_count = 0
         max_route_boxes = max(1, int(round(split_limit * (1.0 + self.elite_overflow_ratio))))
-        changed = True
 
-        while changed:
-            changed = False
-            current_score, current_info = self.evaluate_route_partition(
-                merged_path,
-                repaired_routes,
-                depot,
-                customers_map,
-            )
-            current_info, current_score = self.finalize_partition_info(
-                current_info,
-                repaired_routes,
-                cust_box_map,
-                split_limit,
-                merged_route_count=merged_route_count,
-            )
-            route_details = []
-            for route in repaired_routes:
-                route_eval = self.route_eval_cache.get(tuple(route))
-                if route_eval is None:
-                    route_eval = evaluate_route(merged_path, route, use_packing=USE_PACKING)
-                    self.route_eval_cache[tuple(route)] = route_eval
-                route_details.append(
-                    {
-                        "route": route,
-                        "fill_rate": route_eval.get("fill_rate", 0.0),
-                        "boxes_total": route_eval.get("boxes_total", 0),
-                    }
-                )
+        current_score, current_info = self.evaluate_route_partition(
+            merged_path,
+            repaired_routes,
+            distances,
+        )
+        route_box_counts = self.route_box_counts(repaired_routes, cust_box_map)
+        current_info, current_score = self.finalize_partition_info(
+            current_info,
+            repaired_routes,
+            cust_box_map,
+            split_limit,
+            merged_route_count=merged_route_count,
+            route_box_counts=route_box_counts,
+        )
+        route_details = current_info["routes"]
+        labels = list(range(len(repaired_routes)))
+        tiny_labels = [label for label, detail in zip(labels, route_details) if self.is_tiny_route(detail)]
 
-            tiny_index = next(
-                (
-                    index for index, detail in enumerate(route_details)
-                    if len(detail["route"]) <= self.tiny_route_customer_threshold
-                    or detail["fill_rate"] <= self.tiny_route_fill_threshold
-                ),
-                None,
-            )
-            if tiny_index is None:
-                break
+        while tiny_labels:
+            tiny_label = heapq.heappop(tiny_labels)
+            tiny_index = bisect_left(labels, tiny_label)
+            if tiny_index == len(labels) or labels[tiny_index] != tiny_label:
+                continue
+            if not self.is_tiny_route(route_details[tiny_index]):
+                continue
 
             current_route = repaired_routes[tiny_index]
+            tiny_detail = route_details[tiny_index]
             neighbor_indices = [idx for idx in (tiny_index - 1, tiny_index + 1) if 0 <= idx < len(repaired_routes)]
             best_candidate = None
 
             for neighbor_index in neighbor_indices:
-                base_neighbor = repaired_routes[neighbor_index]
-                candidate_routes = [list(route) for route in repaired_routes]
-                merged_route = base_neighbor + current_route
-                if self.route_box_count(merged_route, cust_box_map) > max_route_boxes:
+                merged_box_count = route_box_counts[neighbor_index] + route_box_counts[tiny_index]
+                if merged_box_count > max_route_boxes:
                     continue
-                candidate_routes[neighbor_index] = merged_route
-                del candidate_routes[tiny_index]
-                candidate_score, candidate_info = self.evaluate_route_partition(
-                    merged_path,
-                    candidate_routes,
-                    depot,
-                    customers_map,
+                neighbor_detail = route_details[neighbor_index]
+                remaining_infeasible = (
+                    current_info["infeasible_count"]
+                    - (not tiny_detail["feasible"])
+                    - (not neighbor_detail["feasible"])
                 )
-                if candidate_info["infeasible_count"] > 0:
+                if remaining_infeasible > 0:
+                    continue
+
+                merged_route = repaired_routes[neighbor_index] + current_route
+                pack_start = time.perf_counter()
+                merged_detail = self.route_detail(merged_path, merged_route, distances.route_distance(merged_route))
+                packing_time = time.perf_counter() - pack_start
+                if not merged_detail["feasible"]:
                     continue
+
+                candidate_details = list(route_details)
+                candidate_details[neighbor_index] = merged_detail
+                del candidate_details[tiny_index]
+                candidate_score, candidate_info = self.summarize_route_details(candidate_details, packing_time)
                 improvement = (
-                    candidate_info["route_count"] < len(repaired_routes)
-                    and candidate_info["min_fill_rate"] >= min(detail["fill_rate"] for detail in route_details)
-                ) or candidate_info["total_distance"] <= sum(
-                    self.route_distance(depot, customers_map, route) for route in repaired_routes
-                ) * 1.03
+                    candidate_info["min_fill_rate"] >= current_info["min_fill_rate"]
+                    or candidate_info["total_distance"] <= current_info["total_distance"] * 1.03
+                )
                 if not improvement:
                     continue
                 score_improvement = candidate_score < current_score - 1e-6
                 large_dataset_route_drop = (
                     self.dataset_scale() in {"large", "very_large"}
-                    and candidate_info["route_count"] < current_info["route_count"]
                     and candidate_info["total_distance"] <= current_info["total_distance"] * self.route_drop_distance_ratio()
                 )
                 if not (score_improvement or large_dataset_route_drop):
                     continue
                 if best_candidate is None or candidate_score < best_candidate[0]:
-                    best_candidate = (candidate_score, candidate_routes)
+                    best_candidate = (candidate_score, neighbor_index, merged_route, merged_box_count, candidate_info)
 
-            if best_candidate is not None:
-                repaired_routes = best_candidate[1]
-                merged_route_count += 1
-                changed = True
+            if best_candidate is None:
+                break
+
+            _, neighbor_index, merged_route, merged_box_count, candidate_info = best_candidate
+            repaired_routes[neighbor_index] = merged_route
+            route_box_counts[neighbor_index] = merged_box_count
+            del repaired_routes[tiny_index]
+            del route_box_counts[tiny_index]
+            del labels[tiny_index]
+            merged_route_count += 1
+            current_info, current_score = self.finalize_partition_info(
+                candidate_info,
+                repaired_routes,
+                cust_box_map,
+                split_limit,
+                merged_route_count=merged_route_count,
+                route_box_counts=route_box_counts,
+            )
+            route_details = current_info["routes"]
+            merged_index = neighbor_index if neighbor_index < tiny_index else neighbor_index - 1
+            if self.is_tiny_route(route_details[merged_index]):
+                heapq.heappush(tiny_labels, labels[merged_index])
 
         return repaired_routes, merged_route_count
 
@@ -863,8 +902,7 @@ class GARunner:
         self,
         merged_path,
         routes,
-        depot,
-        customers_map,
+        distances,
         cust_box_map,
         split_limit,
         merged_route_count=0,
@@ -876,8 +914,7 @@ class GARunner:
         best_score, best_info = self.evaluate_route_partition(
             merged_path,
             best_routes,
-            depot,
-            customers_map,
+            distances,
         )
         best_info, best_score = self.finalize_partition_info(
             best_info,
@@ -888,10 +925,11 @@ class GARunner:
         )
         if not self.should_attempt_relocation(best_info):
             return best_routes, 0
+        best_box_counts = self.route_box_counts(best_routes, cust_box_map)
         additional_merged_routes = 0
 
         for _ in range(max(0, self.max_relocation_attempts)):
-            route_details = list(best_info.get("routes") or [])
+            route_details = best_info["routes"]
             if len(route_details) < 2:
                 break
 
@@ -920,59 +958,26 @@ class GARunner:
                     candidate_moves.append(("neighbor_to_weak", customer_id))
 
                 for direction, customer_id in candidate_moves:
-                    candidate_routes = [list(route) for route in best_routes]
-                    weak_candidate = candidate_routes[weak_index]
-                    neighbor_candidate = candidate_routes[neighbor_index]
-
-                    if direction == "weak_to_neighbor":
-                        if customer_id not in weak_candidate or len(weak_candidate) <= 1:
-                            continue
-                        weak_candidate.remove(customer_id)
-                        if neighbor_index < weak_index:
-                            neighbor_candidate.append(customer_id)
-                        else:
-                            neighbor_candidate.insert(0, customer_id)
-                    else:
-                        if customer_id not in neighbor_candidate:
-                            continue
-                        neighbor_candidate.remove(customer_id)
-                        if weak_index < neighbor_index:
-                            weak_candidate.append(customer_id)
-                        else:
-                            weak_candidate.insert(0, customer_id)
-
-                    candidate_routes = [route for route in candidate_routes if route]
-                    candidate_merged_routes = merged_route_count + max(0, len(best_routes) - len(candidate_routes))
-                    candidate_score, candidate_info = self.evaluate_route_partition(
+                    candidate = self.evaluate_relocation_move(
                         merged_path,
-                        candidate_routes,
-                        depot,
-                        customers_map,
-                    )
-                    candidate_info, candidate_score = self.finalize_partition_info(
-                        candidate_info,
-                        candidate_routes,
+                        best_routes,
+                        best_info,
+                        best_box_counts,
+                        weak_index,
+                        neighbor_index,
+                        direction,
+                        customer_id,
+                        distances,
                         cust_box_map,
                         split_limit,
-                        merged_route_count=candidate_merged_routes,
+                        merged_route_count,
                     )
+                    if candidate is None:
+                        continue
+                    candidate_score, candidate_routes, candidate_info, candidate_merged_routes, candidate_box_counts = candidate
 
                     if candidate_info["infeasible_count"] > best_info["infeasible_count"]:
                         continue
-                    relocation_distance_increase_ratio = min(
-                        self.max_distance_increase_ratio,
-                        self.effective_policy()["relocation_distance_increase_ratio"],
-                    )
-                    distance_ratio_cap = relocation_distance_increase_ratio
-                    if self.dataset_scale() == "very_large" and candidate_info["route_count"] >= best_info["route_count"]:
-                        distance_ratio_cap = min(distance_ratio_cap, 1.0005)
-                    elif self.dataset_scale() == "large" and candidate_info["route_count"] >= best_info["route_count"]:
-                        distance_ratio_cap = min(distance_ratio_cap, 1.001)
-                    if candidate_info["total_distance"] > best_info["total_distance"] * distance_ratio_cap:
-                        continue
-                    if candidate_info["overflow_route_count"] > best_info["overflow_route_count"] + 1:
-                        continue
-
                     improved = (
                         candidate_info["route_count"] < best_info["route_count"]
                         or candidate_info["min_fill_rate"] > best_info["min_fill_rate"] + 1e-6
@@ -990,67 +995,184 @@ class GARunner:
                         continue
 
                     if candidate_choice is None or candidate_score < candidate_choice[0]:
-                        candidate_choice = (
-                            candidate_score,
-                            candidate_routes,
-                            candidate_info,
-                            candidate_merged_routes,
-                        )
+                        candidate_choice = candidate
 
             if candidate_choice is None:
                 break
 
-            best_score, best_routes, best_info, candidate_merged_routes = candidate_choice
+            best_score, best_routes, best_info, candidate_merged_routes, best_box_counts = candidate_choice
             additional_merged_routes = max(0, candidate_merged_routes - merged_route_count)
 
         return best_routes, additional_merged_routes
 
-    def evaluate_route_partition(self, merged_path, routes, depot, customers_map):
+    @staticmethod
+    def relocated_routes(routes, weak_index, neighbor_index, direction, customer_id):
+        """Copies of the weak and neighbour routes after one relocation move, or None if it does not apply."""
+        weak_candidate = list(routes[weak_index])
+        neighbor_candidate = list(routes[neighbor_index])
+
+        if direction == "weak_to_neighbor":
+            if customer_id not in weak_candidate or len(weak_candidate) <= 1:
+                return None
+            weak_candidate.remove(customer_id)
+            if neighbor_index < weak_index:
+                neighbor_candidate.append(customer_id)
+            else:
+                neighbor_candidate.insert(0, customer_id)
+        else:
+            if customer_id not in neighbor_candidate:
+                return None
+            neighbor_candidate.remove(customer_id)
+            if weak_index < neighbor_index:
+                weak_candidate.append(customer_id)
+            else:
+                weak_candidate.insert(0, customer_id)
+        return weak_candidate, neighbor_candidate
+
+    def evaluate_relocation_move(
+        self,
+        merged_path,
+        best_routes,
+        best_info,
+        best_box_counts,
+        weak_index,
+        neighbor_index,
+        direction,
+        customer_id,
+        distances,
+        cust_box_map,
+        split_limit,
+        merged_route_count,
+    ):
+        """
+        (score, routes, info, merged_route_count, route_box_counts) of the
+        partition after one relocation move, or None when the move does not
+        apply or breaks the distance or overflow limits.
+
+        Only the two changed routes are measured and packed; the other routes
+        keep their details and box counts from best_info, so the partition is
+        never copied or re-evaluated as a whole. The aggregates are still taken
+        over all routes in route order (O(routes)), which keeps the totals equal
+        to a full evaluate_route_partition bit for bit. The distance and
+        overflow limits are checked before the changed routes are packed.
+        """
+        moved = self.relocated_routes(best_routes, weak_index, neighbor_index, direction, customer_id)
+        if moved is None:
+            return None
+        changed = {weak_index: moved[0], neighbor_index: moved[1]}
+        best_details = best_info["routes"]
+
+        candidate_routes = []
+        candidate_box_counts = []
+        candidate_details = []
         total_distance = 0.0
-        infeasible_count = 0
-        feasible_routes = 0
-        total_boxes = 0
-        total_boxes_packed = 0
+        for index, route in enumerate(best_routes):
+            if index in changed:
+                route = changed[index]
+                if not route:
+                    continue
+                detail = None
+                box_count = self.route_box_count(route, cust_box_map)
+                route_distance = distances.route_distance(route)
+            else:
+                detail = best_details[index]
+                box_count = best_box_counts[index]
+                route_distance = detail["distance"]
+            candidate_routes.append(route)
+            candidate_box_counts.append(box_count)
+            candidate_details.append(detail if detail is not None else route_distance)
+            total_distance += route_distance
+
+        candidate_merged_routes = merged_route_count + max(0, len(best_routes) - len(candidate_routes))
+        relocation_distance_increase_ratio = min(
+            self.max_distance_increase_ratio,
+            self.effective_policy()["relocation_distance_increase_ratio"],
+        )
+        distance_ratio_cap = relocation_distance_increase_ratio
+        if self.dataset_scale() == "very_large" and len(candidate_routes) >= best_info["route_count"]:
+            distance_ratio_cap = min(distance_ratio_cap, 1.0005)
+        elif self.dataset_scale() == "large" and len(candidate_routes) >= best_info["route_count"]:
+            distance_ratio_cap = min(distance_ratio_cap, 1.001)
+        if total_distance > best_info["total_distance"] * distance_ratio_cap:
+            return None
+        overflow_route_count = sum(1 for box_count in candidate_box_counts if box_count > split_limit)
+        if overflow_route_count > best_info["overflow_route_count"] + 1:
+            return None
+
+        packing_time = 0.0
+        for position, detail in enumerate(candidate_details):
+            if not isinstance(detail, dict):
+                pack_start = time.perf_counter()
+                candidate_details[position] = self.route_detail(merged_path, candidate_routes[position], detail)
+                packing_time += time.perf_counter() - pack_start
+        candidate_score, candidate_info = self.summarize_route_details(candidate_details, packing_time)
+        candidate_info, candidate_score = self.finalize_partition_info(
+            candidate_info,
+            candidate_routes,
+            cust_box_map,
+            split_limit,
+            merged_route_count=candidate_merged_routes,
+            route_box_counts=candidate_box_counts,
+        )
+        return candidate_score, candidate_routes, candidate_info, candidate_merged_routes, candidate_box_counts
+
+    def evaluate_route_partition(self, merged_path, routes, distances, known_details=None):
+        """
+        known_details maps route tuples to route details already computed (e.g. the
+        parent's routes in a delta evaluation); those routes are not rescored.
+        """
         packing_time = 0.0
         route_details = []
 
         for route in routes:
-            route_distance = self.route_distance(depot, customers_map, route)
-            total_distance += route_distance
+            known = known_details.get(tuple(route)) if known_details else None
+            if known is not None:
+                route_details.append(dict(known, route=route))
+                self.delta_eval_stats["routes_reused"] += 1
+                continue
 
+            route_distance = distances.route_distance(route)
             pack_start = time.perf_counter()
-            route_key = tuple(route)
-            if route_key in self.route_eval_cache:
-                route_eval = self.route_eval_cache[route_key]
-            else:
-                route_eval = evaluate_route(
-                    merged_path,
-                    route,
-                    use_packing=USE_PACKING
-                )
-                self.route_eval_cache[route_key] = route_eval
+            route_details.append(self.route_detail(merged_path, route, route_distance))
             packing_time += time.perf_counter() - pack_start
 
-            feasible = route_eval.get("feasible", False)
-            if feasible:
+        return self.summarize_route_details(route_details, packing_time)
+
+    def route_detail(self, merged_path, route, route_distance):
+        route_eval = self.evaluate_route_cached(merged_path, route)
+        detail = {
+            "route": route,
+            "distance": route_distance,
+            "feasible": route_eval.get("feasible", False),
+            "boxes_total": route_eval.get("boxes_total", 0),
+            "boxes_packed": route_eval.get("boxes_packed", 0),
+            "fill_rate": route_eval.get("fill_rate", 0.0)
+        }
+        for key in PRECHECK_ESTIMATE_KEYS:
+            if key in route_eval:
+                detail[key] = route_eval[key]
+        return detail
+
+    def summarize_route_details(self, route_details, packing_time=0.0):
+        """(score, info) of a partition given its per-route details, aggregated in route order."""
+        total_distance = 0.0
+        infeasible_count = 0
+        feasible_routes = 0
+        total_boxes = 0
+        total_boxes_packed = 0
+
+        for detail in route_details:
+            total_distance += detail["distance"]
+            if detail["feasible"]:
                 feasible_routes += 1
             else:
                 infeasible_count += 1
+            total_boxes += detail["boxes_total"]
+            total_boxes_packed += detail["boxes_packed"]
 
-            total_boxes += route_eval.get("boxes_total", 0)
-            total_boxes_packed += route_eval.get("boxes_packed", 0)
-            route_details.append({
-                "route": route,
-                "distance": route_distance,
-                "feasible": feasible,
-                "boxes_total": route_eval.get("boxes_total", 0),
-                "boxes_packed": route_eval.get("boxes_packed", 0),
-                "fill_rate": route_eval.get("fill_rate", 0.0)
-            })
-
-        feasibility_rate = feasible_routes / len(routes) if routes else 0.0
+        route_count = len(route_details)
+        feasibility_rate = feasible_routes / route_count if route_count else 0.0
         unpacked_boxes = max(0, total_boxes - total_boxes_packed)
-        route_count = len(routes)
         summary = self.build_partition_summary(route_details)
 
         info = {
@@ -1071,17 +1193,71 @@ class GARunner:
         score = self.score_partition_info(info)
         return score, info
 
-    def evaluate_permutation_fast(self, merged_path, perm, depot, customers_map, cust_box_map):
-        routes = self.decode_by_boxcount(
-            perm,
-            cust_box_map,
-            max_boxes_per_route=self.max_boxes_per_route
-        )
+    def decode_optimal_split(self, order, cust_boxcount_map, distances):
+        # The per-route score penalty is part of the arc cost, so the split also
+        # weighs route count the way score_candidate does.
+        return optimal_split(
+            order,
+            cust_boxcount_map,
+            distances,
+            max_boxes_per_route=self.max_boxes_per_route,
+            max_route_customers=self.split_max_route_customers,
+            route_cost=self.effective_policy()["route_count_penalty"],
+        )
+
+    def decode_routes(self, order, cust_boxcount_map, distances):
+        """The fast (non-adaptive) decoding, as used by the memetic local search."""
+        if self.split_decoder == "optimal":
+            return self.decode_optimal_split(order, cust_boxcount_map, distances)
+        return self.decode_by_boxcount(order, cust_boxcount_map, max_boxes_per_route=self.max_boxes_per_route)
+
+    def delta_decode_from_parent(self, perm, parent, cust_box_map):
+        """
+        Greedy routes of a mutation-only child from its parent's cached fast
+        partition, plus the parent's route details keyed by route; None when the
+        parent's partition is not cached.
+        """
+        cached = self.permutation_eval_cache.get(self.permutation_cache_key(parent, adaptive=False))
+        if cached is None or len(parent) != len(perm):
+            return None
+        parent_details = cached.route_details()
+        parent_routes = [detail["route"] for detail in parent_details]
+        span = self.changed_span(parent, perm)
+        if span is None:
+            routes = [route[:] for route in parent_routes]
+        else:
+            routes = self.decode_by_boxcount_delta(
+                perm,
+                cust_box_map,
+                parent_routes,
+                span[0],
+                span[1],
+                max_boxes_per_route=self.max_boxes_per_route,
+            )
+        return routes, {tuple(detail["route"]): detail for detail in parent_details}
+
+    def evaluate_permutation_fast(self, merged_path, perm, distances, cust_box_map, parent=None):
+        known_details = None
+        if self.split_decoder == "optimal":
+            routes = self.decode_optimal_split(perm, cust_box_map, distances)
+            strategy = "optimal_split"
+        else:
+            delta = self.delta_decode_from_parent(perm, parent, cust_box_map) if parent is not None else None
+            if delta is not None:
+                routes, known_details = delta
+                self.delta_eval_stats["delta_evaluations"] += 1
+            else:
+                routes = self.decode_by_boxcount(
+                    perm,
+                    cust_box_map,
+                    max_boxes_per_route=self.max_boxes_per_route
+                )
+            strategy = "fast_box_threshold"
         score, info = self.evaluate_route_partition(
             merged_path,
             routes,
-            depot,
-            customers_map,
+            distances,
+            known_details=known_details,
         )
         info, score = self.finalize_partition_info(
             info,
@@ -1091,7 +1267,7 @@ class GARunner:
             merged_route_count=0,
         )
         info["chosen_split_limit"] = self.max_boxes_per_route
-        info["chosen_split_strategy"] = "fast_box_threshold"
+        info["chosen_split_strategy"] = strategy
         info["chosen_distance_limit"] = None
         info["number_of_split_candidates_tested"] = 1
         info["candidate_route_counts"] = [info["route_count"]]
@@ -1100,7 +1276,7 @@ class GARunner:
         info["candidate_split_summaries"] = [
             {
                 "index": 1,
-                "strategy": "fast_box_threshold",
+                "strategy": strategy,
                 "split_limit": self.max_boxes_per_route,
                 "distance_limit": None,
                 "score": score,
@@ -1114,9 +1290,9 @@ class GARunner:
         ]
         return score, info
 
-    def evaluate_final_best_refinement(self, merged_path, perm, depot, customers_map, cust_box_map):
-        if not self.enable_final_best_refinement:
-            return self.evaluate_permutation_fast(merged_path, perm, depot, customers_map, cust_box_map)
+    def evaluate_final_best_refinement(self, merged_path, perm, distances, cust_box_map):
+        if not self.enable_final_best_refinement or self.split_decoder == "optimal":
+            return self.evaluate_permutation_fast(merged_path, perm, distances, cust_box_map)
         final_split_offset = self.final_refinement_split_offset
         final_overflow_ratio = self.final_refinement_overflow_ratio
         if self.is_very_large_dataset():
@@ -1129,31 +1305,27 @@ class GARunner:
         distance_limit = self.estimate_distance_limit(
             perm,
             cust_box_map,
-            depot,
-            customers_map,
+            distances,
             split_limit,
         )
         aggressive_routes = self.decode_with_adaptive_splits(
             perm,
             cust_box_map,
-            depot,
-            customers_map,
+            distances,
             max_boxes_per_route=max(1, int(round(split_limit * (1.0 + final_overflow_ratio)))),
             distance_limit=distance_limit,
         )
         aggressive_routes, merged_route_count = self.try_repair_routes(
             merged_path,
             aggressive_routes,
-            depot,
-            customers_map,
+            distances,
             cust_box_map,
             split_limit,
         )
         aggressive_routes, relocation_merged_count = self.try_customer_relocation_repair(
             merged_path,
             aggressive_routes,
-            depot,
-            customers_map,
+            distances,
             cust_box_map,
             split_limit,
             merged_route_count=merged_route_count,
@@ -1162,8 +1334,7 @@ class GARunner:
         score, info = self.evaluate_route_partition(
             merged_path,
             aggressive_routes,
-            depot,
-            customers_map,
+            distances,
         )
         info, score = self.finalize_partition_info(
             info,
@@ -1196,39 +1367,100 @@ class GARunner:
         ]
         return score, info
 
-    def evaluate_permutation(self, merged_path, perm, adaptive=True, final_refinement=False):
-        inst_name, container, customers, boxes = load_merged(merged_path)
-        depot_customer, real_customers = split_depot_and_customers(customers)
-        if not self.num_customers:
-            self.num_customers = len(real_customers)
-
-        cust_box_map = self.build_customer_boxcount_map(real_customers)
-        depot = (depot_customer["x"], depot_customer["y"]) if depot_customer else (0, 0)
-        customers_map = {c["customer_id"]: c for c in real_customers}
-        perm_key = tuple(perm)
+    @staticmethod
+    def permutation_cache_key(perm, adaptive=True, final_refinement=False):
         cache_mode = "adaptive_final" if adaptive and final_refinement else ("adaptive" if adaptive else "fast")
-        cache_key = (cache_mode, perm_key)
+        return cache_mode, tuple(perm)
 
-        if cache_key in self.permutation_eval_cache:
-            cached_score, cached_info = self.permutation_eval_cache[cache_key]
-            return cached_score, copy.deepcopy(cached_info)
+    def cached_permutation_evaluation(self, perm, adaptive=True, final_refinement=False):
+        cached = self.permutation_eval_cache.get(self.permutation_cache_key(perm, adaptive, final_refinement))
+        if cached is None:
+            return None
+        return cached.score, cached
+
+    def parallel_evaluator_options(self):
+        return {
+            "local_lookup": self.cached_permutation_evaluation,
+            "method": "evaluate_permutation_record",
+        }
 
-        if not adaptive or not self.enable_adaptive_decoding:
-            fast_score, fast_info = self.evaluate_permutation_fast(
+    def begin_run(self, dataset):
+        super().begin_run(dataset)
+        self.permutation_eval_cache = self.new_cache("permutation", PERMUTATION_CACHE_MAX_ENTRIES, PERMUTATION_CACHE_MAX_MB)
+        self.split_candidate_cache = self.new_cache("split_candidate", SPLIT_CANDIDATE_CACHE_MAX_ENTRIES, SPLIT_CANDIDATE_CACHE_MAX_MB)
+        self.delta_eval_stats = new_delta_eval_stats()
+        self.num_customers = dataset.num_customers
+
+    def evaluation_caches(self):
+        caches = super().evaluation_caches()
+        caches["permutation"] = self.permutation_eval_cache
+        caches["split_candidate"] = self.split_candidate_cache
+        return caches
+
+    def run_counters(self):
+        counters = super().run_counters()
+        counters["delta_eval_stats"] = dict(self.delta_eval_stats)
+        return counters
+
+    def restore_run_counters(self, state):
+        super().restore_run_counters(state)
+        self.delta_eval_stats.update(state["delta_eval_stats"])
+
+    def result_stats(self):
+        stats = super().result_stats()
+        stats["delta_evaluation"] = dict(self.delta_eval_stats)
+        return stats
+
+    def evaluate_population(self, merged_path, population, adaptive=True, parents=None):
+        """(score, EvaluationRecord) per individual; infos stay frozen until reported."""
+        parents = parents or [None] * len(population)
+
+        def evaluate_indices(indices):
+            individuals = [population[index] for index in indices]
+            if self.parallel_evaluator is not None:
+                return self.parallel_evaluator.evaluate(individuals, adaptive=adaptive)
+            return [
+                self.evaluate_permutation_record(merged_path, individual, adaptive=adaptive, parent=parents[index])
+                for index, individual in zip(indices, individuals)
+            ]
+
+        return self.deduplicated(population, evaluate_indices, variant=adaptive)
+
+    def evaluate_permutation(self, merged_path, perm, adaptive=True, final_refinement=False, parent=None):
+        score, record = self.evaluate_permutation_record(merged_path, perm, adaptive, final_refinement, parent)
+        return score, record.info()
+
+    def evaluate_permutation_record(self, merged_path, perm, adaptive=True, final_refinement=False, parent=None):
+        cache_key = self.permutation_cache_key(perm, adaptive, final_refinement)
+        record = self.permutation_eval_cache.get(cache_key)
+        if record is None:
+            score, info = self.evaluate_permutation_uncached(merged_path, perm, adaptive, final_refinement, parent)
+            record = EvaluationRecord.from_info(score, info)
+            self.permutation_eval_cache[cache_key] = record
+        return record.score, record
+
+    def evaluate_permutation_uncached(self, merged_path, perm, adaptive, final_refinement, parent):
+        dataset = compile_dataset(merged_path)
+        if not self.num_customers:
+            self.num_customers = dataset.num_customers
+
+        cust_box_map = dataset.box_counts
+        distances = get_distance_provider(dataset, **self.distance_options)
+
+        # One optimal split replaces the adaptive candidate decodes and their repairs.
+        if not adaptive or not self.enable_adaptive_decoding or self.split_decoder == "optimal":
+            return self.evaluate_permutation_fast(
                 merged_path,
                 perm,
-                depot,
-                customers_map,
+                distances,
                 cust_box_map,
+                parent=parent,
             )
-            self.permutation_eval_cache[cache_key] = (fast_score, copy.deepcopy(fast_info))
-            return fast_score, fast_info
 
         candidate_partitions = self.generate_candidate_route_partitions(
             perm,
             cust_box_map,
-            depot,
-            customers_map,
+            distances,
         )
         if final_refinement and self.enable_final_best_refinement:
             final_split_offset = self.final_refinement_split_offset
@@ -1243,8 +1475,7 @@ class GARunner:
             distance_limit = self.estimate_distance_limit(
                 perm,
                 cust_box_map,
-                depot,
-                customers_map,
+                distances,
                 split_limit,
             )
             candidate_partitions.append(
@@ -1255,8 +1486,7 @@ class GARunner:
                     "routes": self.decode_with_adaptive_splits(
                         perm,
                         cust_box_map,
-                        depot,
-                        customers_map,
+                        distances,
                         max_boxes_per_route=max(
                             1,
                             int(round(split_limit * (1.0 + final_overflow_ratio))),
@@ -1280,8 +1510,7 @@ class GARunner:
             repaired_routes, merged_route_count = self.try_repair_routes(
                 merged_path,
                 candidate["routes"],
-                depot,
-                customers_map,
+                distances,
                 cust_box_map,
                 candidate["split_limit"],
             )
@@ -1290,8 +1519,7 @@ class GARunner:
                 repaired_routes, relocation_merged_count = self.try_customer_relocation_repair(
                     merged_path,
                     repaired_routes,
-                    depot,
-                    customers_map,
+                    distances,
                     cust_box_map,
                     candidate["split_limit"],
                     merged_route_count=merged_route_count,
@@ -1300,8 +1528,7 @@ class GARunner:
             candidate_score, candidate_info = self.evaluate_route_partition(
                 merged_path,
                 repaired_routes,
-                depot,
-                customers_map,
+                distances,
             )
             candidate_info, candidate_score = self.finalize_partition_info(
                 candidate_info,
@@ -1397,169 +1624,112 @@ class GARunner:
                 f"routes={winner['route_count']} avg_fill={winner['avg_fill_rate']:.4f}"
             )
 
-        self.permutation_eval_cache[cache_key] = (best_score, copy.deepcopy(best_info))
         return best_score, best_info
 
-    def run(self, merged_path):
-        random.seed(self.seed)
-        self.route_eval_cache = {}
-        self.permutation_eval_cache = {}
-        self.split_candidate_cache = {}
-
-        overall_start = time.perf_counter()
+    def finalize_best_info(self, merged_path, best_info):
+        """Re-pack the best partition in full detail; attaches per-route placements."""
+        route_details = repack_route_details(merged_path, best_info["routes"], use_packing=USE_PACKING, **self.packing_options)
+        finalized = dict(best_info)
+        finalized["routes"] = route_details
+        finalized["boxes_packed"] = sum(detail["boxes_packed"] for detail in route_details)
+        finalized["unpacked_boxes"] = max(0, finalized["boxes_total"] - finalized["boxes_packed"])
+        finalized.update(
+            self.build_partition_summary(
+                route_details,
+                merged_route_count=best_info.get("merged_route_count", 0),
+                overflow_route_count=best_info.get("overflow_route_count", 0),
+            )
+        )
+        finalized["fill_rate"] = finalized["avg_fill_rate"]
+        return finalized
 
-        inst_name, container, customers, boxes = load_merged(merged_path)
-        depot_customer, real_customers = split_depot_and_customers(customers)
-        customer_ids = [c["customer_id"] for c in real_customers]
-        self.num_customers = len(real_customers)
-        cust_box_map = self.build_customer_boxcount_map(real_customers)
-        n = len(customer_ids)
+    def evaluate_generation(self, merged_path, population, generation, parents):
+        """
+        Fast (greedy) evaluation of the whole population, then adaptive decoding
+        of its best adaptive_count individuals, sorted by their final scores.
+        """
+        preliminary_population = []
 
-        population = [random.sample(customer_ids, n) for _ in range(self.pop_size - 2)]
-        population.append(customer_ids[:])
-        population.append(list(reversed(customer_ids)))
+        for individual, (score, info) in zip(population, self.evaluate_population(merged_path, population, adaptive=False, parents=parents)):
+            preliminary_population.append((score, individual, info))
 
-        best_solution = None
-        best_score = float("inf")
-        best_info = None
-        history = []
-        generation_start = overall_start
+        preliminary_population.sort(key=lambda x: x[0])
+        scored_population = preliminary_population[:]
 
-        for generation in range(self.gens):
-            preliminary_population = []
+        should_run_adaptive = self.enable_adaptive_decoding and (
+            self.adaptive_every_generations <= 1
+            or generation % self.adaptive_every_generations == 0
+            or generation == self.gens - 1
+        )
+        adaptive_count = min(
+            len(scored_population),
+            max(self.adaptive_top_min, int(round(self.pop_size * self.adaptive_top_fraction))),
+        )
 
-            for individual in population:
-                score, info = self.evaluate_permutation(merged_path, individual, adaptive=False)
-                preliminary_population.append((score, individual, info))
+        if should_run_adaptive and adaptive_count > 0:
+            adaptive_individuals = [individual for _, individual, _ in scored_population[:adaptive_count]]
+            adaptive_results = self.evaluate_population(merged_path, adaptive_individuals, adaptive=True)
+            for index, (individual, (adaptive_score, adaptive_info)) in enumerate(zip(adaptive_individuals, adaptive_results)):
+                scored_population[index] = (adaptive_score, individual, adaptive_info)
 
-            preliminary_population.sort(key=lambda x: x[0])
-            scored_population = preliminary_population[:]
+        scored_population.sort(key=lambda x: x[0])
 
-            should_run_adaptive = self.enable_adaptive_decoding and (
-                self.adaptive_every_generations <= 1
-                or generation % self.adaptive_every_generations == 0
-                or generation == self.gens - 1
+        if self.verbose and should_run_adaptive:
+            print(
+                f"[{self.progress_label}] Adaptive decoding refined top {adaptive_count} "
+                f"individuals in generation {generation + 1}"
             )
-            adaptive_count = min(
-                len(scored_population),
-                max(self.adaptive_top_min, int(round(self.pop_size * self.adaptive_top_fraction))),
+        return scored_population
+
+    def mutate(self, child, dataset):
+        if USE_ENHANCED_MUTATION:
+            return hybrid_mutation(
+                child,
+                self.mut_prob,
+                decoder=self.decode_by_boxcount,
+                cust_boxcount_map=dataset.box_counts,
+                max_boxes_per_route=self.max_boxes_per_route,
+                enable_route_balance_mutation=self.enable_route_balance_mutation,
+                route_balance_probability=self.effective_policy()["route_balance_mutation_probability"],
             )
+        return swap_mutation(child, self.mut_prob)
 
-            if should_run_adaptive and adaptive_count > 0:
-                for index in range(adaptive_count):
-                    _, individual, _ = scored_population[index]
-                    adaptive_score, adaptive_info = self.evaluate_permutation(
-                        merged_path,
-                        individual,
-                        adaptive=True,
-                    )
-                    scored_population[index] = (adaptive_score, individual, adaptive_info)
-
-            scored_population.sort(key=lambda x: x[0])
-
-            for score, individual, info in scored_population:
-                if score < best_score:
-                    best_score = score
-                    best_solution = individual[:]
-                    best_info = info
-
-            if self.verbose and should_run_adaptive:
-                print(
-                    f"[{self.progress_label}] Adaptive decoding refined top {adaptive_count} "
-                    f"individuals in generation {generation + 1}"
-                )
-
-            elite_count = max(4, int(0.05 * self.pop_size))
-            new_population = [scored_population[i][1][:] for i in range(elite_count)]
-
-            while len(new_population) < self.pop_size:
-                scores_only = [x[0] for x in scored_population]
-                population_only = [x[1] for x in scored_population]
-
-                parent1 = tournament_select(population_only, scores_only)
-                parent2 = tournament_select(population_only, scores_only)
-
-                if random.random() < self.cx_prob:
-                    child = order_crossover(parent1, parent2)
-                else:
-                    child = parent1[:]
-
-                if USE_ENHANCED_MUTATION:
-                    child = hybrid_mutation(
-                        child,
-                        self.mut_prob,
-                        decoder=self.decode_by_boxcount,
-                        cust_boxcount_map=cust_box_map,
-                        max_boxes_per_route=self.max_boxes_per_route,
-                        enable_route_balance_mutation=self.enable_route_balance_mutation,
-                        route_balance_probability=self.effective_policy()["route_balance_mutation_probability"],
-                    )
-                else:
-                    child = swap_mutation(child, self.mut_prob)
-               
-                new_population.append(child)
-
-            population = new_population
-            history.append(best_score)
+    def finalize_best(self, merged_path, best_solution, best_score, best_info):
+        """Re-score the best order adaptively and keep the final refinement when it pays off."""
+        best_score, best_info = self.evaluate_permutation(merged_path, best_solution, adaptive=self.enable_adaptive_decoding)
+        if not self.enable_final_best_refinement:
+            return best_score, best_info
 
-            if self.verbose and (generation % 10 == 0 or generation == self.gens - 1):
-                elapsed = time.perf_counter() - generation_start
-                print(
-                    f"[{self.progress_label}] Generation {generation + 1}/{self.gens} "
-                    f"Best Score = {best_score:.2f} Elapsed = {elapsed:.2f}s"
+        dataset = compile_dataset(merged_path)
+        distances = get_distance_provider(dataset, **self.distance_options)
+        final_score, final_info = self.evaluate_final_best_refinement(
+            merged_path,
+            best_solution,
+            distances,
+            dataset.box_counts,
+        )
+        final_policy = self.effective_policy()
+        route_drop_distance_ratio = self.route_drop_distance_ratio()
+        should_take_final_refinement = (
+            final_score < best_score
+            and (
+                (
+                    final_info["route_count"] < best_info["route_count"]
+                    and final_info["total_distance"]
+                    <= best_info["total_distance"] * route_drop_distance_ratio
                 )
-
-        if best_solution is not None:
-            best_score, best_info = self.evaluate_permutation(merged_path, best_solution, adaptive=self.enable_adaptive_decoding)
-            if self.enable_final_best_refinement:
-                inst_name, container, customers, boxes = load_merged(merged_path)
-                depot_customer, real_customers = split_depot_and_customers(customers)
-                cust_box_map = self.build_customer_boxcount_map(real_customers)
-                depot = (depot_customer["x"], depot_customer["y"]) if depot_customer else (0, 0)
-                customers_map = {c["customer_id"]: c for c in real_customers}
-                final_score, final_info = self.evaluate_final_best_refinement(
-                    merged_path,
-                    best_solution,
-                    depot,
-                    customers_map,
-                    cust_box_map,
+                or (
+                    final_info["min_fill_rate"] > best_info["min_fill_rate"] + 1e-6
+                    and final_info["total_distance"]
+                    <= best_info["total_distance"] * final_policy["final_refinement_distance_ratio"]
                 )
-                final_policy = self.effective_policy()
-                route_drop_distance_ratio = self.route_drop_distance_ratio()
-                should_take_final_refinement = (
-                    final_score < best_score
-                    and (
-                        (
-                            final_info["route_count"] < best_info["route_count"]
-                            and final_info["total_distance"]
-                            <= best_info["total_distance"] * route_drop_distance_ratio
-                        )
-                        or (
-                            final_info["min_fill_rate"] > best_info["min_fill_rate"] + 1e-6
-                            and final_info["total_distance"]
-                            <= best_info["total_distance"] * final_policy["final_refinement_distance_ratio"]
-                        )
-                        or final_info["total_distance"]
-                        <= best_info["total_distance"] * min(
-                            1.0,
-                            final_policy["final_refinement_distance_ratio"] - 0.002,
-                        )
-                    )
+                or final_info["total_distance"]
+                <= best_info["total_distance"] * min(
+                    1.0,
+                    final_policy["final_refinement_distance_ratio"] - 0.002,
                 )
-                if should_take_final_refinement:
-                    best_score, best_info = final_score, final_info
-
-        runtime_seconds = time.perf_counter() - overall_start
-
-        result = {
-            "model": MODEL_NAME,
-            "best_order": best_solution,
-            "best_score": best_score,
-            "best_info": best_info,
-            "history": history,
-            "runtime_seconds": runtime_seconds,
-            "duration": runtime_seconds,
-        }
-
-        return result
-
+            )
+        )
+        if should_take_final_refinement:
+            return final_score, final_info
+        return best_score, best_info
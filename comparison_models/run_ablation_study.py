@@ -28,6 +28,7 @@ from comparison_models.common.paper_reporting import (  # noqa: E402
     ABLATION_VARIANTS,
     REPRESENTATIVE_DATASET_SIZES,
 )
+from comparison_models.common.loaders.shared_dataset import SHARED_PACKING_TABLE_SLOTS, SharedEvaluationContext  # noqa: E402
 from comparison_models.proposed_model.run_experiments import run_from_config  # noqa: E402
 
 try:
@@ -141,6 +142,8 @@ def main() -> int:
     parser.add_argument("--max-workers", type=int, default=None)
     parser.add_argument("--force", action="store_true")
     parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--no-shared-memory", action="store_true", help="Do not share datasets and packing results across workers.")
+    parser.add_argument("--shared-table-slots", type=int, default=SHARED_PACKING_TABLE_SLOTS)
     args = parser.parse_args()
 
     dataset_paths = _resolve_datasets(args.dataset)
@@ -203,9 +206,18 @@ def main() -> int:
         completed = 0
         failed = 0
         start = time.perf_counter()
-        with ProcessPoolExecutor(
+        mp_context = multiprocessing.get_context("spawn")
+        shared = SharedEvaluationContext(
+            sorted({job["dataset_path"] for job in jobs}),
+            mp_context,
+            table_slots=args.shared_table_slots,
+            enabled=not args.no_shared_memory,
+        )
+        with shared, ProcessPoolExecutor(
             max_workers=max_workers,
-            mp_context=multiprocessing.get_context("spawn"),
+            mp_context=mp_context,
+            initializer=shared.initializer,
+            initargs=shared.initargs,
         ) as executor:
             future_to_job = {executor.submit(_run_job, job): job for job in jobs}
             for future in as_completed(future_to_job):